@@ -1,13 +1,23 @@
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
+import jwt
 from django.conf import settings
+from jwt.algorithms import RSAAlgorithm
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from clerk_backend_api.security import authenticate_request
-from clerk_backend_api.security.types import AuthenticateRequestOptions
+
+from .services.clerk_service import clerk_user_service
 
 logger = logging.getLogger(__name__)
 
+# Same allowance Clerk's SDK uses between its clock and ours
+CLOCK_SKEW_SECONDS = 5
+
 
 class ClerkUser:
     """Lightweight user object backed by a verified Clerk session token."""
@@ -29,6 +39,192 @@ class ClerkUser:
         return self.clerk_id
 
 
+class JWKSCache:
+    """
+    Clerk's signing keys by key id, fetched once and kept for max_age.
+
+    A token signed with an unknown kid (key rotation) triggers a refetch, at
+    most once per min_refresh_interval so tokens with made-up kids cannot
+    turn every request into a JWKS call. The fetch runs outside the lock and
+    only one is in flight at a time: meanwhile other callers are served the
+    keys already held, and only those with no key for their kid wait for
+    the fetch, up to wait_timeout seconds.
+    """
+
+    def __init__(self, max_age: float = 3600, min_refresh_interval: float = 30, wait_timeout: float = 10):
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.wait_timeout = wait_timeout
+        self._keys: Dict[str, Any] = {}
+        self._fetched_at: Optional[float] = None
+        # Set by the caller that fetches once its result is published
+        self._refreshed: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+    def get(self, kid: str) -> Optional[Any]:
+        with self._lock:
+            now = time.monotonic()
+            expired = self._fetched_at is None or now - self._fetched_at >= self.max_age
+            if kid in self._keys and not expired:
+                return self._keys[kid]
+            may_refresh = self._fetched_at is None or now - self._fetched_at >= self.min_refresh_interval
+            if self._refreshed is not None:
+                if kid in self._keys:
+                    return self._keys[kid]
+                refreshed, fetch = self._refreshed, False
+            elif may_refresh or expired:
+                refreshed, fetch = threading.Event(), True
+                self._refreshed = refreshed
+                self._fetched_at = now
+            else:
+                return self._keys.get(kid)
+
+        if fetch:
+            keys = self._fetch()
+            with self._lock:
+                if keys is not None:
+                    self._keys = keys
+                self._refreshed = None
+            refreshed.set()
+        else:
+            refreshed.wait(self.wait_timeout)
+        with self._lock:
+            return self._keys.get(kid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = {}
+            self._fetched_at = None
+
+    def _fetch(self) -> Optional[Dict[str, Any]]:
+        """The current key set, or None on failure (the old keys are kept and retried after min_refresh_interval)."""
+        try:
+            response = clerk_user_service.session.get(
+                f"{clerk_user_service.api_url}/jwks", timeout=clerk_user_service.timeout,
+            )
+            response.raise_for_status()
+            keys = {}
+            for jwk in response.json().get('keys', []):
+                if jwk.get('kid') and jwk.get('kty') == 'RSA':
+                    keys[jwk['kid']] = RSAAlgorithm.from_jwk(jwk)
+        except Exception as e:
+            logger.error("Failed to fetch Clerk JWKS: %s", e)
+            return None
+        logger.info("Loaded Clerk JWKS keys=%s", len(keys))
+        return keys
+
+
+class VerifiedTokenCache:
+    """
+    Verified token claims keyed by the SHA-256 of the token, so raw tokens
+    are not kept in memory. Entries live for ttl seconds and never past the
+    token's exp.
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: int = 10000):
+        self.ttl = max(0.0, float(ttl))
+        self.maxsize = max(0, int(maxsize))
+        # token hash -> (claims, expires_at wall clock)
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        if not (self.maxsize and self.ttl):
+            return
+        expires_at = time.time() + self.ttl
+        if isinstance(claims.get('exp'), (int, float)):
+            expires_at = min(expires_at, float(claims['exp']))
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class ClerkTokenVerifier:
+    """
+    Verifies Clerk session JWTs in process: RS256 signature against
+    CLERK_JWT_KEY when set, otherwise the cached JWKS key for the token's
+    kid; exp/nbf/iat with clock skew; azp, when present, against
+    CLERK_AUTHORIZED_PARTIES.
+    Verified claims are cached briefly so the dashboard's parallel requests
+    with the same token verify it once.
+    """
+
+    def __init__(self, jwks: JWKSCache, tokens: VerifiedTokenCache):
+        self.jwks = jwks
+        self.tokens = tokens
+
+    def verify(self, token: str) -> dict:
+        """Return the token's claims or raise AuthenticationFailed."""
+        claims = self.tokens.get(token)
+        if claims is not None:
+            return claims
+
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError:
+            raise AuthenticationFailed("Invalid Clerk session token.")
+
+        key = self._signing_key(header.get('kid'))
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=['RS256'],
+                options={'verify_iss': False, 'verify_aud': False, 'require': ['exp', 'sub']},
+                leeway=CLOCK_SKEW_SECONDS,
+            )
+        except jwt.ExpiredSignatureError:
+            raise AuthenticationFailed("Clerk session token has expired.")
+        except jwt.InvalidTokenError as e:
+            logger.info("Clerk token rejected: %s", e)
+            raise AuthenticationFailed("Invalid Clerk session token.")
+
+        authorized_parties = getattr(settings, 'CLERK_AUTHORIZED_PARTIES', None)
+        # Clerk omits azp for some tokens; like its own SDK, only a present
+        # azp has to match
+        azp = claims.get('azp')
+        if authorized_parties and azp and azp not in authorized_parties:
+            raise AuthenticationFailed("Clerk session token has an unauthorized party.")
+
+        self.tokens.put(token, claims)
+        return claims
+
+    def _signing_key(self, kid: Optional[str]) -> Any:
+        jwt_key = getattr(settings, 'CLERK_JWT_KEY', None)
+        if jwt_key:
+            return jwt_key
+        if not getattr(settings, 'CLERK_SECRET_KEY', None):
+            raise AuthenticationFailed("Clerk authentication is not configured.")
+        key = self.jwks.get(kid) if kid else None
+        if key is None:
+            raise AuthenticationFailed("Clerk session token is signed with an unknown key.")
+        return key
+
+
 class ClerkAuthentication(BaseAuthentication):
     """Verify Clerk session JWT from Authorization: Bearer <token>."""
 
@@ -38,26 +234,24 @@ class ClerkAuthentication(BaseAuthentication):
             # No credentials → anonymous. Permissions (AllowAny / IsAuthenticated) decide.
             return None
 
-        state = authenticate_request(
-            request,
-            AuthenticateRequestOptions(
-                secret_key=settings.CLERK_SECRET_KEY,
-                jwt_key=settings.CLERK_JWT_KEY or None,
-                authorized_parties=settings.CLERK_AUTHORIZED_PARTIES or None,
-                accepts_token=["session_token"],
-            ),
-        )
-
-        if not state.is_signed_in:
-            message = state.message or "Invalid or expired Clerk session token."
-            logger.info("Clerk authentication failed: %s", message)
-            raise AuthenticationFailed(message)
-
-        clerk_id = state.payload.get("sub")
+        token = auth_header[len("Bearer "):].strip()
+        payload = clerk_token_verifier.verify(token)
+
+        clerk_id = payload.get("sub")
         if not clerk_id:
             raise AuthenticationFailed("Clerk token is missing a user id.")
 
-        return ClerkUser(clerk_id=clerk_id, payload=state.payload), state
+        return ClerkUser(clerk_id=clerk_id, payload=payload), payload
 
     def authenticate_header(self, request):
         return "Bearer"
+
+
+# Global instance
+clerk_token_verifier = ClerkTokenVerifier(
+    JWKSCache(max_age=getattr(settings, 'CLERK_JWKS_CACHE_SECONDS', 3600)),
+    VerifiedTokenCache(
+        ttl=getattr(settings, 'CLERK_TOKEN_CACHE_SECONDS', 60),
+        maxsize=getattr(settings, 'CLERK_TOKEN_CACHE_SIZE', 10000),
+    ),
+)
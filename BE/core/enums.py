@@ -48,6 +48,15 @@ class MentionContentType(Enum):
     BODY = "body"
 
 
+class OutboxStatus(Enum):
+    """Delivery states for queued notifications"""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    DEFERRED = "deferred"  # left for the user's hourly/daily digest
+
+
 class PlatformChoices:
     """Helper class for Django choices"""
     REDDIT = (Platform.REDDIT.value, "Reddit")
@@ -154,6 +163,26 @@ class MentionContentTypeChoices:
         ]
 
 
+class OutboxStatusChoices:
+    """Helper class for Django notification outbox status choices"""
+    PENDING = (OutboxStatus.PENDING.value, "Pending")
+    SENDING = (OutboxStatus.SENDING.value, "Sending")
+    SENT = (OutboxStatus.SENT.value, "Sent")
+    FAILED = (OutboxStatus.FAILED.value, "Failed")
+    DEFERRED = (OutboxStatus.DEFERRED.value, "Deferred to digest")
+
+    @classmethod
+    def get_choices(cls):
+        """Get choices for Django model fields"""
+        return [
+            cls.PENDING,
+            cls.SENDING,
+            cls.SENT,
+            cls.FAILED,
+            cls.DEFERRED,
+        ]
+
+
 # Platform-specific content field mappings
 PLATFORM_CONTENT_MAPPING = {
     Platform.REDDIT.value: {
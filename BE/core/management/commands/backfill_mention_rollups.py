@@ -0,0 +1,99 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from mongoengine.errors import NotUniqueError
+from core.models import Mention, MentionDailyRollup
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the daily mention rollups behind keyword analytics from the '
+        'mentions collection'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Only rebuild rollups for this user id',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the buckets that would be written without changing anything',
+        )
+
+    def handle(self, *args, **options):
+        user_id = options.get('user')
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+
+        pipeline = []
+        if user_id:
+            pipeline.append({'$match': {'user_id': user_id}})
+        pipeline.append({'$group': {
+            '_id': {
+                'user_id': '$user_id',
+                'keyword_id': '$keyword_id',
+                'platform': '$platform',
+                'day': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$discovered_at'}},
+            },
+            'count': {'$sum': 1},
+            'last_discovered_at': {'$max': '$discovered_at'},
+        }})
+        buckets = [
+            MentionDailyRollup(
+                count=group['count'],
+                last_discovered_at=group['last_discovered_at'],
+                **group['_id'],
+            )
+            for group in Mention._get_collection().aggregate(pipeline, allowDiskUse=True)
+            if group['_id'].get('day')
+        ]
+
+        self.stdout.write(
+            f"Rollup buckets: {len(buckets)}, "
+            f"mentions: {sum(bucket.count for bucket in buckets)}"
+        )
+        if dry_run:
+            return
+
+        # Upsert each bucket in place: the mention writer keeps $inc-ing rollups
+        # while this runs, so the collection is never emptied and refilled.
+        # Past days are set to the recomputed count. From today on the writer
+        # may have counted mentions after the snapshot, so counts only grow.
+        today = datetime.now(dt_timezone.utc).date().isoformat()
+        for bucket in buckets:
+            query = MentionDailyRollup.objects(
+                user_id=bucket.user_id, keyword_id=bucket.keyword_id, platform=bucket.platform, day=bucket.day,
+            )
+            if bucket.day < today:
+                update = {'set__count': bucket.count, 'set__last_discovered_at': bucket.last_discovered_at}
+            else:
+                update = {'max__count': bucket.count, 'max__last_discovered_at': bucket.last_discovered_at}
+            try:
+                query.update_one(upsert=True, **update)
+            except NotUniqueError:
+                # The writer created the bucket between our upsert's match and insert
+                query.update_one(**update)
+
+        # Past buckets with no mentions left (deleted or deduplicated)
+        rebuilt = {(b.user_id, b.keyword_id, b.platform, b.day) for b in buckets}
+        existing = MentionDailyRollup.objects(day__lt=today)
+        if user_id:
+            existing = existing(user_id=user_id)
+        stale_ids = [
+            rollup.id
+            for rollup in existing.only('id', 'user_id', 'keyword_id', 'platform', 'day')
+            if (rollup.user_id, rollup.keyword_id, rollup.platform, rollup.day) not in rebuilt
+        ]
+        if stale_ids:
+            MentionDailyRollup.objects(id__in=stale_ids).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Mention rollups rebuilt (removed {len(stale_ids)} empty buckets)'
+        ))
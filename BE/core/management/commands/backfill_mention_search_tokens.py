@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from core.models import Mention
+from core.search import mention_search_tokens
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Fill in search_tokens for mentions saved before the search index existed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute tokens for every mention, not only those missing them',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Mentions read per batch (default: 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the mentions that would be updated without writing',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+
+        mentions = Mention.objects if options['all'] else Mention.objects(search_tokens__exists=False)
+        mentions = mentions.only('title', 'content').no_cache().batch_size(max(1, options['batch_size']))
+
+        updated = 0
+        for mention in mentions:
+            updated += 1
+            if not dry_run:
+                Mention.objects(id=mention.id).update_one(
+                    set__search_tokens=mention_search_tokens(mention.title, mention.content),
+                )
+            if updated % 10000 == 0:
+                self.stdout.write(f"Processed {updated} mentions")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Mentions {'to update' if dry_run else 'updated'}: {updated}")
+        )
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from core.models import Mention
+from core.services.analytics_service import unrecord_mentions
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Remove duplicate mentions (same keyword_id and source_url), keeping the earliest, '
+        'take them out of the analytics rollups, then build the unique mention index'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report duplicates without deleting them or building indexes',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+
+        # Raw collection access: Mention._get_collection() would try to build the
+        # unique index first, which fails while duplicates are still present.
+        collection = Mention._get_db()[Mention._get_collection_name()]
+        groups = collection.aggregate([
+            {'$sort': {'discovered_at': 1, '_id': 1}},
+            {'$group': {
+                '_id': {'keyword_id': '$keyword_id', 'source_url': '$source_url'},
+                'ids': {'$push': '$_id'},
+                'count': {'$sum': 1},
+            }},
+            {'$match': {'count': {'$gt': 1}}},
+        ], allowDiskUse=True)
+
+        duplicate_groups = 0
+        removed = 0
+        for group in groups:
+            duplicate_groups += 1
+            extra_ids = group['ids'][1:]
+            removed += len(extra_ids)
+            if not dry_run:
+                deleted = collection.find(
+                    {'_id': {'$in': extra_ids}},
+                    {'user_id': 1, 'keyword_id': 1, 'platform': 1, 'discovered_at': 1},
+                )
+                unrecord_mentions(Mention._from_son(doc) for doc in deleted)
+                collection.delete_many({'_id': {'$in': extra_ids}})
+
+        self.stdout.write(
+            f"Duplicate groups: {duplicate_groups}, "
+            f"mentions {'to remove' if dry_run else 'removed'}: {removed}"
+        )
+
+        if not dry_run:
+            Mention.ensure_indexes()
+            self.stdout.write(self.style.SUCCESS('Mention indexes are up to date'))
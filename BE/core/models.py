@@ -2,10 +2,11 @@ from mongoengine import Document, StringField, BooleanField, DateTimeField, Refe
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import datetime
+from .search import mention_search_tokens
 from .enums import (
     PlatformChoices, NotificationFrequencyChoices, CaseSensitivityChoices, 
     MatchModeChoices, ContentTypeChoices, MentionContentTypeChoices,
-    DEFAULT_CONTENT_TYPES
+    OutboxStatusChoices, DEFAULT_CONTENT_TYPES
 )
 
 
@@ -49,7 +50,8 @@ class Keyword(Document):
         'indexes': [
             ('user_id', 'keyword', 'platform'),
             ('user_id', 'is_active'),
-            ('created_at',)
+            ('created_at',),
+            ('updated_at',),  # keyword change feed high-water-mark polling
         ]
     }
     
@@ -107,22 +109,33 @@ class Mention(Document):
     platform_item_id = StringField(help_text="Platform-specific item ID (e.g., story ID, post ID)")
     platform_score = IntField(help_text="Platform-specific score (e.g., upvotes, points)")
     platform_comments_count = IntField(help_text="Platform-specific comments count")
+
+    # Word tokens of title and content, maintained on validation for search
+    search_tokens = ListField(StringField(), help_text="Search index tokens")
     
     meta = {
         'collection': 'mentions',
         'indexes': [
             ('user_id', 'platform', 'discovered_at'),
+            # Keyset pagination of the all-platform inbox on (discovered_at, _id)
+            ('user_id', 'discovered_at', 'id'),
             ('keyword_id', 'discovered_at'),
-            ('source_url',),
+            {'fields': ('keyword_id', 'source_url'), 'unique': True},
             ('discovered_at',),
             ('platform', 'platform_item_id'),
             ('user_id', 'is_archived', 'is_read'),
+            ('user_id', 'email_sent', 'discovered_at'),
+            # Search: one token's entries, already in keyset order
+            ('user_id', 'search_tokens', 'discovered_at', 'id'),
         ]
     }
     
     def __str__(self):
         return f"{self.keyword_id} on {self.platform} - {self.discovered_at.strftime('%Y-%m-%d %H:%M')}"
-    
+
+    def clean(self):
+        self.search_tokens = mention_search_tokens(self.title, self.content)
+
     def mark_email_sent(self):
         """Mark that email notification has been sent"""
         self.email_sent = True
@@ -177,6 +190,7 @@ class UserProfile(Document):
         default=NotificationFrequencyChoices.INSTANT[0],
         help_text="How often to send notifications"
     )
+    last_digest_at = DateTimeField(help_text="End of the last digest window sent to this user")
     # Billing (Dodo Payments)
     plan = StringField(default='free', help_text="Current plan: free | pro | business")
     dodo_customer_id = StringField(help_text="Dodo Payments customer id")
@@ -194,6 +208,9 @@ class UserProfile(Document):
         default=False,
         help_text="True when Free/downgrade requires picking which keywords to keep",
     )
+    email_changed_at = DateTimeField(
+        help_text="Set by the Clerk webhook; cached emails fetched earlier are refreshed"
+    )
     created_at = DateTimeField(default=timezone.now)
     updated_at = DateTimeField(default=timezone.now)
     
@@ -238,3 +255,57 @@ class MonitorCursor(Document):
     def save(self, *args, **kwargs):
         self.updated_at = timezone.now()
         return super().save(*args, **kwargs)
+
+
+class NotificationOutbox(Document):
+    """Notification waiting for (or done with) delivery by the outbox workers."""
+
+    idempotency_key = StringField(required=True, help_text="Deduplicates enqueues and provider sends, e.g. mention:<id>")
+    kind = StringField(required=True, default='mention', help_text="Notification type")
+    mention_id = StringField(help_text="Mention to notify about")
+    user_id = StringField(required=True, help_text="Django User ID")
+    status = StringField(choices=OutboxStatusChoices.get_choices(), default=OutboxStatusChoices.PENDING[0])
+    attempts = IntField(default=0, help_text="Delivery attempts so far")
+    next_attempt_at = DateTimeField(default=timezone.now, help_text="Earliest time a worker may (re)try delivery")
+    lease_until = DateTimeField(help_text="A sending item whose lease expired is claimable again")
+    last_error = StringField(help_text="Error from the most recent failed attempt")
+    sent_at = DateTimeField()
+    completed_at = DateTimeField(help_text="When the item reached sent, failed or deferred; drives the TTL")
+    created_at = DateTimeField(default=timezone.now)
+    updated_at = DateTimeField(default=timezone.now)
+
+    meta = {
+        'collection': 'notification_outbox',
+        'indexes': [
+            {'fields': ('idempotency_key',), 'unique': True},
+            ('status', 'next_attempt_at'),
+            # MongoDB removes finished items after a week; pending ones have no completed_at
+            {'fields': ('completed_at',), 'expireAfterSeconds': 7 * 24 * 3600},
+        ],
+    }
+
+    def __str__(self):
+        return f"Outbox {self.idempotency_key} ({self.status})"
+
+
+class MentionDailyRollup(Document):
+    """Mention count per user, keyword, platform and UTC day, kept current by the mention writer."""
+
+    user_id = StringField(required=True, help_text="Django User ID")
+    keyword_id = StringField(required=True, help_text="Keyword ID")
+    platform = StringField(required=True)
+    day = StringField(required=True, help_text="UTC date of discovered_at, YYYY-MM-DD")
+    count = IntField(default=0)
+    last_discovered_at = DateTimeField(help_text="Latest discovered_at counted in this bucket")
+
+    meta = {
+        'collection': 'mention_daily_rollups',
+        'indexes': [
+            {'fields': ('user_id', 'keyword_id', 'platform', 'day'), 'unique': True},
+            ('user_id', 'day'),
+        ],
+    }
+
+    def __str__(self):
+        return f"{self.keyword_id} on {self.platform} {self.day}: {self.count}"
+
@@ -0,0 +1,45 @@
+"""Values memoized for the duration of one API request."""
+
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Keys are (namespace, user_id, ...) tuples
+CacheKey = Tuple[Hashable, ...]
+
+_request_cache: ContextVar[Optional[Dict[CacheKey, Any]]] = ContextVar('request_cache', default=None)
+
+
+def get_or_set(key: CacheKey, factory: Callable[[], Any]) -> Any:
+    """Return the value memoized for key in this request, computing it once; outside a request, just compute."""
+    cache = _request_cache.get()
+    if cache is None:
+        return factory()
+    if key not in cache:
+        cache[key] = factory()
+    return cache[key]
+
+
+def discard_user(user_id: Optional[str] = None) -> None:
+    """Forget values memoized for user_id (all users when None) after their data changed."""
+    cache = _request_cache.get()
+    if not cache:
+        return
+    if user_id is None:
+        cache.clear()
+        return
+    for key in [key for key in cache if len(key) > 1 and key[1] == user_id]:
+        del cache[key]
+
+
+class RequestCacheMiddleware:
+    """Gives each request an empty memo and drops it when the response is done."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_cache.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            _request_cache.reset(token)
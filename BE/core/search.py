@@ -0,0 +1,31 @@
+"""Tokenizer for the mention search index."""
+
+import re
+
+# Words, keeping the suffix of names like C#, F# and C++ so they stay distinct
+TOKEN_RE = re.compile(r"\w+(?:#|\+\+)?(?!\w)")
+# Single characters are indexed too: "R language" must not lose its "r"
+MIN_TOKEN_LENGTH = 1
+# Bounds the multikey index entries a single long post can add
+MAX_DOCUMENT_TOKENS = 1000
+MAX_QUERY_TOKENS = 10
+
+
+def tokenize(text: str | None, limit: int = MAX_DOCUMENT_TOKENS) -> list[str]:
+    """Distinct casefolded word tokens in first-seen order."""
+    tokens: dict[str, None] = {}
+    for match in TOKEN_RE.finditer((text or '').casefold()):
+        token = match.group()
+        if len(token) >= MIN_TOKEN_LENGTH:
+            tokens.setdefault(token, None)
+            if len(tokens) >= limit:
+                break
+    return list(tokens)
+
+
+def mention_search_tokens(title: str | None, content: str | None) -> list[str]:
+    return tokenize(f"{title or ''}\n{content or ''}")
+
+
+def query_tokens(q: str | None) -> list[str]:
+    return tokenize(q, limit=MAX_QUERY_TOKENS)
@@ -0,0 +1,294 @@
+"""Mention counts behind the keyword analytics dashboard."""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from mongoengine import NotUniqueError
+
+from ..models import Mention, MentionDailyRollup
+
+SOURCE_ROLLUPS = "rollups"
+SOURCE_MENTIONS = "mentions"
+SOURCE_AGGREGATE = "aggregate"
+SOURCES = (SOURCE_ROLLUPS, SOURCE_MENTIONS, SOURCE_AGGREGATE)
+
+
+def _as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Stored datetimes come back naive; they are UTC."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=dt_timezone.utc)
+    return dt.astimezone(dt_timezone.utc)
+
+
+def day_key(dt: datetime) -> str:
+    return _as_utc(dt).date().isoformat()
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """Pipeline literals are compared with stored (naive UTC) values."""
+    return _as_utc(dt).replace(tzinfo=None)
+
+
+def _day_start(day: str) -> datetime:
+    return datetime.fromisoformat(day).replace(tzinfo=dt_timezone.utc)
+
+
+def _date_range(start: date, num_days: int) -> List[str]:
+    """Inclusive range of ISO date strings: start, start+1, ..."""
+    return [(start + timedelta(days=i)).isoformat() for i in range(num_days)]
+
+
+@dataclass
+class AnalyticsWindows:
+    """Time windows the dashboard reports on, all derived from one `now`."""
+
+    now: datetime
+    sparkline_days: int
+    # Rolling 7-day windows (timestamp-based, week-over-week)
+    last_7_since: datetime = field(init=False)
+    prev_7_since: datetime = field(init=False)
+    # Calendar-day windows for sparkline + summary (match chart buckets)
+    sparkline_dates: List[str] = field(init=False)
+    prior_sparkline_dates: List[str] = field(init=False)
+
+    def __post_init__(self):
+        self.now = _as_utc(self.now)
+        self.last_7_since = self.now - timedelta(days=7)
+        self.prev_7_since = self.now - timedelta(days=14)
+        first = (self.now - timedelta(days=self.sparkline_days - 1)).date()
+        self.sparkline_dates = _date_range(first, self.sparkline_days)
+        self.prior_sparkline_dates = _date_range(first - timedelta(days=self.sparkline_days), self.sparkline_days)
+
+    @property
+    def earliest(self) -> datetime:
+        """Oldest instant any windowed count looks at."""
+        return min(self.prev_7_since, _day_start(self.prior_sparkline_dates[0]))
+
+
+@dataclass
+class MentionCounts:
+    totals: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    last_7: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    prev_7: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    window_counts: Dict[str, Dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    last_mention_at: Dict[str, datetime] = field(default_factory=dict)
+    mentions_in_window: int = 0
+    mentions_prior_window: int = 0
+
+    def _add_day(self, kid: str, day: str, count: int, sparkline: Set[str], prior: Set[str]) -> None:
+        self.totals[kid] += count
+        if day in sparkline:
+            self.window_counts[kid][day] += count
+            self.mentions_in_window += count
+        elif day in prior:
+            self.mentions_prior_window += count
+
+    def _add_rolling(self, kid: str, discovered: datetime, windows: AnalyticsWindows) -> None:
+        if discovered >= windows.last_7_since:
+            self.last_7[kid] += 1
+        elif discovered >= windows.prev_7_since:
+            self.prev_7[kid] += 1
+
+    def _add_last(self, kid: str, discovered: Optional[datetime]) -> None:
+        if discovered is not None and (kid not in self.last_mention_at or discovered > self.last_mention_at[kid]):
+            self.last_mention_at[kid] = discovered
+
+
+def count_mentions_scan(user_id: str, keyword_ids: Set[str], windows: AnalyticsWindows) -> MentionCounts:
+    """Count by reading every mention document the user has."""
+    counts = MentionCounts()
+    sparkline = set(windows.sparkline_dates)
+    prior = set(windows.prior_sparkline_dates)
+    for mention in Mention.objects(user_id=user_id):
+        kid = mention.keyword_id
+        if kid not in keyword_ids:
+            continue
+        discovered = _as_utc(mention.discovered_at)
+        if discovered is None:
+            continue
+        counts._add_day(kid, discovered.date().isoformat(), 1, sparkline, prior)
+        counts._add_rolling(kid, discovered, windows)
+        counts._add_last(kid, discovered)
+    return counts
+
+
+def count_mentions_rollups(user_id: str, keyword_ids: Set[str], windows: AnalyticsWindows) -> MentionCounts:
+    """
+    Count from the daily rollups. Totals and calendar-day windows are exact;
+    only the two days the rolling 7-day windows cut through are read from
+    the mentions themselves, with a projected, index-bounded query.
+    """
+    counts = MentionCounts()
+    sparkline = set(windows.sparkline_dates)
+    prior = set(windows.prior_sparkline_dates)
+    # Days entirely inside a rolling window come from the rollups
+    last_7_first_full = day_key(windows.last_7_since + timedelta(days=1))
+    prev_7_first_full = day_key(windows.prev_7_since + timedelta(days=1))
+    last_7_cut = day_key(windows.last_7_since)
+    prev_7_cut = day_key(windows.prev_7_since)
+
+    rows = MentionDailyRollup.objects(user_id=user_id).only('keyword_id', 'day', 'count', 'last_discovered_at')
+    for row in rows:
+        kid = row.keyword_id
+        if kid not in keyword_ids:
+            continue
+        counts._add_day(kid, row.day, row.count, sparkline, prior)
+        if row.day >= last_7_first_full:
+            counts.last_7[kid] += row.count
+        elif prev_7_first_full <= row.day < last_7_cut:
+            counts.prev_7[kid] += row.count
+        counts._add_last(kid, _as_utc(row.last_discovered_at))
+
+    # Partial days at the rolling-window edges
+    for cut in (prev_7_cut, last_7_cut):
+        day_start = _day_start(cut)
+        edge = Mention.objects(
+            user_id=user_id,
+            discovered_at__gte=day_start,
+            discovered_at__lt=day_start + timedelta(days=1),
+        ).only('keyword_id', 'discovered_at')
+        for mention in edge:
+            if mention.keyword_id in keyword_ids:
+                counts._add_rolling(mention.keyword_id, _as_utc(mention.discovered_at), windows)
+    return counts
+
+
+def count_mentions_aggregate(user_id: str, keyword_ids: Set[str], windows: AnalyticsWindows) -> MentionCounts:
+    """
+    Count inside MongoDB with one pipeline: per-keyword totals and latest
+    mention over all time, and per-(keyword, day) counts with the rolling
+    7-day splits for the windowed part. Only keyword_id and discovered_at
+    leave the $project stage, so mention content is never transferred.
+    """
+    counts = MentionCounts()
+    if not keyword_ids:
+        return counts
+    sparkline = set(windows.sparkline_dates)
+    prior = set(windows.prior_sparkline_dates)
+    last_7_since = _naive_utc(windows.last_7_since)
+    prev_7_since = _naive_utc(windows.prev_7_since)
+
+    pipeline = [
+        {'$match': {
+            'user_id': user_id,
+            'keyword_id': {'$in': sorted(keyword_ids)},
+            'discovered_at': {'$ne': None},
+        }},
+        {'$project': {'_id': 0, 'keyword_id': 1, 'discovered_at': 1}},
+        {'$facet': {
+            'totals': [
+                {'$group': {
+                    '_id': '$keyword_id',
+                    'count': {'$sum': 1},
+                    'last_discovered_at': {'$max': '$discovered_at'},
+                }},
+            ],
+            'days': [
+                {'$match': {'discovered_at': {'$gte': _naive_utc(windows.earliest)}}},
+                {'$group': {
+                    '_id': {
+                        'keyword_id': '$keyword_id',
+                        'day': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$discovered_at'}},
+                    },
+                    'count': {'$sum': 1},
+                    'last_7': {'$sum': {'$cond': [{'$gte': ['$discovered_at', last_7_since]}, 1, 0]}},
+                    'prev_7': {'$sum': {'$cond': [
+                        {'$and': [
+                            {'$gte': ['$discovered_at', prev_7_since]},
+                            {'$lt': ['$discovered_at', last_7_since]},
+                        ]},
+                        1,
+                        0,
+                    ]}},
+                }},
+            ],
+        }},
+    ]
+    result = next(iter(Mention.objects.aggregate(pipeline)), {'totals': [], 'days': []})
+
+    for group in result['totals']:
+        kid = group['_id']
+        counts.totals[kid] += group['count']
+        counts._add_last(kid, _as_utc(group['last_discovered_at']))
+    for group in result['days']:
+        kid, day = group['_id']['keyword_id'], group['_id']['day']
+        if day in sparkline:
+            counts.window_counts[kid][day] += group['count']
+            counts.mentions_in_window += group['count']
+        elif day in prior:
+            counts.mentions_prior_window += group['count']
+        if group['last_7']:
+            counts.last_7[kid] += group['last_7']
+        if group['prev_7']:
+            counts.prev_7[kid] += group['prev_7']
+    return counts
+
+
+def get_analytics_source() -> str:
+    # The pipeline is correct without a backfill; rollups are faster once
+    # backfill_mention_rollups has run, and mentions is the Python fallback
+    source = (getattr(settings, 'ANALYTICS_SOURCE', '') or SOURCE_AGGREGATE).strip().lower()
+    return source if source in SOURCES else SOURCE_AGGREGATE
+
+
+def count_mentions(user_id: str, keyword_ids: Set[str], windows: AnalyticsWindows) -> MentionCounts:
+    source = get_analytics_source()
+    if source == SOURCE_MENTIONS:
+        return count_mentions_scan(user_id, keyword_ids, windows)
+    if source == SOURCE_AGGREGATE:
+        return count_mentions_aggregate(user_id, keyword_ids, windows)
+    return count_mentions_rollups(user_id, keyword_ids, windows)
+
+
+def _bucket_mentions(mentions: Iterable[Mention]) -> Dict[tuple, List]:
+    """(user, keyword, platform, day) -> [count, latest discovered_at]."""
+    buckets: Dict[tuple, List] = {}
+    for mention in mentions:
+        discovered = _as_utc(mention.discovered_at)
+        if discovered is None:
+            continue
+        key = (mention.user_id, mention.keyword_id, mention.platform, discovered.date().isoformat())
+        bucket = buckets.setdefault(key, [0, discovered])
+        bucket[0] += 1
+        bucket[1] = max(bucket[1], discovered)
+    return buckets
+
+
+def record_mentions(mentions: Iterable[Mention]) -> int:
+    """
+    Add newly inserted mentions to their daily rollups: one upsert with $inc
+    per (user, keyword, platform, day) in the batch, however many mentions
+    share it. Returns the number of buckets touched.
+    """
+    buckets = _bucket_mentions(mentions)
+    for (user_id, kid, platform, day), (count, last) in buckets.items():
+        query = MentionDailyRollup.objects(user_id=user_id, keyword_id=kid, platform=platform, day=day)
+        try:
+            query.update_one(upsert=True, inc__count=count, max__last_discovered_at=last)
+        except NotUniqueError:
+            # Two writers upserted the same new bucket; the document exists now
+            query.update_one(inc__count=count, max__last_discovered_at=last)
+    return len(buckets)
+
+
+def unrecord_mentions(mentions: Iterable[Mention]) -> int:
+    """
+    Take deleted mentions back out of their daily rollups; buckets that reach
+    zero are removed. Returns the number of buckets touched.
+    """
+    buckets = _bucket_mentions(mentions)
+    for (user_id, kid, platform, day), (count, _) in buckets.items():
+        query = MentionDailyRollup.objects(user_id=user_id, keyword_id=kid, platform=platform, day=day)
+        query.update_one(dec__count=count)
+        query.filter(count__lte=0).delete()
+    return len(buckets)
+
+
+def forget_keyword(user_id: str, keyword_id: str) -> None:
+    """Drop a deleted keyword's rollups; analytics only reports existing keywords."""
+    MentionDailyRollup.objects(user_id=user_id, keyword_id=keyword_id).delete()
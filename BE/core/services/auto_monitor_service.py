@@ -1,13 +1,18 @@
 import time
 import logging
 import threading
+from django.conf import settings
 from django.utils import timezone
 from platforms.reddit.services.realtime_monitor import realtime_stream_monitor
 from platforms.hackernews.services.hackernews_service import HackerNewsService
 from platforms.twitter.services.twitter_service import twitter_service
 from platforms.youtube.services.youtube_service import youtube_service
-from ..models import Keyword, Mention
+from ..models import Mention
 from ..enums import Platform
+from .keyword_sync import KeywordChangeFeed, KeywordDelta, KeywordSnapshot, keyword_id
+from .mention_writer import mention_writer
+from .notification_outbox import notification_outbox
+from .digest_service import digest_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +28,16 @@ class AutoMonitorService:
         self.hn_service = HackerNewsService()
         self.hn_keywords = set()  # Track HackerNews keywords separately
         self.twitter_keywords = set()  # Track Twitter keywords separately
+        # Keywords each platform service was last given; diffed into hot-reload deltas
+        self.platform_snapshots = {platform: KeywordSnapshot() for platform in self._platform_services()}
+        # Active keywords kept current from the change feed instead of full rescans
+        self.keyword_feed = KeywordChangeFeed(
+            use_change_stream=getattr(settings, 'KEYWORD_CHANGE_STREAMS', True),
+            overlap_seconds=getattr(settings, 'KEYWORD_SYNC_OVERLAP_SECONDS', 30),
+            delete_scan_interval=getattr(settings, 'KEYWORD_SYNC_DELETE_SCAN_SECONDS', 60),
+        )
+        self.active_keywords = {}
+        self._keywords_loaded = False
         
     def start_auto_monitoring(self):
         """Start automatic monitoring service"""
@@ -33,6 +48,10 @@ class AutoMonitorService:
         self.is_running = True
         logger.info("🚀 Starting automatic monitoring service...")
         
+        # Email delivery runs on its own workers, fed by the monitors
+        notification_outbox.start()
+        digest_scheduler.start()
+
         # Initialize HackerNews monitoring
         self.hn_service.start_monitoring()
         
@@ -62,6 +81,16 @@ class AutoMonitorService:
         twitter_service.stop_stream_monitoring()
         # Stop YouTube streaming
         youtube_service.stop_stream_monitoring()
+        # Write out mentions still buffered by the stopped monitors
+        mention_writer.stop()
+        notification_outbox.stop()
+        digest_scheduler.stop()
+        for snapshot in self.platform_snapshots.values():
+            snapshot.clear()
+        self.monitored_keywords = set()
+        self.keyword_feed.close()
+        self.active_keywords = {}
+        self._keywords_loaded = False
         
         # Wait for thread to finish
         if self.monitor_thread and self.monitor_thread.is_alive():
@@ -101,57 +130,43 @@ class AutoMonitorService:
     def _check_and_update_keywords(self):
         """Check for active keywords and update monitoring if needed"""
         try:
-            # Get all active keywords
-            active_keywords = Keyword.objects.filter(is_active=True)
-            current_keyword_ids = {str(kw.id) for kw in active_keywords}
+            # Full load once, then only the keywords the change feed reports
+            if not self._load_keyword_changes():
+                return
+            active_keywords = list(self.active_keywords.values())
+            current_keyword_ids = set(self.active_keywords)
+
+            # Diff each platform's keywords against what its service was last given
+            platform_keywords = {
+                platform: [kw for kw in active_keywords if kw.platform in [platform, Platform.ALL.value]]
+                for platform in self.platform_snapshots
+            }
+            deltas = {
+                platform: self.platform_snapshots[platform].diff(keywords)
+                for platform, keywords in platform_keywords.items()
+            }
 
             # Check if we need to update monitoring
-            if current_keyword_ids != self.monitored_keywords:
+            if any(deltas.values()):
                 logger.info(f"🔄 Keyword changes detected. Updating monitoring...")
                 logger.info(f"   Previously monitoring: {len(self.monitored_keywords)} keywords")
                 logger.info(f"   Now monitoring: {len(current_keyword_ids)} keywords")
 
-                # Stop current monitoring
-                realtime_stream_monitor.stop_stream_monitoring()
-                self.hn_service.stop_real_time_streaming()
-                twitter_service.stop_stream_monitoring()
-                youtube_service.stop_stream_monitoring()
-
-                # Start monitoring with updated keywords
-                if active_keywords:
-                    # Separate keywords by platform
-                    reddit_keywords = [kw for kw in active_keywords if kw.platform in [Platform.REDDIT.value, Platform.ALL.value]]
-                    hn_keywords = [kw for kw in active_keywords if kw.platform in [Platform.HACKERNEWS.value, Platform.ALL.value]]
-                    twitter_keywords = [kw for kw in active_keywords if kw.platform in [Platform.TWITTER.value, Platform.ALL.value]]
-                    youtube_keywords = [kw for kw in active_keywords if kw.platform in [Platform.YOUTUBE.value, Platform.ALL.value]]
-
-                    # Start Reddit monitoring
-                    if reddit_keywords:
-                        realtime_stream_monitor.start_stream_monitoring(reddit_keywords)
-                        logger.info(f"✅ Updated Reddit monitoring for {len(reddit_keywords)} keywords")
-
-                    # Start HackerNews real-time streaming
-                    if hn_keywords:
-                        self.hn_service.start_real_time_streaming(hn_keywords)
-                        logger.info(f"✅ Updated HackerNews streaming for {len(hn_keywords)} keywords")
-
-                    # Start Twitter monitoring
-                    if twitter_keywords:
-                        twitter_service.start_stream_monitoring(twitter_keywords)
-                        logger.info(f"✅ Updated Twitter monitoring for {len(twitter_keywords)} keywords")
-                    # Start YouTube monitoring
-                    if youtube_keywords:
-                        youtube_service.start_stream_monitoring(youtube_keywords)
-                        logger.info(f"✅ Updated YouTube monitoring for {len(youtube_keywords)} keywords")
-
-                    self.monitored_keywords = current_keyword_ids
-                else:
-                    logger.info("ℹ️  No active keywords to monitor")
-                    self.monitored_keywords = set()
+                # Only platforms whose keywords changed are touched; running
+                # services swap their keyword set in place instead of restarting.
+                services = self._platform_services()
+                for platform, delta in deltas.items():
+                    if delta:
+                        self._sync_platform(platform, services[platform], platform_keywords[platform], delta)
 
+                if not active_keywords:
+                    logger.info("ℹ️  No active keywords to monitor")
+                self.monitored_keywords = current_keyword_ids
                 self.last_keyword_check = timezone.now()
 
         except Exception as e:
+            # Reload everything next time; a failed poll may have left the feed half-applied
+            self._keywords_loaded = False
             logger.error(f"Error checking keywords: {e}")
             logger.error(f"Error type: {type(e).__name__}")
             import traceback
@@ -167,14 +182,76 @@ class AutoMonitorService:
             ):
                 raise
  
+    def _load_keyword_changes(self) -> bool:
+        """Update self.active_keywords from the change feed; True if anything changed."""
+        if not self._keywords_loaded:
+            keywords = self.keyword_feed.load()
+            self.active_keywords = {keyword_id(kw): kw for kw in keywords}
+            self._keywords_loaded = True
+            logger.info(
+                "Keyword feed loaded keywords=%s mode=%s", len(self.active_keywords), self.keyword_feed.mode,
+            )
+            return True
+
+        changed, removed = self.keyword_feed.poll()
+        if not changed and not removed:
+            return False
+        active = dict(self.active_keywords)
+        for key in removed:
+            active.pop(key, None)
+        for kw in changed:
+            active[keyword_id(kw)] = kw
+        self.active_keywords = active
+        logger.info("Keyword feed changes changed=%s removed=%s", len(changed), len(removed))
+        return True
+
+    def _platform_services(self):
+        return {
+            Platform.REDDIT.value: realtime_stream_monitor,
+            Platform.HACKERNEWS.value: self.hn_service,
+            Platform.TWITTER.value: twitter_service,
+            Platform.YOUTUBE.value: youtube_service,
+        }
+
+    @staticmethod
+    def _is_service_running(service) -> bool:
+        return bool(getattr(service, 'is_streaming', False) or getattr(service, 'is_monitoring', False))
+
+    def _sync_platform(self, platform: str, service, platform_keywords, delta: KeywordDelta):
+        """Start, stop or hot-reload one platform service to match its active keywords."""
+        snapshot = self.platform_snapshots[platform]
+        running = self._is_service_running(service)
+        if not platform_keywords:
+            if running:
+                if platform == Platform.HACKERNEWS.value:
+                    service.stop_real_time_streaming()
+                else:
+                    service.stop_stream_monitoring()
+                logger.info(f"⏹️  Stopped {platform} monitoring (no keywords)")
+            snapshot.clear()
+            return
+
+        if not running:
+            if platform == Platform.HACKERNEWS.value:
+                service.start_real_time_streaming(platform_keywords)
+            else:
+                service.start_stream_monitoring(platform_keywords)
+            snapshot.clear()
+            snapshot.commit(KeywordDelta(added=list(platform_keywords)))
+            logger.info(f"✅ Started {platform} monitoring for {len(platform_keywords)} keywords")
+            return
+
+        service.apply_keyword_delta(delta)
+        snapshot.commit(delta)
+        logger.info(f"✅ Updated {platform} monitoring ({delta.summary()})")
+
     def _send_email_notification(self, mention: Mention):
-        """Send email notification for a mention"""
+        """Queue an email notification for a mention"""
         try:
-            from .email_service import email_notification_service
-            email_notification_service.send_mention_notification(mention)
-            logger.info(f"📧 Email notification sent for mention: {mention.keyword_id}")
+            notification_outbox.enqueue_mention(mention)
+            logger.info(f"📧 Email notification queued for mention: {mention.keyword_id}")
         except Exception as e:
-            logger.error(f"Error sending email notification: {e}")
+            logger.error(f"Error queueing email notification: {e}")
     
     def get_status(self):
         """Get current monitoring status"""
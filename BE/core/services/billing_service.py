@@ -5,6 +5,9 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from django.utils import timezone
+
+from core import request_cache
 from core.models import Keyword, UserProfile
 from core.plans import (
     ACTIVE_SUBSCRIPTION_STATUSES,
@@ -20,6 +23,7 @@ from core.plans import (
     plan_rank,
     product_id_for_plan,
 )
+from core.services.keyword_cache import keyword_cache
 
 logger = logging.getLogger(__name__)
 
@@ -108,16 +112,37 @@ def billing_status_payload(user_id: str) -> dict[str, Any]:
     }
 
 
+def _keyword_counts(user_id: str) -> dict[tuple[str, bool], int]:
+    """Keyword count per (platform, is_active) from one $group over the user's keywords."""
+    pipeline = [
+        {"$match": {"user_id": user_id}},
+        {"$group": {
+            "_id": {"platform": "$platform", "is_active": "$is_active"},
+            "count": {"$sum": 1},
+        }},
+    ]
+    return {
+        (group["_id"].get("platform"), group["_id"].get("is_active") is True): group["count"]
+        for group in Keyword.objects.aggregate(pipeline)
+    }
+
+
 def keyword_usage(user_id: str, *, active_only: bool = True) -> dict[str, int]:
+    """
+    Keywords per metered platform; "all" keywords count toward every one.
+    Counts are memoized for the rest of the request and dropped when the
+    user's keywords change.
+    """
+    counts = request_cache.get_or_set(("keyword_usage", user_id), lambda: _keyword_counts(user_id))
     usage = {p: 0 for p in METERED_PLATFORMS}
-    for platform in METERED_PLATFORMS:
-        query: dict[str, Any] = {
-            "user_id": user_id,
-            "platform__in": [platform, "all"],
-        }
-        if active_only:
-            query["is_active"] = True
-        usage[platform] = Keyword.objects(**query).count()
+    for (platform, is_active), count in counts.items():
+        if active_only and not is_active:
+            continue
+        if platform == "all":
+            for p in METERED_PLATFORMS:
+                usage[p] += count
+        elif platform in usage:
+            usage[platform] += count
     return usage
 
 
@@ -301,6 +326,19 @@ def apply_subscription_to_profile(
     return profile
 
 
+def _set_keywords_active(
+    user_id: str, platform: str, active: bool, now: Any, **filters: Any
+) -> int:
+    """
+    Set is_active on the user's keywords for platform (and "all") matching
+    filters with one update_many. updated_at gets a shared timestamp so the
+    monitoring worker's keyword feed picks the batch up as one delta.
+    """
+    return Keyword.objects(
+        user_id=user_id, platform__in=[platform, "all"], **filters
+    ).update(set__is_active=active, set__updated_at=now)
+
+
 def enforce_downgrade_keyword_limits(user_id: str) -> None:
     """
     After a plan drop: pause keywords that don't fit the new caps and require a pick.
@@ -313,35 +351,35 @@ def enforce_downgrade_keyword_limits(user_id: str) -> None:
     plan = resolve_plan(profile)
     limits = limits_for_plan(plan)
     needs_selection = False
+    paused = 0
+
+    # One aggregation for the active counts, then at most one update per platform
+    counts = _keyword_counts(user_id)
+    active_all = counts.get(("all", True), 0)
+    now = timezone.now()
 
     for platform in METERED_PLATFORMS:
         limit = limits.get(platform, 0)
-        keywords = list(
-            Keyword.objects(
-                user_id=user_id,
-                platform__in=[platform, "all"],
-            ).order_by("-created_at")
-        )
-        active = [k for k in keywords if k.is_active]
-
-        if limit <= 0:
-            for kw in active:
-                kw.is_active = False
-                kw.save()
+        active = counts.get((platform, True), 0) + active_all
+        if not active:
             continue
 
-        if len(active) > limit:
-            needs_selection = True
-            for kw in active:
-                kw.is_active = False
-                kw.save()
+        if limit <= 0 or active > limit:
+            needs_selection = needs_selection or limit > 0
+            paused += _set_keywords_active(
+                user_id, platform, False, now, is_active=True,
+            )
+            # "all" keywords were paused along with this platform's
+            active_all = 0
 
+    keyword_cache.invalidate(user_id)
     profile.needs_keyword_selection = needs_selection
     profile.save()
     logger.info(
-        "Downgrade enforce for %s: needs_keyword_selection=%s",
+        "Downgrade enforce for %s: needs_keyword_selection=%s paused=%s",
         user_id,
         needs_selection,
+        paused,
     )
 
 
@@ -362,14 +400,12 @@ def keyword_selection_payload(user_id: str) -> dict[str, Any]:
     limits = limits_for_plan(plan)
     platforms_out: list[dict[str, Any]] = []
 
+    # Read fresh, not through keyword_cache: another worker may have just
+    # applied a downgrade, and the user picks what to keep from these states
+    all_keywords = list(Keyword.objects(user_id=user_id).order_by("-created_at"))
     for platform in METERED_PLATFORMS:
         limit = limits.get(platform, 0)
-        keywords = list(
-            Keyword.objects(
-                user_id=user_id,
-                platform__in=[platform, "all"],
-            ).order_by("-created_at")
-        )
+        keywords = [k for k in all_keywords if k.platform in (platform, "all")]
         if not keywords and limit > 0:
             continue
         # Always include platforms that have keywords or require a choice.
@@ -451,30 +487,33 @@ def apply_keyword_selection(
     # - over Free cap: activate only keep_ids
     # - under/at cap with no keep_ids for that platform: leave alone
     # - under/at cap with keep_ids: honor the selection
+    counts = _keyword_counts(user_id)
+    total_all = counts.get(("all", True), 0) + counts.get(("all", False), 0)
+    now = timezone.now()
+    changed = 0
     for platform in METERED_PLATFORMS:
         limit = limits.get(platform, 0)
-        keywords = list(
-            Keyword.objects(user_id=user_id, platform__in=[platform, "all"])
-        )
-        selected_ids = {str(k.id) for k in by_platform.get(platform, [])}
+        selected_ids = [k.id for k in by_platform.get(platform, [])]
 
         if limit <= 0:
-            for kw in keywords:
-                if kw.is_active:
-                    kw.is_active = False
-                    kw.save()
+            changed += _set_keywords_active(user_id, platform, False, now, is_active=True)
             continue
 
-        over_cap = len(keywords) > limit
+        total = counts.get((platform, True), 0) + counts.get((platform, False), 0) + total_all
+        over_cap = total > limit
         if not over_cap and not selected_ids:
             continue
 
-        for kw in keywords:
-            should_active = str(kw.id) in selected_ids
-            if kw.is_active != should_active:
-                kw.is_active = should_active
-                kw.save()
+        if selected_ids:
+            changed += _set_keywords_active(
+                user_id, platform, True, now, id__in=selected_ids, is_active=False,
+            )
+        changed += _set_keywords_active(
+            user_id, platform, False, now, id__nin=selected_ids, is_active=True,
+        )
 
+    logger.info("Keyword selection for %s: changed=%s", user_id, changed)
+    keyword_cache.invalidate(user_id)
     profile.needs_keyword_selection = False
     profile.save()
     return billing_status_payload(user_id)
@@ -1,77 +1,161 @@
+import base64
+import hashlib
+import hmac
+import json
 import os
+import threading
+import time
 import requests
 import logging
-from typing import Optional
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Clerk's list endpoint accepts up to 100 user_id filters per request
+PREFETCH_BATCH_SIZE = 100
+# Svix rejects webhook timestamps further than this from now
+WEBHOOK_TOLERANCE_SECONDS = 300
+
+
+class UserEmailCache:
+    """
+    Thread-safe LRU of Clerk user id -> email with per-entry expiry.
+
+    None is cached too (negative caching) so users missing from Clerk are
+    not looked up on every notification; those entries get a shorter TTL.
+    """
+
+    def __init__(self, ttl: float = 600, negative_ttl: float = 300, maxsize: int = 10000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        # user id -> (email or None, expires_at monotonic, fetched_at wall clock)
+        self._entries: "OrderedDict[str, Tuple[Optional[str], float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, fresh_after: Optional[datetime] = None) -> Tuple[bool, Optional[str]]:
+        """Return (found, email); entries fetched before fresh_after count as missing."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                email, expires_at, fetched_at = entry
+                if fresh_after is not None and fresh_after.tzinfo is None:
+                    # Stored datetimes come back naive UTC; timestamp() would assume local time
+                    fresh_after = fresh_after.replace(tzinfo=timezone.utc)
+                stale = fresh_after is not None and fetched_at < fresh_after.timestamp()
+                if expires_at > time.monotonic() and not stale:
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return True, email
+                del self._entries[user_id]
+            self.misses += 1
+            return False, None
+
+    def put(self, user_id: str, email: Optional[str]) -> None:
+        if not self.maxsize:
+            return
+        ttl = self.ttl if email else self.negative_ttl
+        with self._lock:
+            self._entries[user_id] = (email, time.monotonic() + ttl, time.time())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop one user's entry, or everything when user_id is None."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+def extract_user_email(user_data: Mapping) -> Optional[str]:
+    """Primary email, else the first verified one, else the first listed."""
+    email_addresses = user_data.get('email_addresses') or []
+    primary_email_id = user_data.get('primary_email_address_id')
+    if primary_email_id:
+        for email_data in email_addresses:
+            if email_data.get('id') == primary_email_id:
+                return email_data.get('email_address')
+    for email_data in email_addresses:
+        if (email_data.get('verification') or {}).get('status') == 'verified':
+            return email_data.get('email_address')
+    if email_addresses:
+        return email_addresses[0].get('email_address')
+    return None
+
+
 class ClerkUserService:
     """Service for interacting with Clerk API to get user information"""
-    
+
     def __init__(self):
         self.secret_key = os.environ.get("CLERK_SECRET_KEY")
         self.api_url = "https://api.clerk.com/v1"
-        
+        self.timeout = 10
+        self.email_cache = UserEmailCache(
+            ttl=getattr(settings, 'CLERK_EMAIL_CACHE_SECONDS', 600),
+            negative_ttl=getattr(settings, 'CLERK_EMAIL_NEGATIVE_CACHE_SECONDS', 300),
+            maxsize=getattr(settings, 'CLERK_EMAIL_CACHE_SIZE', 10000),
+        )
+        # One pooled session so notification bursts reuse TLS connections
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+
         if not self.secret_key:
             logger.warning("CLERK_SECRET_KEY not found in environment variables")
-    
-    def get_user_email(self, clerk_user_id: str) -> Optional[str]:
-        """Get user email from Clerk API"""
+        else:
+            self.session.headers.update({
+                "Authorization": f"Bearer {self.secret_key}",
+                "Content-Type": "application/json",
+            })
+
+    def get_user_email(self, clerk_user_id: str, fresh_after: Optional[datetime] = None) -> Optional[str]:
+        """
+        Get user email from Clerk API, served from a TTL cache.
+        fresh_after forces a refetch when the cached value is older, e.g.
+        after a webhook recorded an email change.
+        """
+        found, email = self.email_cache.get(clerk_user_id, fresh_after)
+        if found:
+            return email
+
         try:
             if not self.secret_key:
                 logger.error("Cannot get user email: CLERK_SECRET_KEY not configured")
                 return None
-            
-            headers = {
-                "Authorization": f"Bearer {self.secret_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(
-                f"{self.api_url}/users/{clerk_user_id}",
-                headers=headers,
-                timeout=10
-            )
-            
+
+            response = self.session.get(f"{self.api_url}/users/{clerk_user_id}", timeout=self.timeout)
+
             if response.status_code == 200:
-                user_data = response.json()
-                logger.info(f"Successfully retrieved user data for {clerk_user_id}")
-                
-                # Get primary email address
-                primary_email_id = user_data.get('primary_email_address_id')
-                email_addresses = user_data.get('email_addresses', [])
-                
-                # Try to find primary email first
-                if primary_email_id:
-                    for email_data in email_addresses:
-                        if email_data.get('id') == primary_email_id:
-                            email = email_data.get('email_address')
-                            logger.info(f"Found primary email for user {clerk_user_id}: {email}")
-                            return email
-                
-                # Fallback to first verified email
-                for email_data in email_addresses:
-                    if email_data.get('verification', {}).get('status') == 'verified':
-                        email = email_data.get('email_address')
-                        logger.info(f"Found verified email for user {clerk_user_id}: {email}")
-                        return email
-                
-                # Fallback to first email if no verified ones
-                if email_addresses:
-                    email = email_addresses[0].get('email_address')
-                    logger.info(f"Found first email for user {clerk_user_id}: {email}")
-                    return email
-                
-                logger.warning(f"No email addresses found for user {clerk_user_id}")
-                return None
-            
+                email = extract_user_email(response.json())
+                if email:
+                    logger.info(f"Found email for user {clerk_user_id}: {email}")
+                else:
+                    logger.warning(f"No email addresses found for user {clerk_user_id}")
+                self.email_cache.put(clerk_user_id, email)
+                return email
+
             elif response.status_code == 404:
                 logger.error(f"User not found in Clerk: {clerk_user_id}")
+                self.email_cache.put(clerk_user_id, None)
                 return None
             else:
+                # Not cached: rate limits and outages should be retried
                 logger.error(f"Clerk API error for user {clerk_user_id}: {response.status_code} - {response.text}")
                 return None
-                
+
         except requests.exceptions.Timeout:
             logger.error(f"Timeout getting user email from Clerk for user {clerk_user_id}")
             return None
@@ -81,35 +165,71 @@ class ClerkUserService:
         except Exception as e:
             logger.error(f"Unexpected error getting user email from Clerk for user {clerk_user_id}: {e}")
             return None
-    
+
+    def prefetch_user_emails(self, clerk_user_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve many users' emails with Clerk's list endpoint, 100 per request,
+        filling the cache. Ids Clerk does not return are negatively cached.
+        """
+        result: Dict[str, Optional[str]] = {}
+        missing = []
+        for user_id in dict.fromkeys(clerk_user_ids):
+            found, email = self.email_cache.get(user_id)
+            if found:
+                result[user_id] = email
+            else:
+                missing.append(user_id)
+
+        if missing and not self.secret_key:
+            logger.error("Cannot prefetch user emails: CLERK_SECRET_KEY not configured")
+            return result
+
+        for start in range(0, len(missing), PREFETCH_BATCH_SIZE):
+            batch = missing[start:start + PREFETCH_BATCH_SIZE]
+            try:
+                response = self.session.get(
+                    f"{self.api_url}/users",
+                    params=[('user_id', user_id) for user_id in batch] + [('limit', len(batch))],
+                    timeout=self.timeout,
+                )
+                response.raise_for_status()
+                users = response.json()
+                if isinstance(users, dict):
+                    users = users.get('data', [])
+            except Exception as e:
+                logger.error(f"Error prefetching {len(batch)} user emails from Clerk: {e}")
+                continue
+            returned = {user.get('id'): extract_user_email(user) for user in users}
+            for user_id in batch:
+                email = returned.get(user_id)
+                self.email_cache.put(user_id, email)
+                result[user_id] = email
+        return result
+
+    def invalidate_user_email(self, clerk_user_id: Optional[str] = None) -> None:
+        self.email_cache.invalidate(clerk_user_id)
+
     def get_user_info(self, clerk_user_id: str) -> Optional[dict]:
         """Get full user information from Clerk API"""
         try:
             if not self.secret_key:
                 logger.error("Cannot get user info: CLERK_SECRET_KEY not configured")
                 return None
-            
-            headers = {
-                "Authorization": f"Bearer {self.secret_key}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(
-                f"{self.api_url}/users/{clerk_user_id}",
-                headers=headers,
-                timeout=10
-            )
-            
+
+            response = self.session.get(f"{self.api_url}/users/{clerk_user_id}", timeout=self.timeout)
+
             if response.status_code == 200:
-                return response.json()
+                user_info = response.json()
+                self.email_cache.put(clerk_user_id, extract_user_email(user_info))
+                return user_info
             else:
                 logger.error(f"Clerk API error for user {clerk_user_id}: {response.status_code}")
                 return None
-                
+
         except Exception as e:
             logger.error(f"Error getting user info from Clerk for user {clerk_user_id}: {e}")
             return None
-    
+
     def is_user_valid(self, clerk_user_id: str) -> bool:
         """Check if a user exists and is valid in Clerk"""
         try:
@@ -119,5 +239,36 @@ class ClerkUserService:
             logger.error(f"Error checking user validity for {clerk_user_id}: {e}")
             return False
 
+    def verify_webhook(self, payload: bytes, headers: Mapping[str, str]) -> dict:
+        """
+        Verify a Clerk (Svix-signed) webhook against CLERK_WEBHOOK_SECRET and
+        return the parsed event. Raises ValueError when it does not verify.
+        """
+        secret = getattr(settings, 'CLERK_WEBHOOK_SECRET', None)
+        if not secret:
+            raise ValueError("CLERK_WEBHOOK_SECRET not configured")
+        msg_id = headers.get('svix-id', '')
+        timestamp = headers.get('svix-timestamp', '')
+        signatures = headers.get('svix-signature', '')
+        if not (msg_id and timestamp and signatures):
+            raise ValueError("Missing Svix headers")
+        try:
+            sent_at = int(timestamp)
+        except ValueError:
+            raise ValueError("Invalid Svix timestamp")
+        if abs(time.time() - sent_at) > WEBHOOK_TOLERANCE_SECONDS:
+            raise ValueError("Svix timestamp outside tolerance")
+
+        key = base64.b64decode(secret.split('_', 1)[1] if secret.startswith('whsec_') else secret)
+        body = payload.decode('utf-8') if isinstance(payload, (bytes, bytearray)) else payload
+        digest = hmac.new(key, f"{msg_id}.{timestamp}.{body}".encode('utf-8'), hashlib.sha256).digest()
+        expected = base64.b64encode(digest).decode('ascii')
+        # Header holds space-separated "v1,<signature>" entries (several during secret rotation)
+        for entry in signatures.split():
+            version, _, signature = entry.partition(',')
+            if version == 'v1' and hmac.compare_digest(signature, expected):
+                return json.loads(body)
+        raise ValueError("No matching Svix signature")
+
 # Global instance
-clerk_user_service = ClerkUserService() 
\ No newline at end of file
+clerk_user_service = ClerkUserService()
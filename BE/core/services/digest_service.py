@@ -0,0 +1,199 @@
+"""Hourly and daily digest emails for users who opted out of instant alerts."""
+
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..enums import NotificationFrequency
+from ..models import Keyword, Mention, UserProfile
+from .clerk_service import clerk_user_service
+from .email_service import email_notification_service
+from .mention_writer import mention_writer
+
+logger = logging.getLogger(__name__)
+
+DIGEST_FREQUENCIES = (NotificationFrequency.HOURLY.value, NotificationFrequency.DAILY.value)
+
+WINDOW_LENGTHS = {
+    NotificationFrequency.HOURLY.value: timedelta(hours=1),
+    NotificationFrequency.DAILY.value: timedelta(days=1),
+}
+
+# Re-read this far behind a user's last digest for mentions the writer
+# flushed after that window closed; email_sent keeps them from repeating
+LATE_WRITE_GRACE = timedelta(minutes=5)
+
+
+def window_end(frequency: str, now: datetime, daily_hour: int = 8) -> datetime:
+    """Most recent digest boundary at or before now (UTC): the top of the hour, or daily_hour each day."""
+    now = now.astimezone(dt_timezone.utc) if timezone.is_aware(now) else now.replace(tzinfo=dt_timezone.utc)
+    hour = now.replace(minute=0, second=0, microsecond=0)
+    if frequency == NotificationFrequency.HOURLY.value:
+        return hour
+    boundary = hour.replace(hour=daily_hour)
+    return boundary if boundary <= now else boundary - timedelta(days=1)
+
+
+class DigestScheduler:
+    """
+    Sends one digest per user per window.
+
+    Each window runs a single aggregation over unsent mentions of every user
+    on that frequency, grouped per user. Emails are prefetched from Clerk in
+    bulk, each user gets one email listing their latest max_mentions, and
+    every mention in the window is marked sent with one update.
+
+    A user's window starts at their last successful digest (last_digest_at),
+    or one interval before the end on their first run, so switching to a
+    digest does not mail the whole history. A failed send leaves
+    last_digest_at alone, so those mentions wait for the next run. The
+    mention writer is flushed first. Mentions it still writes later, with an
+    earlier discovered_at, are picked up one window late through
+    LATE_WRITE_GRACE.
+    """
+
+    def __init__(self, check_interval: float = 60, daily_hour: int = 8, max_mentions: int = 50):
+        self.check_interval = max(1.0, float(check_interval))
+        self.daily_hour = min(23, max(0, int(daily_hour)))
+        self.max_mentions = max(1, int(max_mentions))
+        self._last_window: Dict[str, datetime] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="digest-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("digest scheduler started daily_hour=%s UTC max_mentions=%s", self.daily_hour, self.max_mentions)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info("digest scheduler stopped")
+
+    def run_due(self, now: Optional[datetime] = None) -> None:
+        """Send every frequency whose current window has not been run yet."""
+        now = now or timezone.now()
+        for frequency in DIGEST_FREQUENCIES:
+            boundary = window_end(frequency, now, self.daily_hour)
+            if self._last_window.get(frequency) == boundary:
+                continue
+            self.send_window(frequency, boundary)
+            self._last_window[frequency] = boundary
+
+    def send_window(self, frequency: str, end: datetime) -> Dict[str, int]:
+        """Send digests for unsent mentions discovered before end; returns counters."""
+        stats = {"users": 0, "sent": 0, "failed": 0, "mentions": 0}
+        profiles = {
+            profile.user_id: profile
+            for profile in UserProfile.objects(notification_frequency=frequency, email_notifications=True)
+        }
+        if not profiles:
+            return stats
+
+        mention_writer.flush()
+        first_start = end - WINDOW_LENGTHS[frequency]
+        new_users = [user_id for user_id, profile in profiles.items() if profile.last_digest_at is None]
+        if new_users:
+            # Pin the first window's start so a failed first send is retried from it
+            UserProfile.objects(user_id__in=new_users, last_digest_at=None).update(set__last_digest_at=first_start)
+        users_since: Dict[datetime, List[str]] = defaultdict(list)
+        for user_id, profile in profiles.items():
+            if profile.last_digest_at is None:
+                users_since[first_start].append(user_id)
+            else:
+                last = profile.last_digest_at
+                if timezone.is_naive(last):
+                    last = last.replace(tzinfo=dt_timezone.utc)
+                users_since[last - LATE_WRITE_GRACE].append(user_id)
+
+        user_ids = list(profiles)
+        muted_keyword_ids = [
+            str(keyword_id)
+            for keyword_id in Keyword.objects(user_id__in=user_ids, email_notifications=False).scalar('id')
+        ]
+        unsent = {
+            'email_sent': False,
+            'keyword_id': {'$nin': muted_keyword_ids},
+            '$or': [
+                {'user_id': {'$in': users}, 'discovered_at': {'$gte': since, '$lt': end}}
+                for since, users in users_since.items()
+            ],
+        }
+        # Only the newest max_mentions ids per user leave the pipeline, so a
+        # backlogged user cannot push a group past the document size limit
+        groups = list(Mention.objects.aggregate([
+            {'$match': unsent},
+            {'$sort': {'discovered_at': -1}},
+            {'$group': {'_id': '$user_id', 'ids': {'$push': '$_id'}, 'count': {'$sum': 1}}},
+            {'$project': {'ids': {'$slice': ['$ids', self.max_mentions]}, 'count': 1}},
+        ]))
+        if not groups:
+            return stats
+
+        emails = clerk_user_service.prefetch_user_emails([group['_id'] for group in groups])
+        listed_ids = [mention_id for group in groups for mention_id in group['ids']]
+        listed: Dict[str, List[Mention]] = defaultdict(list)
+        for mention in Mention.objects(id__in=listed_ids).order_by('-discovered_at'):
+            listed[mention.user_id].append(mention)
+
+        sent_users = []
+        for group in groups:
+            user_id = group['_id']
+            stats["users"] += 1
+            success = email_notification_service.send_digest_notification(
+                user_id,
+                emails.get(user_id),
+                listed[user_id],
+                profile=profiles[user_id],
+                total_count=group['count'],
+                idempotency_key=f"digest:{frequency}:{user_id}:{end:%Y%m%dT%H}",
+                mark_sent=False,
+            )
+            if success:
+                stats["sent"] += 1
+                stats["mentions"] += group['count']
+                sent_users.append(user_id)
+            else:
+                stats["failed"] += 1
+
+        if sent_users:
+            # Everything the digest counted, not just the listed mentions
+            Mention.objects(__raw__={'user_id': {'$in': sent_users}, **unsent}).update(
+                set__email_sent=True, set__email_sent_at=timezone.now(),
+            )
+            UserProfile.objects(user_id__in=sent_users).update(set__last_digest_at=end)
+        logger.info(
+            "digest window frequency=%s end=%s users=%s sent=%s failed=%s mentions=%s",
+            frequency, end.isoformat(), stats["users"], stats["sent"], stats["failed"], stats["mentions"],
+        )
+        return stats
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.error("digest scheduler run failed: %s", e)
+            self._stop.wait(self.check_interval)
+
+
+# Global instance
+digest_scheduler = DigestScheduler(
+    check_interval=getattr(settings, 'DIGEST_CHECK_SECONDS', 60),
+    daily_hour=getattr(settings, 'DIGEST_DAILY_HOUR', 8),
+    max_mentions=getattr(settings, 'DIGEST_MAX_MENTIONS', 50),
+)
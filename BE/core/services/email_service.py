@@ -6,7 +6,7 @@ from typing import Optional, List
 from datetime import datetime, timezone as dt_timezone
 from django.contrib.auth.models import User
 from ..models import Mention, Keyword, UserProfile
-from ..enums import Platform, MentionContentType
+from ..enums import Platform, MentionContentType, NotificationFrequency
 from .clerk_service import clerk_user_service
 
 logger = logging.getLogger(__name__)
@@ -72,11 +72,11 @@ class EmailNotificationService:
             value = value.replace(tzinfo=dt_timezone.utc)
         return value.astimezone(dt_timezone.utc).strftime("%d %b %Y, %H:%M UTC")
     
-    def get_user_email(self, user_id: str) -> Optional[str]:
+    def get_user_email(self, user_id: str, fresh_after: Optional[datetime] = None) -> Optional[str]:
         """Get user email from Clerk API with fallback to Django User model"""
         try:
             # Try Clerk API first (for Clerk user IDs)
-            email = clerk_user_service.get_user_email(user_id)
+            email = clerk_user_service.get_user_email(user_id, fresh_after=fresh_after)
             if email:
                 logger.info(f"Found email via Clerk API for user {user_id}: {email}")
                 return email
@@ -100,36 +100,68 @@ class EmailNotificationService:
     
     def should_send_notification(self, user_id: str) -> bool:
         """Check if user has email notifications enabled"""
+        return self._notifications_enabled(self._get_profile(user_id))
+
+    def defers_to_digest(self, user_id: str) -> bool:
+        """Check if the user gets mentions in hourly/daily digests instead of instantly"""
+        return not self._wants_instant(self._get_profile(user_id))
+
+    @staticmethod
+    def _get_profile(user_id: str) -> Optional[UserProfile]:
         try:
-            # Check user profile settings
-            profile = UserProfile.objects(user_id=user_id).first()
-            if profile:
-                return profile.email_notifications
-            # Default to True if no profile exists
-            return True
+            return UserProfile.objects(user_id=user_id).first()
         except Exception as e:
-            logger.error(f"Error checking notification settings for user {user_id}: {e}")
-            return True  # Default to True on error
+            logger.error(f"Error loading profile for user {user_id}: {e}")
+            return None
+
+    @staticmethod
+    def _notifications_enabled(profile: Optional[UserProfile]) -> bool:
+        # Default to True if no profile exists (or it could not be loaded)
+        return profile.email_notifications if profile else True
+
+    @staticmethod
+    def _wants_instant(profile: Optional[UserProfile]) -> bool:
+        frequency = getattr(profile, 'notification_frequency', None) or NotificationFrequency.INSTANT.value
+        return frequency == NotificationFrequency.INSTANT.value
     
-    def send_mention_notification(self, mention: Mention, user_email: str = None) -> bool:
-        """Send email notification for a new mention"""
+    @staticmethod
+    def mark_email_sent(mentions: List[Mention]) -> None:
+        """Set email_sent with one targeted update instead of re-saving each document"""
+        sent_at = datetime.now()
+        ids = [mention.id for mention in mentions if mention.id]
+        if ids:
+            Mention.objects(id__in=ids).update(set__email_sent=True, set__email_sent_at=sent_at)
+        for mention in mentions:
+            mention.email_sent = True
+            mention.email_sent_at = sent_at
+            mention._clear_changed_fields()
+
+    def send_mention_notification(self, mention: Mention, user_email: str = None, idempotency_key: str = None) -> bool:
+        """
+        Send email notification for a new mention.
+        With an idempotency_key, Resend drops repeat sends of the same key,
+        so outbox retries cannot deliver the email twice.
+        """
         try:
             if not self.api_key:
                 logger.error("Cannot send email: RESEND_API_KEY not configured")
                 return False
             
+            # Check if user has notifications enabled before resolving the email
+            profile = self._get_profile(mention.user_id)
+            if not self._notifications_enabled(profile):
+                logger.info(f"Email notifications disabled for user {mention.user_id}")
+                return True  # Return True as this is not an error
+
             # Get user email if not provided
             if not user_email:
-                user_email = self.get_user_email(mention.user_id)
+                user_email = self.get_user_email(
+                    mention.user_id, fresh_after=getattr(profile, 'email_changed_at', None),
+                )
                 if not user_email:
                     logger.error(f"No email found for user {mention.user_id}")
                     return False
             
-            # Check if user has notifications enabled
-            if not self.should_send_notification(mention.user_id):
-                logger.info(f"Email notifications disabled for user {mention.user_id}")
-                return True  # Return True as this is not an error
-            
             # Get keyword details
             keyword = Keyword.objects(id=mention.keyword_id).first()
             if not keyword:
@@ -139,6 +171,11 @@ class EmailNotificationService:
             if not getattr(keyword, 'email_notifications', True):
                 logger.info(f"Email notifications disabled for keyword {keyword.id}")
                 return True
+
+            # Hourly/daily users get this mention in their next digest instead
+            if not self._wants_instant(profile):
+                logger.info(f"Mention {mention.id} deferred to digest for user {mention.user_id}")
+                return True
             
             # Prepare email content
             params = {
@@ -149,13 +186,11 @@ class EmailNotificationService:
                 "text": self._plain_text(mention, keyword),
             }
             
-            email_response = resend.Emails.send(params)
+            options = {"idempotency_key": idempotency_key} if idempotency_key else None
+            email_response = resend.Emails.send(params, options)
             logger.info(f"Email notification sent successfully: {email_response.get('id')}")
             
-            # Mark mention as email sent
-            mention.email_sent = True
-            mention.email_sent_at = datetime.now()
-            mention.save()
+            self.mark_email_sent([mention])
             
             return True
             
@@ -163,25 +198,44 @@ class EmailNotificationService:
             logger.error(f"Error sending email notification: {str(e)}")
             return False
     
-    def send_digest_notification(self, user_id: str, user_email: str = None, mentions: List[Mention] = None) -> bool:
-        """Send digest email with multiple mentions"""
+    def send_digest_notification(
+        self,
+        user_id: str,
+        user_email: str = None,
+        mentions: List[Mention] = None,
+        *,
+        profile: Optional[UserProfile] = None,
+        total_count: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
+        mark_sent: bool = True,
+    ) -> bool:
+        """
+        Send digest email with multiple mentions.
+        The digest scheduler passes the profile it already loaded, the full
+        count when only the latest mentions are listed, and mark_sent=False
+        because it marks the whole window sent in one update.
+        """
         try:
             if not self.api_key:
                 logger.error("Cannot send email: RESEND_API_KEY not configured")
                 return False
             
+            # Check if user has notifications enabled before resolving the email
+            if profile is None:
+                profile = self._get_profile(user_id)
+            if not self._notifications_enabled(profile):
+                logger.info(f"Email notifications disabled for user {user_id}")
+                return True  # Return True as this is not an error
+
             # Get user email if not provided
             if not user_email:
-                user_email = self.get_user_email(user_id)
+                user_email = self.get_user_email(
+                    user_id, fresh_after=getattr(profile, 'email_changed_at', None),
+                )
                 if not user_email:
                     logger.error(f"No email found for user {user_id}")
                     return False
             
-            # Check if user has notifications enabled
-            if not self.should_send_notification(user_id):
-                logger.info(f"Email notifications disabled for user {user_id}")
-                return True  # Return True as this is not an error
-            
             if not mentions:
                 logger.info("No mentions to send in digest")
                 return True
@@ -194,22 +248,23 @@ class EmailNotificationService:
                     mentions_by_keyword[keyword_id] = []
                 mentions_by_keyword[keyword_id].append(mention)
             
+            keywords = {str(keyword.id): keyword for keyword in Keyword.objects(id__in=list(mentions_by_keyword))}
+            total = max(total_count or 0, len(mentions))
+
             # Prepare email content
             params = {
                 "from": self._from_address(),
                 "to": [user_email],
-                "subject": self._digest_subject(mentions_by_keyword),
-                "html": self._generate_digest_html_content(mentions_by_keyword),
+                "subject": self._digest_subject(mentions_by_keyword, keywords, total),
+                "html": self._generate_digest_html_content(mentions_by_keyword, keywords, total),
             }
             
-            email_response = resend.Emails.send(params)
+            options = {"idempotency_key": idempotency_key} if idempotency_key else None
+            email_response = resend.Emails.send(params, options)
             logger.info(f"Digest email sent successfully: {email_response.get('id')}")
             
-            # Mark all mentions as email sent
-            for mention in mentions:
-                mention.email_sent = True
-                mention.email_sent_at = datetime.now()
-                mention.save()
+            if mark_sent:
+                self.mark_email_sent(mentions)
             
             return True
             
@@ -327,23 +382,23 @@ class EmailNotificationService:
         preheader = f"{mention.author or 'Someone'} mentioned {keyword.keyword} on {platform_name}"
         return self._layout(preheader, inner)
     
-    def _digest_subject(self, mentions_by_keyword: dict) -> str:
-        total = sum(len(m) for m in mentions_by_keyword.values())
+    def _digest_subject(self, mentions_by_keyword: dict, keywords: dict, total: int) -> str:
         noun = "mention" if total == 1 else "mentions"
         if len(mentions_by_keyword) == 1:
-            keyword = Keyword.objects(id=next(iter(mentions_by_keyword))).first()
+            keyword = keywords.get(str(next(iter(mentions_by_keyword))))
             if keyword:
                 return f"{total} new {keyword.keyword} {noun}"
         return f"{total} new {noun} across {len(mentions_by_keyword)} keywords"
 
-    def _generate_digest_html_content(self, mentions_by_keyword: dict) -> str:
+    def _generate_digest_html_content(self, mentions_by_keyword: dict, keywords: dict, total_mentions: int) -> str:
         """Generate HTML email content for digest with multiple mentions"""
-        total_mentions = sum(len(mentions) for mentions in mentions_by_keyword.values())
         noun = "mention" if total_mentions == 1 else "mentions"
+        listed = sum(len(mentions) for mentions in mentions_by_keyword.values())
+        scope = f"Latest {listed} across" if listed < total_mentions else "Across"
 
         sections: List[str] = []
         for keyword_id, mentions in mentions_by_keyword.items():
-            keyword = Keyword.objects(id=keyword_id).first()
+            keyword = keywords.get(str(keyword_id))
             if not keyword:
                 continue
 
@@ -377,7 +432,7 @@ class EmailNotificationService:
   {total_mentions} new {noun}
 </div>
 <div style="font-family:{_FONT};font-size:14px;color:{_MUTED};">
-  Across {len(mentions_by_keyword)} of your keywords
+  {scope} {len(mentions_by_keyword)} of your keywords
 </div>
 {''.join(sections)}
 <div style="padding-top:26px;">
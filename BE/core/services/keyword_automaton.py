@@ -0,0 +1,116 @@
+"""Aho-Corasick automaton over the keyword set of a monitor."""
+
+import logging
+from collections import deque
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordAutomaton:
+    """
+    Multi-pattern matcher built once from a set of Keyword documents.
+
+    Patterns are the lowered keyword texts, so one pass over the lowered content
+    finds every keyword that could match under any match mode or case setting.
+    Callers still confirm each hit with GenericMatchingEngine, which applies the
+    match mode, case sensitivity and filters.
+    """
+
+    def __init__(self, keywords: Iterable[Any]):
+        self.keywords: List[Any] = list(keywords)
+        # Per node: outgoing edges, failure link, and pattern ids ending here
+        # (including those inherited through the failure chain).
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._pattern_lengths: List[int] = []
+        self._pattern_keywords: List[List[Any]] = []
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _build(self) -> None:
+        pattern_ids: Dict[str, int] = {}
+        for keyword in self.keywords:
+            text = (getattr(keyword, 'keyword', '') or '').lower()
+            if not text:
+                continue
+            pattern_id = pattern_ids.get(text)
+            if pattern_id is None:
+                pattern_id = len(self._pattern_lengths)
+                pattern_ids[text] = pattern_id
+                self._pattern_lengths.append(len(text))
+                self._pattern_keywords.append([])
+                self._insert(text, pattern_id)
+            self._pattern_keywords[pattern_id].append(keyword)
+
+        queue = deque()
+        for node in self._goto[0].values():
+            queue.append(node)
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        logger.debug(
+            "keyword automaton built keywords=%s patterns=%s nodes=%s",
+            len(self.keywords), len(self._pattern_lengths), len(self._goto),
+        )
+
+    def _insert(self, text: str, pattern_id: int) -> None:
+        node = 0
+        for char in text:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = child
+        self._output[node].append(pattern_id)
+
+    def scan(self, content: str, lowered: bool = False) -> List[Tuple[Any, int]]:
+        """
+        Return (keyword, position) for every keyword found in content.
+
+        Positions index the lowered content and point at the first occurrence.
+        Results are ordered by position. Pass lowered=True when the caller has
+        already lowered the content.
+        """
+        if not content or not self._pattern_lengths:
+            return []
+        text = content if lowered else content.lower()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._pattern_lengths
+        first_seen: Dict[int, int] = {}
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                for pattern_id in output[node]:
+                    if pattern_id not in first_seen:
+                        first_seen[pattern_id] = index - lengths[pattern_id] + 1
+
+        hits: List[Tuple[Any, int]] = []
+        for pattern_id, position in sorted(first_seen.items(), key=lambda item: item[1]):
+            for keyword in self._pattern_keywords[pattern_id]:
+                hits.append((keyword, position))
+        return hits
+
+    def candidates(self, content: str, lowered: bool = False) -> List[Any]:
+        """Keywords whose text occurs somewhere in content."""
+        return [keyword for keyword, _ in self.scan(content, lowered=lowered)]
@@ -0,0 +1,96 @@
+"""Per-user keyword cache for API read paths."""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from .. import request_cache
+from ..models import Keyword
+
+
+class UserKeywordCache:
+    """
+    Thread-safe LRU of user id -> that user's keyword documents.
+
+    One query loads all of a user's keywords; mention labels and analytics
+    rows are then served from memory. Entries are dropped by invalidate()
+    whenever this process creates, edits, toggles, deletes or bulk-updates
+    keywords, and expire after ttl seconds so changes made by other processes
+    show up within that bound. Reads that drive writes, such as billing's
+    keyword selection, must not use it.
+
+    Raw documents are cached and every read returns fresh Keyword instances,
+    so callers may modify what they get without touching the cache.
+    """
+
+    def __init__(self, ttl: float = 30, maxsize: int = 2000):
+        self.ttl = max(0.0, float(ttl))
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        # user id -> (raw keyword documents newest first, expires_at monotonic)
+        self._entries: "OrderedDict[str, Tuple[List[dict], float]]" = OrderedDict()
+        # Bumped by invalidate() so a load that raced with it is not stored
+        self._generations: Dict[str, int] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def keywords(self, user_id: str) -> List[Keyword]:
+        """All of the user's keywords, newest first."""
+        return [Keyword._from_son(copy.deepcopy(son)) for son in self._documents(user_id)]
+
+    def labels(self, user_id: str) -> Dict[str, str]:
+        """Keyword id -> keyword text, for labelling mentions."""
+        return {str(son['_id']): son.get('keyword', '') for son in self._documents(user_id)}
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop one user's entry, or everything when user_id is None."""
+        # Request-scoped values derived from keywords (e.g. billing usage) go too
+        request_cache.discard_user(user_id)
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+                self._generations.clear()
+                self._generation += 1
+            else:
+                self._entries.pop(user_id, None)
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def _documents(self, user_id: str) -> List[dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                documents, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return documents
+                del self._entries[user_id]
+            self.misses += 1
+            generation = (self._generation, self._generations.get(user_id, 0))
+
+        documents = list(Keyword.objects(user_id=user_id).order_by('-created_at').as_pymongo())
+
+        if self.maxsize and self.ttl:
+            with self._lock:
+                if generation == (self._generation, self._generations.get(user_id, 0)):
+                    self._entries[user_id] = (documents, time.monotonic() + self.ttl)
+                    self._entries.move_to_end(user_id)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+        return documents
+
+
+# Global instance
+keyword_cache = UserKeywordCache(
+    ttl=getattr(settings, 'KEYWORD_CACHE_SECONDS', 30),
+    maxsize=getattr(settings, 'KEYWORD_CACHE_SIZE', 2000),
+)
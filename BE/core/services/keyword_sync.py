@@ -0,0 +1,250 @@
+"""Keyword set deltas for hot-reloading running platform monitors."""
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.models import Keyword
+
+logger = logging.getLogger(__name__)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Stored datetimes come back naive UTC; make aware ones comparable."""
+    if value.tzinfo is not None:
+        value = value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def keyword_id(keyword: Any) -> str:
+    return str(getattr(keyword, 'id', '') or '')
+
+
+def keyword_fingerprint(keyword: Any) -> str:
+    """
+    Value that changes whenever a keyword's settings change.
+
+    Keyword.save() stamps updated_at, so that is enough for stored keywords;
+    anything without it falls back to a digest of its fields.
+    """
+    source = getattr(keyword, 'source', keyword)  # unwrap CompiledKeyword
+    updated_at = getattr(source, 'updated_at', None)
+    if updated_at is not None:
+        return updated_at.isoformat()
+    to_mongo = getattr(source, 'to_mongo', None)
+    if to_mongo is not None:
+        data = to_mongo().to_dict()
+    else:
+        data = dict(vars(source))
+    payload = json.dumps(data, default=str, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class KeywordDelta:
+    """Keywords added, changed or removed since a service's last snapshot."""
+
+    added: List[Any] = field(default_factory=list)
+    updated: List[Any] = field(default_factory=list)
+    removed_ids: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed_ids)
+
+    def apply(self, current: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a new id -> keyword map with the delta applied; current is not modified."""
+        result = dict(current)
+        for removed in self.removed_ids:
+            result.pop(removed, None)
+        for keyword in self.added + self.updated:
+            result[keyword_id(keyword)] = keyword
+        return result
+
+    def summary(self) -> str:
+        return f"added={len(self.added)} updated={len(self.updated)} removed={len(self.removed_ids)}"
+
+
+class KeywordSnapshot:
+    """
+    Fingerprints of the keywords a service was last given, used to diff the
+    next active keyword set into a KeywordDelta.
+    """
+
+    def __init__(self):
+        self.fingerprints: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def diff(self, keywords: Iterable[Any]) -> KeywordDelta:
+        delta = KeywordDelta()
+        seen = set()
+        for keyword in keywords:
+            key = keyword_id(keyword)
+            seen.add(key)
+            previous = self.fingerprints.get(key)
+            if previous is None:
+                delta.added.append(keyword)
+            elif previous != keyword_fingerprint(keyword):
+                delta.updated.append(keyword)
+        delta.removed_ids = [key for key in self.fingerprints if key not in seen]
+        return delta
+
+    def commit(self, delta: KeywordDelta) -> None:
+        for removed in delta.removed_ids:
+            self.fingerprints.pop(removed, None)
+        for keyword in delta.added + delta.updated:
+            self.fingerprints[keyword_id(keyword)] = keyword_fingerprint(keyword)
+
+    def clear(self) -> None:
+        self.fingerprints.clear()
+
+
+class KeywordChangeFeed:
+    """
+    Reports active keywords that changed since the last poll.
+
+    Uses a MongoDB change stream on the keywords collection when the server
+    supports it (replica sets / Atlas). Otherwise, or if the stream fails,
+    it polls an updated_at high-water mark: a projected query finds ids whose
+    updated_at moved, and only those documents are loaded in full. The query
+    re-reads an overlap window behind the mark so writes that commit out of
+    order are not missed, and a version map keeps re-reads from being
+    reported twice. Hard deletes are invisible to updated_at, so an id-only
+    scan of active keywords runs every delete_scan_interval seconds.
+
+    Every keyword write must bump updated_at (Keyword.save() does).
+    """
+
+    def __init__(
+        self,
+        use_change_stream: bool = True,
+        overlap_seconds: float = 30,
+        delete_scan_interval: float = 60,
+    ):
+        self.use_change_stream = use_change_stream
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.delete_scan_interval = delete_scan_interval
+        self.high_water_mark: Optional[datetime] = None
+        # Active keyword id -> updated_at last reported
+        self.versions: Dict[str, Optional[datetime]] = {}
+        self._stream = None
+        self._last_delete_scan = 0.0
+
+    def load(self) -> List[Any]:
+        """Full load of active keywords; resets the feed position."""
+        self._open_change_stream()
+        loaded_at = _naive_utc(datetime.now(dt_timezone.utc))
+        keywords = list(Keyword.objects(is_active=True))
+        self.versions = {keyword_id(keyword): keyword.updated_at for keyword in keywords}
+        # Legacy keywords may have no updated_at; start from the load time so
+        # polls stay filtered instead of rescanning the whole collection
+        self.high_water_mark = max(
+            (_naive_utc(keyword.updated_at) for keyword in keywords if keyword.updated_at), default=loaded_at
+        )
+        self._last_delete_scan = time.monotonic()
+        return keywords
+
+    def poll(self) -> Tuple[List[Any], List[str]]:
+        """Return (changed active keywords, removed keyword ids) since the last poll."""
+        if self._stream is not None:
+            try:
+                return self._poll_change_stream()
+            except Exception as e:
+                logger.warning("keyword change stream failed, falling back to polling: %s", e)
+                self._close_change_stream()
+        changed, removed = self._poll_updated_at()
+        if time.monotonic() - self._last_delete_scan >= self.delete_scan_interval:
+            removed.extend(key for key in self._scan_deleted() if key not in removed)
+        return changed, removed
+
+    def close(self) -> None:
+        self._close_change_stream()
+
+    @property
+    def mode(self) -> str:
+        return 'change_stream' if self._stream is not None else 'polling'
+
+    def _open_change_stream(self) -> None:
+        self._close_change_stream()
+        if not self.use_change_stream:
+            return
+        try:
+            self._stream = Keyword._get_collection().watch(
+                full_document='updateLookup', max_await_time_ms=100,
+            )
+        except Exception as e:
+            logger.info("keyword change streams unavailable, using updated_at polling: %s", e)
+            self._stream = None
+
+    def _close_change_stream(self) -> None:
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+
+    def _poll_change_stream(self) -> Tuple[List[Any], List[str]]:
+        changed_ids: Dict[str, None] = {}
+        removed: List[str] = []
+        while True:
+            change = self._stream.try_next()
+            if change is None:
+                break
+            key = str(change.get('documentKey', {}).get('_id', ''))
+            if not key:
+                continue
+            document = change.get('fullDocument')
+            if change.get('operationType') == 'delete' or not document or not document.get('is_active', True):
+                changed_ids.pop(key, None)
+                if key in self.versions:
+                    removed.append(key)
+                    self.versions.pop(key, None)
+                continue
+            changed_ids[key] = None
+            updated_at = document.get('updated_at')
+            if updated_at and (self.high_water_mark is None or _naive_utc(updated_at) > self.high_water_mark):
+                self.high_water_mark = _naive_utc(updated_at)
+
+        changed = list(Keyword.objects(id__in=list(changed_ids), is_active=True)) if changed_ids else []
+        for keyword in changed:
+            self.versions[keyword_id(keyword)] = keyword.updated_at
+        return changed, removed
+
+    def _poll_updated_at(self) -> Tuple[List[Any], List[str]]:
+        query = Keyword.objects
+        if self.high_water_mark is not None:
+            query = query(updated_at__gte=self.high_water_mark - self.overlap)
+        rows = query.only('id', 'updated_at', 'is_active')
+
+        changed_ids: List[str] = []
+        removed: List[str] = []
+        for row in rows:
+            key = keyword_id(row)
+            if row.updated_at and (self.high_water_mark is None or _naive_utc(row.updated_at) > self.high_water_mark):
+                self.high_water_mark = _naive_utc(row.updated_at)
+            if not row.is_active:
+                if key in self.versions:
+                    removed.append(key)
+                    self.versions.pop(key, None)
+                continue
+            if key not in self.versions or self.versions[key] != row.updated_at:
+                changed_ids.append(key)
+
+        changed = list(Keyword.objects(id__in=changed_ids, is_active=True)) if changed_ids else []
+        for keyword in changed:
+            self.versions[keyword_id(keyword)] = keyword.updated_at
+        return changed, removed
+
+    def _scan_deleted(self) -> List[str]:
+        self._last_delete_scan = time.monotonic()
+        active_ids = {str(row.id) for row in Keyword.objects(is_active=True).only('id')}
+        removed = [key for key in self.versions if key not in active_ids]
+        for key in removed:
+            self.versions.pop(key, None)
+        return removed
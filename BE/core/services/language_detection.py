@@ -1,30 +1,150 @@
+import hashlib
 import logging
 import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
 
-from langdetect import LangDetectException, detect
+from django.conf import settings
+from langdetect import DetectorFactory, LangDetectException, detect
+
+from .ngram_language_model import ngram_language_model
 
 logger = logging.getLogger(__name__)
 
 MIN_DETECT_LENGTH = 20
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_BACKEND = "langdetect"
 
 _WHITESPACE = re.compile(r"\s+")
 
+# langdetect samples randomly; a fixed seed keeps results (and cached values) stable.
+DetectorFactory.seed = 0
+
+
+class LanguageDetectionCache:
+    """Thread-safe LRU of detected language codes keyed by a hash of the normalized text."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(text: str) -> bytes:
+        return hashlib.sha1(text.encode("utf-8", "surrogatepass")).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            code = self._entries.get(key)
+            if code is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return code
+
+    def put(self, key: bytes, code: str) -> None:
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._entries[key] = code
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+_cache: Optional[LanguageDetectionCache] = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache() -> LanguageDetectionCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                size = getattr(settings, "LANGUAGE_DETECTION_CACHE_SIZE", DEFAULT_CACHE_SIZE)
+                _cache = LanguageDetectionCache(size)
+    return _cache
+
+
+def language_detection_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and size of the detection cache."""
+    return _get_cache().info()
+
+
+def clear_language_detection_cache() -> None:
+    _get_cache().clear()
+
+
+def _detect_with_langdetect(cleaned: str) -> str:
+    return detect(cleaned)
+
+
+def _detect_with_ngram(cleaned: str) -> str:
+    return ngram_language_model.detect(cleaned) or ""
+
+
+# Each backend takes whitespace-normalized text of at least MIN_DETECT_LENGTH
+# and returns a raw language code; detect_language trims it to ISO 639-1.
+BACKENDS: Dict[str, Callable[[str], str]] = {
+    "langdetect": _detect_with_langdetect,
+    "ngram": _detect_with_ngram,
+}
+
+
+def get_backend_name() -> str:
+    name = (getattr(settings, "LANGUAGE_DETECTION_BACKEND", "") or DEFAULT_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        logger.warning("Unknown LANGUAGE_DETECTION_BACKEND=%r, using %s", name, DEFAULT_BACKEND)
+        return DEFAULT_BACKEND
+    return name
+
+
+def _detect_uncached(cleaned: str, backend: str) -> str:
+    try:
+        code = BACKENDS[backend](cleaned)
+        return (code or "").strip().lower()[:2]
+    except LangDetectException:
+        logger.debug("Language detection failed for text snippet: %r", cleaned[:80])
+        return ""
+    except Exception:
+        logger.exception("Unexpected language detection error backend=%s", backend)
+        return ""
+
 
 def detect_language(text: str) -> str:
     """
     Detect ISO 639-1 language code from text.
     Returns empty string when text is too short or detection fails.
+    Results are memoized per backend and normalized text.
     """
     cleaned = _WHITESPACE.sub(" ", (text or "").strip())
     if len(cleaned) < MIN_DETECT_LENGTH:
         return ""
 
-    try:
-        code = detect(cleaned)
-        return (code or "").strip().lower()[:2]
-    except LangDetectException:
-        logger.debug("Language detection failed for text snippet: %r", cleaned[:80])
-        return ""
-    except Exception:
-        logger.exception("Unexpected language detection error")
-        return ""
+    backend = get_backend_name()
+    cache = _get_cache()
+    key = cache.key_for(f"{backend}\0{cleaned}")
+    code = cache.get(key)
+    if code is None:
+        code = _detect_uncached(cleaned, backend)
+        cache.put(key, code)
+    return code
@@ -1,12 +1,13 @@
 import re
 import logging
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
+from typing import Any, FrozenSet, List, Dict, Optional, Tuple
 from ..enums import (
     MatchMode, CaseSensitivity, ContentType, MentionContentType,
     PLATFORM_CONTENT_MAPPING
 )
 
+from .keyword_automaton import KeywordAutomaton
 from .language_detection import detect_language
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,74 @@ class MatchContext:
     source_label: str = ""
 
 
+def _normalize_handle(value: str) -> str:
+    # "@Handle", "r/Sub" and "/r/sub" all normalize to the bare lowered name
+    return (value or "").strip().lower().lstrip('@').removeprefix('/').removeprefix('r/')
+
+
+def _normalize_language(value: str) -> str:
+    return (value or "").strip().lower()[:2]
+
+
+def _normalized_set(values, normalize) -> FrozenSet[str]:
+    return frozenset(normalize(item) for item in values or [])
+
+
+class CompiledKeyword:
+    """
+    Keyword document with its matching state precomputed.
+
+    Built once when monitoring starts so the per-item path does no regex
+    compilation or set building. Unknown attributes (id, user_id, platform...)
+    are read from the wrapped document.
+    """
+
+    def __init__(self, keyword_obj):
+        self.source = keyword_obj
+        self.keyword = getattr(keyword_obj, 'keyword', '') or ''
+        self.lowered = self.keyword.lower()
+        self.case_sensitive = bool(getattr(keyword_obj, 'case_sensitive', False))
+        self.match_mode = getattr(keyword_obj, 'match_mode', None) or MatchMode.CONTAINS.value
+        # The keyword as compared against transformed content
+        self.needle = self.keyword if self.case_sensitive else self.lowered
+        self.pattern = None
+        if self.match_mode == MatchMode.WORD_BOUNDARY.value and self.needle:
+            self.pattern = re.compile(r'\b' + re.escape(self.needle) + r'\b')
+
+        self.content_type_set = frozenset(getattr(keyword_obj, 'content_types', None) or [])
+        self.excluded_subreddit_set = _normalized_set(
+            getattr(keyword_obj, 'excluded_subreddits', None), _normalize_handle
+        )
+        self.included_user_set = _normalized_set(
+            getattr(keyword_obj, 'included_users', None), _normalize_handle
+        )
+        self.excluded_user_set = _normalized_set(
+            getattr(keyword_obj, 'excluded_users', None), _normalize_handle
+        )
+        self.included_language_set = _normalized_set(
+            getattr(keyword_obj, 'included_languages', None), _normalize_language
+        )
+        self.excluded_language_set = _normalized_set(
+            getattr(keyword_obj, 'excluded_languages', None), _normalize_language
+        )
+        self.platform_filter_set = _normalized_set(
+            getattr(keyword_obj, 'platform_specific_filters', None), _normalize_handle
+        )
+        excluded_terms = [term for term in getattr(keyword_obj, 'excluded_keywords', None) or [] if term]
+        self.excluded_terms: Tuple[str, ...] = tuple(
+            excluded_terms if self.case_sensitive else (term.lower() for term in excluded_terms)
+        )
+        self.has_language_filters = bool(self.included_language_set or self.excluded_language_set)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'source':
+            raise AttributeError(name)
+        return getattr(self.source, name)
+
+    def __repr__(self):
+        return f"CompiledKeyword({self.keyword!r})"
+
+
 class MatchResult:
     """Result of a keyword match"""
     
@@ -58,29 +127,26 @@ class GenericMatchingEngine:
             MatchResult object with match details
         """
         try:
+            compiled = self.compile_keyword(keyword_obj)
+
             # Check if content type is monitored
-            if content_type not in keyword_obj.content_types:
+            if content_type not in compiled.content_type_set:
                 return MatchResult(matched=False)
             
-            # Get keyword and matching settings
-            keyword = keyword_obj.keyword
-            match_mode = keyword_obj.match_mode
-            case_sensitive = keyword_obj.case_sensitive
-            
             # Apply case sensitivity
-            case_mode = CaseSensitivity.CASE_SENSITIVE.value if case_sensitive else CaseSensitivity.CASE_INSENSITIVE.value
+            case_mode = CaseSensitivity.CASE_SENSITIVE.value if compiled.case_sensitive else CaseSensitivity.CASE_INSENSITIVE.value
             transform_func = self.case_modes[case_mode]
             
             transformed_content = transform_func(content)
-            transformed_keyword = transform_func(keyword)
             
             # Apply matching mode
             match_result = self._apply_matching_mode(
                 transformed_content, 
-                transformed_keyword, 
-                match_mode,
+                compiled.needle, 
+                compiled.match_mode,
                 original_content=content,
-                original_keyword=keyword
+                original_keyword=compiled.keyword,
+                pattern=compiled.pattern,
             )
             
             return match_result
@@ -89,8 +155,19 @@ class GenericMatchingEngine:
             logger.error(f"Error in keyword matching: {e}")
             return MatchResult(matched=False)
     
+    def compile_keyword(self, keyword_obj) -> CompiledKeyword:
+        """Return the precompiled form of a keyword (no-op if already compiled)"""
+        if isinstance(keyword_obj, CompiledKeyword):
+            return keyword_obj
+        return CompiledKeyword(keyword_obj)
+
+    def compile_keywords(self, keywords) -> List[CompiledKeyword]:
+        """Precompile a keyword set once, when monitoring starts"""
+        return [self.compile_keyword(keyword_obj) for keyword_obj in keywords]
+
     def _apply_matching_mode(self, content: str, keyword: str, match_mode: str, 
-                           original_content: str = "", original_keyword: str = "") -> MatchResult:
+                           original_content: str = "", original_keyword: str = "",
+                           pattern: Optional[re.Pattern] = None) -> MatchResult:
         """Apply specific matching mode"""
         
         if match_mode == MatchMode.EXACT.value:
@@ -98,7 +175,7 @@ class GenericMatchingEngine:
         elif match_mode == MatchMode.CONTAINS.value:
             return self._contains_match(content, keyword, original_content, original_keyword)
         elif match_mode == MatchMode.WORD_BOUNDARY.value:
-            return self._word_boundary_match(content, keyword, original_content, original_keyword)
+            return self._word_boundary_match(content, keyword, original_content, original_keyword, pattern)
         elif match_mode == MatchMode.STARTS_WITH.value:
             return self._starts_with_match(content, keyword, original_content, original_keyword)
         elif match_mode == MatchMode.ENDS_WITH.value:
@@ -132,12 +209,14 @@ class GenericMatchingEngine:
             )
         return MatchResult(matched=False)
     
-    def _word_boundary_match(self, content: str, keyword: str, original_content: str, original_keyword: str) -> MatchResult:
+    def _word_boundary_match(self, content: str, keyword: str, original_content: str, original_keyword: str,
+                             pattern: Optional[re.Pattern] = None) -> MatchResult:
         """Word boundary match using regex"""
         try:
-            # Create word boundary pattern
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            match = re.search(pattern, content)
+            # Precompiled keywords carry their pattern; build one otherwise
+            if pattern is None:
+                pattern = re.compile(r'\b' + re.escape(keyword) + r'\b')
+            match = pattern.search(content)
             
             if match:
                 start_pos = match.start()
@@ -221,16 +300,16 @@ class GenericMatchingEngine:
     
     def should_monitor_content(self, keyword_obj, content_type: str) -> bool:
         """Check if keyword should monitor this content type"""
+        if isinstance(keyword_obj, CompiledKeyword):
+            return content_type in keyword_obj.content_type_set
         content_types = keyword_obj.content_types or []
         return content_type in content_types
 
     def _normalize_handle(self, value: str) -> str:
-        return (value or "").strip().lower().lstrip('@').lstrip('r/')
+        return _normalize_handle(value)
 
     def _keyword_has_language_filters(self, keyword_obj) -> bool:
-        included = getattr(keyword_obj, 'included_languages', None) or []
-        excluded = getattr(keyword_obj, 'excluded_languages', None) or []
-        return bool(included or excluded)
+        return self.compile_keyword(keyword_obj).has_language_filters
 
     def _resolve_context_language(
         self,
@@ -247,74 +326,63 @@ class GenericMatchingEngine:
         return context
 
     def _normalize_language(self, value: str) -> str:
-        return (value or "").strip().lower()[:2]
-
-    def _text_contains_term(self, content: str, term: str, case_sensitive: bool) -> bool:
-        if not content or not term:
-            return False
-        if case_sensitive:
-            return term in content
-        return term.lower() in content.lower()
+        return _normalize_language(value)
 
-    def has_excluded_keywords(self, keyword_obj, content: str) -> bool:
-        excluded = getattr(keyword_obj, 'excluded_keywords', None) or []
-        if not excluded or not content:
+    def has_excluded_keywords(self, keyword_obj, content: str, lowered: Optional[str] = None) -> bool:
+        compiled = self.compile_keyword(keyword_obj)
+        if not compiled.excluded_terms or not content:
             return False
-        case_sensitive = bool(getattr(keyword_obj, 'case_sensitive', False))
-        return any(
-            self._text_contains_term(content, term, case_sensitive)
-            for term in excluded
-            if term
-        )
+        if compiled.case_sensitive:
+            haystack = content
+        else:
+            haystack = lowered if lowered is not None else content.lower()
+        return any(term in haystack for term in compiled.excluded_terms)
 
-    def passes_context_filters(self, keyword_obj, context: Optional[MatchContext]) -> bool:
+    def passes_source_filters(self, keyword_obj, context: Optional[MatchContext]) -> bool:
+        """Subreddit, author and platform filters; cheap set lookups on the context."""
         if context is None:
             return True
+        compiled = self.compile_keyword(keyword_obj)
 
-        subreddit = self._normalize_handle(context.subreddit)
-        excluded_subreddits = getattr(keyword_obj, 'excluded_subreddits', None) or []
-        if subreddit and excluded_subreddits:
-            excluded = {self._normalize_handle(item) for item in excluded_subreddits}
-            if subreddit in excluded:
-                return False
+        subreddit = _normalize_handle(context.subreddit)
+        if subreddit and subreddit in compiled.excluded_subreddit_set:
+            return False
 
-        author = self._normalize_handle(context.author)
-        included_users = getattr(keyword_obj, 'included_users', None) or []
-        if included_users:
-            allowed = {self._normalize_handle(item) for item in included_users}
-            if not author or author not in allowed:
+        author = _normalize_handle(context.author)
+        if compiled.included_user_set:
+            if not author or author not in compiled.included_user_set:
                 return False
 
-        excluded_users = getattr(keyword_obj, 'excluded_users', None) or []
-        if author and excluded_users:
-            blocked = {self._normalize_handle(item) for item in excluded_users}
-            if author in blocked:
-                return False
+        if author and author in compiled.excluded_user_set:
+            return False
 
-        language = self._normalize_language(context.language)
-        included_languages = getattr(keyword_obj, 'included_languages', None) or []
-        if included_languages:
-            if not language:
-                return False
-            allowed_langs = {self._normalize_language(item) for item in included_languages}
-            if language not in allowed_langs:
+        if compiled.platform_filter_set and context.source_label:
+            if _normalize_handle(context.source_label) not in compiled.platform_filter_set:
                 return False
 
-        excluded_languages = getattr(keyword_obj, 'excluded_languages', None) or []
-        if language and excluded_languages:
-            blocked_langs = {self._normalize_language(item) for item in excluded_languages}
-            if language in blocked_langs:
-                return False
+        return True
+
+    def passes_language_filters(self, keyword_obj, context: Optional[MatchContext]) -> bool:
+        """Included/excluded language filters against an already resolved context.language."""
+        if context is None:
+            return True
+        compiled = self.compile_keyword(keyword_obj)
 
-        platform_filters = getattr(keyword_obj, 'platform_specific_filters', None) or []
-        if platform_filters and context.source_label:
-            allowed_sources = {self._normalize_handle(item) for item in platform_filters}
-            source = self._normalize_handle(context.source_label)
-            if source not in allowed_sources:
+        language = _normalize_language(context.language)
+        if compiled.included_language_set:
+            if not language or language not in compiled.included_language_set:
                 return False
 
+        if language and language in compiled.excluded_language_set:
+            return False
+
         return True
 
+    def passes_context_filters(self, keyword_obj, context: Optional[MatchContext]) -> bool:
+        return self.passes_source_filters(keyword_obj, context) and self.passes_language_filters(
+            keyword_obj, context
+        )
+
     def should_create_mention(
         self,
         keyword_obj,
@@ -322,18 +390,87 @@ class GenericMatchingEngine:
         content_type: str,
         context: Optional[MatchContext] = None,
     ) -> MatchResult:
-        if not self.should_monitor_content(keyword_obj, content_type):
+        # Cheapest checks first: language detection only runs for content
+        # that already contains the keyword and passes the source filters.
+        compiled = self.compile_keyword(keyword_obj)
+        if not self.should_monitor_content(compiled, content_type):
             return MatchResult(matched=False)
 
-        context = self._resolve_context_language(keyword_obj, content, context)
-        if not self.passes_context_filters(keyword_obj, context):
+        if not self.passes_source_filters(compiled, context):
             return MatchResult(matched=False)
 
-        match_result = self.match_keyword(keyword_obj, content, content_type)
+        match_result = self.match_keyword(compiled, content, content_type)
         if not match_result:
             return match_result
-        if context:
-            match_result.detected_language = context.language or ""
-        if self.has_excluded_keywords(keyword_obj, content):
+        if self.has_excluded_keywords(compiled, content):
             return MatchResult(matched=False)
-        return match_result 
\ No newline at end of file
+
+        context = self._resolve_context_language(compiled, content, context)
+        if not self.passes_language_filters(compiled, context):
+            return MatchResult(matched=False)
+        match_result.detected_language = context.language or ""
+        return match_result
+
+    def match_batch(
+        self,
+        content: str,
+        content_type: str,
+        context: Optional[MatchContext],
+        keywords,
+    ) -> List[Tuple[Any, MatchResult]]:
+        """
+        Match one content item against many keywords in a single call.
+
+        Same outcome as calling should_create_mention per keyword, but the
+        content is lowered once and language is detected at most once, and
+        only after some keyword with language filters has matched the text.
+        keywords may be a list or a KeywordAutomaton, in which case only the
+        keywords found by its single pass are considered.
+
+        Returns (keyword, MatchResult) pairs for the keywords that matched.
+        """
+        matches: List[Tuple[Any, MatchResult]] = []
+        if not content:
+            return matches
+        if context is None:
+            context = MatchContext()
+
+        lowered = content.lower()
+        if isinstance(keywords, KeywordAutomaton):
+            keywords = keywords.candidates(lowered, lowered=True)
+        language_resolved = bool(context.language)
+
+        for keyword_obj in keywords:
+            try:
+                compiled = self.compile_keyword(keyword_obj)
+                if content_type not in compiled.content_type_set:
+                    continue
+                if not self.passes_source_filters(compiled, context):
+                    continue
+
+                match_result = self._apply_matching_mode(
+                    content if compiled.case_sensitive else lowered,
+                    compiled.needle,
+                    compiled.match_mode,
+                    original_content=content,
+                    original_keyword=compiled.keyword,
+                    pattern=compiled.pattern,
+                )
+                if not match_result:
+                    continue
+                if self.has_excluded_keywords(compiled, content, lowered):
+                    continue
+
+                if compiled.has_language_filters and not language_resolved:
+                    context.language = detect_language(content)
+                    language_resolved = True
+                if not self.passes_language_filters(compiled, context):
+                    continue
+                matches.append((keyword_obj, match_result))
+            except Exception as e:
+                logger.error(f"Error in batch keyword matching: {e}")
+
+        # Stamp after the loop so the result does not depend on keyword order
+        for _, match_result in matches:
+            match_result.detected_language = context.language or ""
+        return matches
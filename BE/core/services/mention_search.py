@@ -0,0 +1,51 @@
+"""Mention search over the search_tokens multikey index."""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+
+from ..models import Mention
+
+# (discovered_at, id) of the last result on the previous page
+SearchCursor = Tuple[datetime, ObjectId]
+
+
+def count_matches(filters: dict, tokens: List[str]) -> int:
+    return Mention.objects(search_tokens__all=tokens, **filters).count()
+
+
+def search_mentions(
+    filters: dict,
+    tokens: List[str],
+    limit: int,
+    after: Optional[SearchCursor] = None,
+    offset: int = 0,
+) -> List[Mention]:
+    """
+    Mentions containing every one of tokens, most recent first, so multi-word
+    queries stay phrase-like. The (user_id, search_tokens, discovered_at, _id)
+    index serves the match and the order. Candidates are projected down to
+    their sort keys before sorting and only the page's ids are loaded in full.
+    Pass the last (discovered_at, id) as after to seek to the next page.
+    """
+    pipeline = [
+        {'$match': {**filters, 'search_tokens': {'$all': tokens}}},
+        {'$project': {'discovered_at': 1}},
+    ]
+    if after is not None:
+        discovered_at, mention_id = after
+        pipeline.append({'$match': {'$or': [
+            {'discovered_at': {'$lt': discovered_at}},
+            {'discovered_at': discovered_at, '_id': {'$lt': mention_id}},
+        ]}})
+    pipeline.append({'$sort': {'discovered_at': -1, '_id': -1}})
+    if offset and after is None:
+        pipeline.append({'$skip': offset})
+    pipeline.append({'$limit': limit})
+
+    page_ids = [doc['_id'] for doc in Mention.objects.aggregate(pipeline)]
+    if not page_ids:
+        return []
+    by_id = {mention.id: mention for mention in Mention.objects(id__in=page_ids)}
+    return [by_id[mention_id] for mention_id in page_ids if mention_id in by_id]
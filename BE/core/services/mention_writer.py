@@ -0,0 +1,251 @@
+"""Write-behind buffer that batches new mentions into insert_many calls."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from django.conf import settings
+from pymongo.errors import BulkWriteError
+
+from ..models import Mention
+from .analytics_service import record_mentions
+from .work_queue import BoundedWorkQueue
+
+logger = logging.getLogger(__name__)
+
+WRITE_INSERTED = "inserted"
+WRITE_DUPLICATE = "duplicate"
+WRITE_FAILED = "failed"
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Called with (mention, status) once the mention's batch has been written
+WriteCallback = Callable[[Mention, str], None]
+
+
+class MentionWriter:
+    """
+    Buffers new mentions and writes them with insert_many(ordered=False).
+
+    A batch is flushed when batch_size mentions are waiting or flush_interval
+    seconds have passed, so a burst of matches costs one round-trip per batch
+    instead of one per mention. Duplicate-key errors from the unique
+    (keyword_id, source_url) index mark that item as a duplicate without
+    failing the rest of the batch.
+
+    Inserted mentions are added to the daily analytics rollups once per batch.
+
+    Each submit() may carry a callback that receives the mention and its
+    write status. Callbacks run on a small worker pool rather than the flush
+    thread, so slow notification delivery never delays the next batch.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_buffer: int = 5000,
+        put_timeout: float = 5.0,
+        callback_workers: int = 4,
+    ):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.max_buffer = max(self.batch_size, int(max_buffer))
+        self.put_timeout = max(0.0, float(put_timeout))
+        self.callback_workers = callback_workers
+        self._buffer: List[Tuple[Mention, Optional[WriteCallback]]] = []
+        self._cond = threading.Condition()
+        # Held for the whole of a flush so flush() and the flusher thread
+        # never write the same buffer twice
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._callbacks: Optional[BoundedWorkQueue] = None
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._cond:
+            if self.is_running:
+                return
+            self._stop.clear()
+            self._callbacks = BoundedWorkQueue(
+                "mention-callbacks",
+                self._run_callback,
+                maxsize=self.max_buffer,
+                workers=self.callback_workers,
+                put_timeout=self.put_timeout,
+            )
+            self._callbacks.start()
+            self._thread = threading.Thread(target=self._flush_loop, name="mention-writer", daemon=True)
+            self._thread.start()
+        logger.info(
+            "mention writer started batch_size=%s flush_interval=%ss max_buffer=%s",
+            self.batch_size, self.flush_interval, self.max_buffer,
+        )
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush what is buffered and stop the background threads."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.flush()
+        if self._callbacks is not None:
+            self._callbacks.drain(timeout=timeout)
+            self._callbacks.stop(timeout=timeout)
+            self._callbacks = None
+        self._stop.clear()
+        logger.info("mention writer stopped %s", self._format_metrics())
+
+    def submit(self, mention: Mention, callback: Optional[WriteCallback] = None, block: bool = True) -> bool:
+        """
+        Buffer mention for the next batch; starts the writer on first use.
+        Returns False if it was dropped because the buffer stayed full, for
+        up to put_timeout, or at once when block is False (event loop callers).
+        """
+        if not self.is_running:
+            self.start()
+        deadline = time.monotonic() + (self.put_timeout if block else 0)
+        with self._cond:
+            while len(self._buffer) >= self.max_buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.dropped += 1
+                    if self.dropped == 1 or self.dropped % 100 == 0:
+                        logger.warning(
+                            "mention writer buffer full, dropping mentions dropped_total=%s", self.dropped,
+                        )
+                    return False
+                self._cond.wait(remaining)
+            self._buffer.append((mention, callback))
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+        return True
+
+    def flush(self) -> int:
+        """Write everything buffered now; returns the number of mentions written or attempted."""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._buffer = self._buffer, []
+                self._cond.notify_all()
+            if batch:
+                self._write_batch(batch)
+            return len(batch)
+
+    def metrics(self) -> dict:
+        with self._cond:
+            buffered = len(self._buffer)
+        return {
+            "buffered": buffered,
+            "batches": self.batches,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    def _format_metrics(self) -> str:
+        return " ".join(f"{key}={value}" for key, value in self.metrics().items())
+
+    def _flush_loop(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: len(self._buffer) >= self.batch_size or self._stop.is_set(),
+                    timeout=self.flush_interval,
+                )
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("mention writer flush failed: %s", e)
+
+    def _write_batch(self, batch: List[Tuple[Mention, Optional[WriteCallback]]]) -> None:
+        statuses: List[str] = [WRITE_FAILED] * len(batch)
+        docs: List[Any] = []
+        positions: List[int] = []
+        for position, (mention, _) in enumerate(batch):
+            try:
+                mention.validate()
+            except Exception as e:
+                logger.error("mention writer rejected invalid mention url=%s: %s", mention.source_url, e)
+                continue
+            docs.append(mention.to_mongo())
+            positions.append(position)
+
+        if docs:
+            errors = {}
+            try:
+                Mention._get_collection().insert_many(docs, ordered=False)
+            except BulkWriteError as e:
+                errors = {error["index"]: error.get("code") for error in e.details.get("writeErrors", [])}
+            except Exception as e:
+                logger.error("mention writer batch insert failed size=%s: %s", len(docs), e)
+                errors = {index: None for index in range(len(docs))}
+
+            for index, (doc, position) in enumerate(zip(docs, positions)):
+                if index not in errors:
+                    # insert_many assigned _id on the document in place
+                    mention = batch[position][0]
+                    mention.id = doc["_id"]
+                    mention._clear_changed_fields()
+                    statuses[position] = WRITE_INSERTED
+                elif errors[index] == DUPLICATE_KEY_ERROR:
+                    statuses[position] = WRITE_DUPLICATE
+
+        inserted = [batch[position][0] for position, status in enumerate(statuses) if status == WRITE_INSERTED]
+        if inserted:
+            try:
+                record_mentions(inserted)
+            except Exception as e:
+                # Analytics can be rebuilt with backfill_mention_rollups
+                logger.error("mention writer rollup update failed size=%s: %s", len(inserted), e)
+
+        self.batches += 1
+        self.inserted += statuses.count(WRITE_INSERTED)
+        self.duplicates += statuses.count(WRITE_DUPLICATE)
+        self.failed += statuses.count(WRITE_FAILED)
+        logger.debug(
+            "mention writer batch size=%s inserted=%s duplicates=%s failed=%s",
+            len(batch), statuses.count(WRITE_INSERTED), statuses.count(WRITE_DUPLICATE),
+            statuses.count(WRITE_FAILED),
+        )
+
+        for (mention, callback), status in zip(batch, statuses):
+            if callback is None:
+                continue
+            item = (callback, mention, status)
+            # Run inline when the pool is not running or stayed full
+            if self._callbacks is None or not self._callbacks.submit(item):
+                self._run_callback(item)
+
+    @staticmethod
+    def _run_callback(item: Tuple[WriteCallback, Mention, str]) -> None:
+        callback, mention, status = item
+        try:
+            callback(mention, status)
+        except Exception as e:
+            logger.error("mention writer callback failed status=%s: %s", status, e)
+
+
+def _build_writer() -> MentionWriter:
+    return MentionWriter(
+        batch_size=getattr(settings, 'MENTION_WRITE_BATCH_SIZE', 100),
+        flush_interval=getattr(settings, 'MENTION_WRITE_FLUSH_SECONDS', 1.0),
+        max_buffer=getattr(settings, 'MENTION_WRITE_MAX_BUFFER', 5000),
+        callback_workers=getattr(settings, 'MENTION_CALLBACK_WORKERS', 4),
+    )
+
+
+# Global instance
+mention_writer = _build_writer()
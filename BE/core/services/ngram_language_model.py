@@ -0,0 +1,134 @@
+"""
+Compact character n-gram language identifier.
+
+A naive Bayes model over 1-3 character grams, built from the langdetect
+profiles by scripts/build_language_ngram_model.py and shipped gzipped next to
+this module. The model is loaded on first use and runs fully in-process.
+"""
+
+import gzip
+import json
+import logging
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = Path(__file__).resolve().parent / "data" / "language_ngrams.json.gz"
+NGRAM_MAX = 3
+# Scores are stored as log-probabilities scaled to integers to keep the file small.
+SCORE_SCALE = 10.0
+# Longer inputs add cost without changing the answer in practice.
+MAX_TEXT_CHARS = 1000
+
+
+def normalize_char(ch: str) -> str:
+    """Fold a character into the alphabet the model was built on."""
+    code = ord(ch)
+    if 0x3040 <= code <= 0x309F:
+        return "あ"  # Hiragana
+    if 0x30A0 <= code <= 0x30FF:
+        return "ア"  # Katakana
+    if 0xAC00 <= code <= 0xD7AF:
+        return "가"  # Hangul syllables
+    if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+        return "一"  # CJK ideographs
+    if ch == "ș":
+        return "ş"  # Romanian s-comma => s-cedilla
+    if ch == "ț":
+        return "ţ"  # Romanian t-comma => t-cedilla
+    if ch == "ی":
+        return "ي"  # Farsi yeh => Arabic yeh
+    if 0x1EA0 <= code <= 0x1EFF:
+        return "ể"  # Vietnamese tone marks
+    if not unicodedata.category(ch).startswith("L"):
+        return " "
+    return ch.lower()
+
+
+def iter_ngrams(text: str) -> Iterator[str]:
+    """Yield the 1..NGRAM_MAX grams of text, treating each word as space padded."""
+    window = " "
+    for raw in text:
+        ch = normalize_char(raw)
+        if ch == " ":
+            if window != " ":
+                window = (window + " ")[-NGRAM_MAX:]
+                yield from _suffixes(window)
+            window = " "
+            continue
+        window = (window + ch)[-NGRAM_MAX:]
+        yield from _suffixes(window)
+    if window != " ":
+        window = (window + " ")[-NGRAM_MAX:]
+        yield from _suffixes(window)
+
+
+def _suffixes(window: str) -> Iterator[str]:
+    # Every gram ending at the newest character; a lone space carries no signal.
+    for n in range(1, len(window) + 1):
+        gram = window[-n:]
+        if gram != " ":
+            yield gram
+
+
+class NgramLanguageModel:
+    """Scores text against every language profile and returns the best code."""
+
+    def __init__(self, path: Path = MODEL_PATH):
+        self.path = path
+        self._languages: List[str] = []
+        self._floors: List[List[int]] = []
+        self._grams: Dict[str, List[Tuple[int, int]]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+                data = json.load(fh)
+            self._languages = data["languages"]
+            self._floors = data["floors"]
+            self._grams = {
+                gram: [(entry[0], entry[1]) for entry in entries]
+                for gram, entries in data["grams"].items()
+            }
+            self._loaded = True
+            logger.info(
+                "ngram language model loaded languages=%s grams=%s",
+                len(self._languages), len(self._grams),
+            )
+
+    @property
+    def languages(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._languages)
+
+    def detect(self, text: str) -> Optional[str]:
+        """Return the most likely language code, or None when text has no letters."""
+        self._ensure_loaded()
+        counts = [0] * NGRAM_MAX
+        boosts = [0] * len(self._languages)
+        grams = self._grams
+        for gram in iter_ngrams(text[:MAX_TEXT_CHARS]):
+            counts[len(gram) - 1] += 1
+            for language_index, boost in grams.get(gram, ()):
+                boosts[language_index] += boost
+        if not any(counts):
+            return None
+
+        best_index, best_score = -1, None
+        for index, floors in enumerate(self._floors):
+            score = boosts[index] + sum(c * f for c, f in zip(counts, floors))
+            if best_score is None or score > best_score:
+                best_index, best_score = index, score
+        return self._languages[best_index]
+
+
+ngram_language_model = NgramLanguageModel()
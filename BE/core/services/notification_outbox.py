@@ -0,0 +1,202 @@
+"""Persistent notification outbox drained by a pool of delivery workers."""
+
+import logging
+import random
+import threading
+from datetime import timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from mongoengine import NotUniqueError
+from mongoengine.queryset.visitor import Q
+
+from ..enums import OutboxStatus
+from ..models import Mention, NotificationOutbox
+from .email_service import email_notification_service
+
+logger = logging.getLogger(__name__)
+
+KIND_MENTION = "mention"
+
+TERMINAL_STATUSES = (OutboxStatus.SENT.value, OutboxStatus.FAILED.value, OutboxStatus.DEFERRED.value)
+
+
+def mention_idempotency_key(mention: Mention) -> str:
+    return f"{KIND_MENTION}:{mention.id}"
+
+
+class NotificationOutboxService:
+    """
+    Monitors enqueue a small outbox document per notification and return
+    immediately; worker threads claim due items and make the Clerk, Mongo
+    and Resend calls off the stream threads.
+
+    The idempotency key (mention:<id>) is unique in the outbox, so a mention
+    is queued at most once, and it is passed to Resend so a retry after an
+    ambiguous failure does not send the email twice. Failed attempts are
+    rescheduled with exponential backoff and jitter until max_attempts, then
+    left in the failed state. Mentions for digest users are marked deferred
+    rather than sent. Claims carry a lease: an item whose worker died
+    mid-send becomes claimable again once the lease expires. Finished items
+    get completed_at, and a TTL index removes them a week later.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        poll_interval: float = 2.0,
+        max_attempts: int = 6,
+        backoff_seconds: float = 30,
+        backoff_max_seconds: float = 3600,
+        lease_seconds: float = 300,
+    ):
+        self.worker_count = max(1, int(workers))
+        self.poll_interval = max(0.05, float(poll_interval))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_seconds = max(0.0, float(backoff_seconds))
+        self.backoff_max_seconds = max(self.backoff_seconds, float(backoff_max_seconds))
+        self.lease = timedelta(seconds=lease_seconds)
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._threads = []
+        for number in range(self.worker_count):
+            thread = threading.Thread(
+                target=self._worker_loop, name=f"notification-outbox-{number}", daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(
+            "notification outbox started workers=%s max_attempts=%s backoff=%ss",
+            self.worker_count, self.max_attempts, self.backoff_seconds,
+        )
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        logger.info("notification outbox stopped")
+
+    def enqueue_mention(self, mention: Mention) -> bool:
+        """Queue an email for mention; returns False if one is already queued."""
+        item = NotificationOutbox(
+            idempotency_key=mention_idempotency_key(mention),
+            kind=KIND_MENTION,
+            mention_id=str(mention.id),
+            user_id=mention.user_id,
+        )
+        try:
+            item.save(force_insert=True)
+        except NotUniqueError:
+            return False
+        self._wakeup.set()
+        return True
+
+    def process_next(self) -> bool:
+        """Claim and deliver one due item; returns False when nothing was due."""
+        item = self._claim()
+        if item is None:
+            return False
+        try:
+            if item.kind == KIND_MENTION and email_notification_service.defers_to_digest(item.user_id):
+                self._finish(item, status=OutboxStatus.DEFERRED.value)
+                return True
+            delivered = self._deliver(item)
+            error = None if delivered else "delivery returned failure"
+        except Exception as e:
+            delivered, error = False, str(e)
+        if delivered:
+            self._finish(item, status=OutboxStatus.SENT.value, sent_at=timezone.now())
+        else:
+            self._schedule_retry(item, error)
+        return True
+
+    def backoff_for(self, attempts: int) -> float:
+        """Delay before the next attempt after `attempts` failures, with +/-20% jitter."""
+        delay = min(self.backoff_max_seconds, self.backoff_seconds * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.process_next():
+                    continue
+            except Exception as e:
+                logger.error("notification outbox worker error: %s", e)
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _claim(self) -> Optional[NotificationOutbox]:
+        now = timezone.now()
+        due = Q(status=OutboxStatus.PENDING.value, next_attempt_at__lte=now) | Q(
+            status=OutboxStatus.SENDING.value, lease_until__lte=now,
+        )
+        return NotificationOutbox.objects(due).order_by('next_attempt_at').modify(
+            new=True,
+            set__status=OutboxStatus.SENDING.value,
+            set__lease_until=now + self.lease,
+            set__updated_at=now,
+            inc__attempts=1,
+        )
+
+    def _deliver(self, item: NotificationOutbox) -> bool:
+        if item.kind != KIND_MENTION:
+            raise ValueError(f"unknown notification kind {item.kind!r}")
+        mention = Mention.objects(id=item.mention_id).first()
+        if mention is None:
+            raise ValueError(f"mention {item.mention_id} not found")
+        return email_notification_service.send_mention_notification(
+            mention, idempotency_key=item.idempotency_key,
+        )
+
+    def _finish(self, item: NotificationOutbox, **fields) -> None:
+        if fields.get('status') in TERMINAL_STATUSES:
+            fields.setdefault('completed_at', timezone.now())
+        updates = {f"set__{name}": value for name, value in fields.items()}
+        # Matching on attempts ignores a stale worker whose lease was taken over
+        NotificationOutbox.objects(id=item.id, attempts=item.attempts).update_one(
+            set__updated_at=timezone.now(), unset__lease_until=True, **updates,
+        )
+
+    def _schedule_retry(self, item: NotificationOutbox, error: Optional[str]) -> None:
+        if item.attempts >= self.max_attempts:
+            logger.error(
+                "notification outbox giving up key=%s attempts=%s error=%s",
+                item.idempotency_key, item.attempts, error,
+            )
+            self._finish(item, status=OutboxStatus.FAILED.value, last_error=error)
+            return
+        delay = self.backoff_for(item.attempts)
+        logger.warning(
+            "notification outbox retry key=%s attempts=%s in=%.0fs error=%s",
+            item.idempotency_key, item.attempts, delay, error,
+        )
+        self._finish(
+            item,
+            status=OutboxStatus.PENDING.value,
+            next_attempt_at=timezone.now() + timedelta(seconds=delay),
+            last_error=error,
+        )
+
+
+# Global instance
+notification_outbox = NotificationOutboxService(
+    workers=getattr(settings, 'NOTIFICATION_WORKERS', 2),
+    poll_interval=getattr(settings, 'NOTIFICATION_POLL_SECONDS', 2.0),
+    max_attempts=getattr(settings, 'NOTIFICATION_MAX_ATTEMPTS', 6),
+    backoff_seconds=getattr(settings, 'NOTIFICATION_BACKOFF_SECONDS', 30),
+    backoff_max_seconds=getattr(settings, 'NOTIFICATION_BACKOFF_MAX_SECONDS', 3600),
+    lease_seconds=getattr(settings, 'NOTIFICATION_LEASE_SECONDS', 300),
+)
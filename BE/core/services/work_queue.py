@@ -0,0 +1,145 @@
+"""Bounded producer/consumer queue for stream monitors."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedWorkQueue:
+    """
+    Decouples stream readers from matching and persistence.
+
+    Producers call submit(), which never blocks longer than put_timeout: when
+    the queue stays full for that long the item is dropped and counted, so a
+    slow database or email provider cannot stall the upstream stream. A pool
+    of worker threads runs handler(item) for everything accepted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], None],
+        maxsize: int = 1000,
+        workers: int = 4,
+        put_timeout: float = 5.0,
+        stats_interval: float = 60.0,
+    ):
+        self.name = name
+        self.handler = handler
+        self.maxsize = max(1, int(maxsize))
+        self.worker_count = max(1, int(workers))
+        self.put_timeout = max(0.0, float(put_timeout))
+        self.stats_interval = stats_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.maxsize)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._last_stats_at = time.monotonic()
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def start(self) -> None:
+        self._stop.clear()
+        for number in range(self.worker_count):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"{self.name}-worker-{number}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(
+            "work queue %s started workers=%s maxsize=%s put_timeout=%ss",
+            self.name, self.worker_count, self.maxsize, self.put_timeout,
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads.clear()
+        abandoned = self._queue.qsize()
+        logger.info("work queue %s stopped abandoned=%s %s", self.name, abandoned, self._format_metrics())
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Wait until every accepted item has been handled; False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def submit(self, item: Any) -> bool:
+        """Enqueue item; returns False if it was dropped because the queue stayed full."""
+        try:
+            self._queue.put(item, timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                dropped = self.dropped
+            # Log the first drop and then every 100th to avoid flooding
+            if dropped == 1 or dropped % 100 == 0:
+                logger.warning(
+                    "work queue %s full, dropping items dropped_total=%s depth=%s",
+                    self.name, dropped, self._queue.qsize(),
+                )
+            return False
+        depth = self._queue.qsize()
+        with self._lock:
+            self.enqueued += 1
+            if depth > self.max_depth:
+                self.max_depth = depth
+        return True
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "max_depth": self.max_depth,
+                "maxsize": self.maxsize,
+                "enqueued": self.enqueued,
+                "processed": self.processed,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "workers": self.worker_count,
+            }
+
+    def _format_metrics(self) -> str:
+        return " ".join(f"{key}={value}" for key, value in self.metrics().items())
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=1)
+            except queue.Empty:
+                self._maybe_log_stats()
+                continue
+            try:
+                self.handler(item)
+                with self._lock:
+                    self.processed += 1
+            except Exception as e:
+                with self._lock:
+                    self.failed += 1
+                logger.error("work queue %s handler failed: %s", self.name, e)
+            finally:
+                self._queue.task_done()
+            self._maybe_log_stats()
+
+    def _maybe_log_stats(self) -> None:
+        if not self.stats_interval:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_stats_at < self.stats_interval:
+                return
+            self._last_stats_at = now
+        logger.info("work queue %s stats %s", self.name, self._format_metrics())
@@ -44,6 +44,8 @@ class MongoTestCase(TestCase):
         Mention.drop_collection()
         from core.models import UserProfile
         UserProfile.drop_collection()
+        from core.services.keyword_cache import keyword_cache
+        keyword_cache.invalidate()
 
     @staticmethod
     def auth_user(clerk_id: str = "test-user-1") -> ClerkUser:
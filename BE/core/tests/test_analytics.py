@@ -0,0 +1,170 @@
+"""Daily mention rollups and the keyword analytics endpoint built on them."""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Mention, MentionDailyRollup
+from core.services import analytics_service
+from core.services.mention_writer import MentionWriter
+from core.views import keyword_analytics, update_keyword
+
+from .base import MongoTestCase, NO_THROTTLE
+
+NOW = datetime(2026, 3, 20, 15, 30, tzinfo=dt_timezone.utc)
+
+
+@NO_THROTTLE
+class MentionRollupTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        MentionDailyRollup.drop_collection()
+        self.keyword = self.create_keyword()
+        self.other = self.create_keyword(keyword="other", platform="hackernews")
+
+    def _mention(self, url, discovered_at, keyword=None):
+        keyword = keyword or self.keyword
+        return Mention(
+            keyword_id=str(keyword.id),
+            user_id=keyword.user_id,
+            content="Kleio is neat",
+            source_url=url,
+            platform=keyword.platform,
+            content_type="comment",
+            discovered_at=discovered_at,
+        )
+
+    def _seed(self):
+        # Spread over 30 days at varying hours, including both rolling-window edge days
+        for n in range(60):
+            keyword = self.keyword if n % 3 else self.other
+            discovered = NOW - timedelta(hours=11 * n + 1)
+            self._mention(f"https://example.com/{n}", discovered, keyword).save()
+
+    def _rollups(self):
+        return {
+            (r.keyword_id, r.platform, r.day): (r.count, r.last_discovered_at)
+            for r in MentionDailyRollup.objects
+        }
+
+    def _analytics(self):
+        request = APIRequestFactory().get("/api/keywords/analytics", {"days": 30})
+        force_authenticate(request, user=self.auth_user())
+        with mock.patch("django.utils.timezone.now", return_value=NOW):
+            response = keyword_analytics(request)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_writer_counts_inserted_mentions_per_day(self):
+        writer = MentionWriter(flush_interval=60)
+        writer.submit(self._mention("https://example.com/a", NOW - timedelta(hours=1)))
+        writer.submit(self._mention("https://example.com/b", NOW - timedelta(hours=2)))
+        writer.submit(self._mention("https://example.com/c", NOW - timedelta(days=1)))
+        writer.flush()
+        # A duplicate in a later batch must not be counted again
+        writer.submit(self._mention("https://example.com/a", NOW - timedelta(hours=1)))
+        writer.stop()
+
+        kid = str(self.keyword.id)
+        rollups = self._rollups()
+        self.assertEqual(rollups[(kid, "reddit", "2026-03-20")][0], 2)
+        self.assertEqual(rollups[(kid, "reddit", "2026-03-20")][1], (NOW - timedelta(hours=1)).replace(tzinfo=None))
+        self.assertEqual(rollups[(kid, "reddit", "2026-03-19")][0], 1)
+        self.assertEqual(len(rollups), 2)
+
+    def test_backfill_matches_incremental_rollups(self):
+        writer = MentionWriter(flush_interval=60, batch_size=7)
+        for n in range(20):
+            writer.submit(self._mention(f"https://example.com/{n}", NOW - timedelta(hours=5 * n)))
+        writer.stop()
+        incremental = self._rollups()
+
+        MentionDailyRollup.objects(day="2026-03-20").update(inc__count=100)
+        call_command("backfill_mention_rollups", stdout=mock.MagicMock())
+
+        self.assertEqual(self._rollups(), incremental)
+
+    def test_backfill_updates_buckets_in_place(self):
+        today = datetime.now(dt_timezone.utc)
+        live = self._mention("https://example.com/live", today)
+        live.save()
+        self._mention("https://example.com/old", NOW).save()
+        kid = str(self.keyword.id)
+        # The writer counted a mention after the snapshot; an empty past bucket is left over
+        MentionDailyRollup(
+            user_id="test-user-1", keyword_id=kid, platform="reddit", day=today.date().isoformat(), count=2,
+        ).save()
+        MentionDailyRollup(user_id="test-user-1", keyword_id=kid, platform="reddit", day="2026-01-01", count=3).save()
+
+        call_command("backfill_mention_rollups", stdout=mock.MagicMock())
+
+        counts = {day: count for (_, _, day), (count, _) in self._rollups().items()}
+        self.assertEqual(counts, {today.date().isoformat(): 2, "2026-03-20": 1})
+
+    def test_deleting_a_keyword_drops_its_rollups(self):
+        writer = MentionWriter(flush_interval=60)
+        writer.submit(self._mention("https://example.com/a", NOW))
+        writer.submit(self._mention("https://example.com/b", NOW, self.other))
+        writer.stop()
+
+        request = APIRequestFactory().delete(f"/api/keywords/{self.keyword.id}")
+        force_authenticate(request, user=self.auth_user())
+        self.assertEqual(update_keyword(request, str(self.keyword.id)).status_code, 204)
+
+        self.assertEqual([r.keyword_id for r in MentionDailyRollup.objects], [str(self.other.id)])
+
+    def test_unrecorded_mentions_leave_the_rollups(self):
+        first = self._mention("https://example.com/a", NOW)
+        second = self._mention("https://example.com/b", NOW - timedelta(hours=1))
+        analytics_service.record_mentions([first, second])
+
+        analytics_service.unrecord_mentions([first])
+        self.assertEqual(MentionDailyRollup.objects.get().count, 1)
+        analytics_service.unrecord_mentions([second])
+        self.assertEqual(MentionDailyRollup.objects.count(), 0)
+
+    def test_default_source_needs_no_backfill(self):
+        with override_settings(ANALYTICS_SOURCE=""):
+            self.assertEqual(analytics_service.get_analytics_source(), analytics_service.SOURCE_AGGREGATE)
+
+    def test_backfill_dry_run_writes_nothing(self):
+        self._seed()
+        call_command("backfill_mention_rollups", "--dry-run", stdout=mock.MagicMock())
+        self.assertEqual(MentionDailyRollup.objects.count(), 0)
+
+    def test_rollup_analytics_match_mention_scan(self):
+        self._seed()
+        call_command("backfill_mention_rollups", stdout=mock.MagicMock())
+
+        with override_settings(ANALYTICS_SOURCE="mentions"):
+            scanned = self._analytics()
+        with override_settings(ANALYTICS_SOURCE="rollups"):
+            with mock.patch.object(
+                analytics_service, "count_mentions_scan", side_effect=AssertionError("scan used"),
+            ):
+                rolled = self._analytics()
+
+        self.assertEqual(rolled, scanned)
+        self.assertEqual(scanned["summary"]["totalMentions"], 60)
+        self.assertGreater(scanned["summary"]["mentionsPrior7Days"], 0)
+
+    def test_aggregate_pipeline_matches_python_loop(self):
+        self._seed()
+        # Excluded from every count: another user's mention and a keyword outside the filter
+        self._mention("https://example.com/foreign", NOW, self.create_keyword(user_id="someone-else")).save()
+        windows = analytics_service.AnalyticsWindows(now=NOW, sparkline_days=14)
+        keyword_ids = {str(self.keyword.id)}
+
+        scanned = analytics_service.count_mentions_scan("test-user-1", keyword_ids, windows)
+        aggregated = analytics_service.count_mentions_aggregate("test-user-1", keyword_ids, windows)
+
+        self.assertEqual(aggregated, scanned)
+        self.assertEqual(scanned.totals[str(self.keyword.id)], 40)
+
+        with override_settings(ANALYTICS_SOURCE="mentions"):
+            scanned_response = self._analytics()
+        with override_settings(ANALYTICS_SOURCE="aggregate"):
+            self.assertEqual(self._analytics(), scanned_response)
@@ -0,0 +1,149 @@
+"""Tests for local Clerk session token verification."""
+
+import threading
+import time
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.test import SimpleTestCase, override_settings
+from jwt.algorithms import RSAAlgorithm
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from core.authentication import (
+    ClerkAuthentication,
+    ClerkTokenVerifier,
+    JWKSCache,
+    VerifiedTokenCache,
+)
+from core.services.clerk_service import clerk_user_service
+
+
+def _signing_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwk(private_key, kid):
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update({"kid": kid, "kty": "RSA", "alg": "RS256", "use": "sig"})
+    return jwk
+
+
+def _token(private_key, kid="key-1", **claims):
+    now = int(time.time())
+    payload = {"sub": "user_1", "azp": "http://localhost:3000", "iat": now, "nbf": now, "exp": now + 60}
+    payload.update(claims)
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@override_settings(
+    CLERK_SECRET_KEY="sk_test",
+    CLERK_JWT_KEY=None,
+    CLERK_AUTHORIZED_PARTIES=["http://localhost:3000"],
+)
+class ClerkTokenVerifierTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.key_1 = _signing_key()
+        cls.key_2 = _signing_key()
+
+    def setUp(self):
+        self.jwks = {"keys": [_jwk(self.key_1, "key-1")]}
+        response = mock.Mock()
+        response.json.side_effect = lambda: self.jwks
+        patcher = mock.patch.object(clerk_user_service.session, "get", return_value=response)
+        self.fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.verifier = ClerkTokenVerifier(JWKSCache(min_refresh_interval=0), VerifiedTokenCache(ttl=60))
+
+    def test_jwks_is_fetched_once_and_claims_are_cached(self):
+        token = _token(self.key_1)
+        with mock.patch("core.authentication.jwt.decode", wraps=jwt.decode) as decode:
+            for _ in range(5):
+                self.assertEqual(self.verifier.verify(token)["sub"], "user_1")
+        self.assertEqual(decode.call_count, 1)
+        self.fetch.assert_called_once()
+
+        self.assertEqual(self.verifier.verify(_token(self.key_1, sub="user_2"))["sub"], "user_2")
+        self.fetch.assert_called_once()
+
+    def test_unknown_kid_refreshes_jwks(self):
+        self.verifier.verify(_token(self.key_1))
+        self.jwks = {"keys": [_jwk(self.key_1, "key-1"), _jwk(self.key_2, "key-2")]}
+
+        self.assertEqual(self.verifier.verify(_token(self.key_2, kid="key-2"))["sub"], "user_1")
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_unknown_kid_refreshes_are_rate_limited(self):
+        verifier = ClerkTokenVerifier(JWKSCache(min_refresh_interval=300), VerifiedTokenCache())
+        verifier.verify(_token(self.key_1))
+        for _ in range(3):
+            with self.assertRaises(AuthenticationFailed):
+                verifier.verify(_token(self.key_2, kid="made-up"))
+        self.fetch.assert_called_once()
+
+    def test_rejects_bad_signature_expired_and_unauthorized_party(self):
+        forged = jwt.encode(
+            {"sub": "user_1", "exp": int(time.time()) + 60}, self.key_2, algorithm="RS256", headers={"kid": "key-1"},
+        )
+        for token in (
+            forged,
+            _token(self.key_1, exp=int(time.time()) - 60),
+            _token(self.key_1, azp="https://evil.example"),
+            "not-a-jwt",
+        ):
+            with self.assertRaises(AuthenticationFailed):
+                self.verifier.verify(token)
+
+    def test_missing_azp_is_accepted(self):
+        token = jwt.encode(
+            {"sub": "user_1", "exp": int(time.time()) + 60}, self.key_1, algorithm="RS256", headers={"kid": "key-1"},
+        )
+        self.assertEqual(self.verifier.verify(token)["sub"], "user_1")
+
+    def test_refresh_fetches_outside_the_lock_and_serves_stale_keys(self):
+        cache = JWKSCache(max_age=3600, min_refresh_interval=0)
+        key_1 = cache.get("key-1")
+        self.assertIsNotNone(key_1)
+
+        fetching, release = threading.Event(), threading.Event()
+        response = self.fetch.return_value
+
+        def slow_fetch(*args, **kwargs):
+            fetching.set()
+            release.wait(5)
+            return response
+
+        self.fetch.side_effect = slow_fetch
+        self.jwks = {"keys": [_jwk(self.key_1, "key-1"), _jwk(self.key_2, "key-2")]}
+        results = {}
+        rotated = threading.Thread(target=lambda: results.setdefault("key-2", cache.get("key-2")))
+        rotated.start()
+        self.assertTrue(fetching.wait(5))
+
+        # The lock is free and known kids are answered while the fetch is in flight
+        self.assertIs(cache.get("key-1"), key_1)
+        waiting = threading.Thread(target=lambda: results.setdefault("waiter", cache.get("key-2")))
+        waiting.start()
+        release.set()
+        rotated.join(5)
+        waiting.join(5)
+
+        self.assertIsNotNone(results["key-2"])
+        self.assertIs(results["waiter"], results["key-2"])
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_cached_claims_expire_with_the_token(self):
+        token = _token(self.key_1, exp=int(time.time()) + 1)
+        self.verifier.verify(token)
+        with mock.patch("core.authentication.time.time", return_value=time.time() + 10):
+            self.assertIsNone(self.verifier.tokens.get(token))
+
+    def test_authentication_class_returns_clerk_user(self):
+        request = APIRequestFactory().get("/api/keywords", HTTP_AUTHORIZATION=f"Bearer {_token(self.key_1)}")
+        with mock.patch("core.authentication.clerk_token_verifier", self.verifier):
+            user, payload = ClerkAuthentication().authenticate(request)
+        self.assertEqual(user.clerk_id, "user_1")
+        self.assertEqual(payload["azp"], "http://localhost:3000")
@@ -2,8 +2,11 @@
 
 from unittest.mock import patch
 
+from core.request_cache import RequestCacheMiddleware
 from core.services import billing_service
-from core.models import UserProfile
+from core.services.keyword_cache import keyword_cache
+from core.models import Keyword, UserProfile
+from core.services.keyword_sync import KeywordChangeFeed
 from core.tests.base import MongoTestCase, NO_THROTTLE
 
 
@@ -328,3 +331,89 @@ class BillingLimitsTests(MongoTestCase):
             billing_service.apply_keyword_selection(
                 "u11", [str(k1.id), str(k2.id), str(k3.id)]
             )
+
+
+class KeywordUsageTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_keyword(user_id="u1", platform="reddit", keyword="a")
+        self.create_keyword(user_id="u1", platform="reddit", keyword="b", is_active=False)
+        self.create_keyword(user_id="u1", platform="all", keyword="c")
+        self.create_keyword(user_id="u1", platform="twitter", keyword="d")
+        self.create_keyword(user_id="u2", platform="youtube", keyword="e")
+
+    def test_usage_counts_all_platform_keywords_everywhere(self):
+        self.assertEqual(
+            billing_service.keyword_usage("u1", active_only=True),
+            {"reddit": 2, "hackernews": 1, "twitter": 2, "youtube": 1},
+        )
+        self.assertEqual(
+            billing_service.keyword_usage("u1", active_only=False),
+            {"reddit": 3, "hackernews": 1, "twitter": 2, "youtube": 1},
+        )
+
+    def test_usage_is_aggregated_once_per_request(self):
+        def handler(request):
+            billing_service.check_can_add_keywords("u1", ["hackernews"])
+            billing_service.keyword_usage("u1", active_only=False)
+
+        middleware = RequestCacheMiddleware(handler)
+        with patch.object(billing_service, "_keyword_counts", wraps=billing_service._keyword_counts) as counts:
+            middleware(None)
+            self.assertEqual(counts.call_count, 1)
+            # A fresh request aggregates again
+            middleware(None)
+            self.assertEqual(counts.call_count, 2)
+
+    def test_keyword_changes_drop_memoized_usage(self):
+        def handler(request):
+            before = billing_service.keyword_usage("u1")["youtube"]
+            self.create_keyword(user_id="u1", platform="youtube", keyword="f")
+            keyword_cache.invalidate("u1")
+            return before, billing_service.keyword_usage("u1")["youtube"]
+
+        self.assertEqual(RequestCacheMiddleware(handler)(None), (1, 2))
+
+
+class BulkKeywordDeactivationTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        profile = billing_service.get_or_create_profile("u30")
+        profile.plan = "business"
+        profile.subscription_status = "active"
+        profile.save()
+        self.reddit = [
+            self.create_keyword(user_id="u30", platform="reddit", keyword=f"r{n}") for n in range(30)
+        ]
+        self.hn = self.create_keyword(user_id="u30", platform="hackernews", keyword="hn")
+        self.everywhere = self.create_keyword(user_id="u30", platform="all", keyword="all")
+
+    def _downgrade_to_free(self):
+        UserProfile.objects(user_id="u30").update_one(set__plan="free", set__subscription_status="cancelled")
+
+    def test_downgrade_pauses_with_bulk_updates_seen_as_one_delta(self):
+        feed = KeywordChangeFeed(use_change_stream=False, overlap_seconds=0)
+        feed.load()
+        self._downgrade_to_free()
+
+        with patch.object(Keyword, "save", side_effect=AssertionError("per-keyword save")):
+            billing_service.enforce_downgrade_keyword_limits("u30")
+
+        self.assertEqual(Keyword.objects(user_id="u30", is_active=True).count(), 1)
+        self.assertTrue(Keyword.objects.get(id=self.hn.id).is_active)
+        self.assertTrue(UserProfile.objects.get(user_id="u30").needs_keyword_selection)
+
+        changed, removed = feed.poll()
+        self.assertEqual(changed, [])
+        self.assertEqual(set(removed), {str(k.id) for k in self.reddit + [self.everywhere]})
+
+    def test_selection_applies_with_bulk_updates(self):
+        self._downgrade_to_free()
+        billing_service.enforce_downgrade_keyword_limits("u30")
+        keep = [str(self.reddit[0].id), str(self.reddit[1].id)]
+
+        with patch.object(Keyword, "save", side_effect=AssertionError("per-keyword save")):
+            billing_service.apply_keyword_selection("u30", keep)
+
+        active = {str(k.id) for k in Keyword.objects(user_id="u30", is_active=True)}
+        self.assertEqual(active, set(keep) | {str(self.hn.id)})
@@ -0,0 +1,139 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from core import views
+from core.models import UserProfile
+from core.services.clerk_service import ClerkUserService, UserEmailCache
+from core.tests.base import MongoTestCase, NO_THROTTLE
+
+WEBHOOK_SECRET = "whsec_" + base64.b64encode(b"clerk-test-secret").decode()
+
+
+def _user(user_id, email):
+    return {
+        "id": user_id,
+        "primary_email_address_id": "e1",
+        "email_addresses": [{"id": "e1", "email_address": email}],
+    }
+
+
+def _response(status_code, payload=None):
+    response = MagicMock(status_code=status_code, text="")
+    response.json.return_value = payload
+    return response
+
+
+class ClerkEmailCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.service = ClerkUserService()
+        self.service.secret_key = "sk_test"
+        self.service.session = MagicMock()
+
+    def test_repeat_lookups_hit_the_cache(self):
+        self.service.session.get.return_value = _response(200, _user("u1", "a@example.com"))
+
+        for _ in range(3):
+            self.assertEqual(self.service.get_user_email("u1"), "a@example.com")
+
+        self.service.session.get.assert_called_once()
+        self.assertEqual(self.service.email_cache.info()["hits"], 2)
+
+    def test_404_is_negatively_cached_but_errors_are_not(self):
+        self.service.session.get.return_value = _response(404)
+        self.assertIsNone(self.service.get_user_email("gone"))
+        self.assertIsNone(self.service.get_user_email("gone"))
+        self.assertEqual(self.service.session.get.call_count, 1)
+
+        self.service.session.get.return_value = _response(429)
+        self.service.get_user_email("limited")
+        self.service.get_user_email("limited")
+        self.assertEqual(self.service.session.get.call_count, 3)
+
+    def test_fresh_after_and_invalidate_force_refetch(self):
+        self.service.session.get.return_value = _response(200, _user("u1", "a@example.com"))
+        self.service.get_user_email("u1")
+
+        self.service.get_user_email("u1", fresh_after=timezone.now() + timedelta(seconds=1))
+        self.service.invalidate_user_email("u1")
+        self.service.get_user_email("u1")
+
+        self.assertEqual(self.service.session.get.call_count, 3)
+
+    def test_entries_expire(self):
+        cache = UserEmailCache(ttl=60, negative_ttl=1)
+        with patch("core.services.clerk_service.time.monotonic", return_value=100):
+            cache.put("u1", "a@example.com")
+            cache.put("u2", None)
+        with patch("core.services.clerk_service.time.monotonic", return_value=130):
+            self.assertEqual(cache.get("u1"), (True, "a@example.com"))
+            self.assertEqual(cache.get("u2"), (False, None))
+
+    @patch.dict(os.environ, {"TZ": "America/New_York"})
+    def test_naive_fresh_after_is_read_as_utc(self):
+        self.addCleanup(time.tzset)
+        time.tzset()
+        cache = UserEmailCache(ttl=60)
+        cache.put("u1", "a@example.com")
+        # Mongo hands back naive UTC; a local-time reading would be hours off
+        changed_at = datetime.now(dt_timezone.utc).replace(tzinfo=None) - timedelta(minutes=1)
+        self.assertEqual(cache.get("u1", fresh_after=changed_at), (True, "a@example.com"))
+        self.assertEqual(cache.get("u1", fresh_after=changed_at + timedelta(minutes=2)), (False, None))
+
+    def test_prefetch_uses_list_endpoint_and_cache(self):
+        self.service.email_cache.put("cached", "c@example.com")
+        self.service.session.get.return_value = _response(200, [_user("u1", "a@example.com")])
+
+        emails = self.service.prefetch_user_emails(["cached", "u1", "u2", "u1"])
+
+        self.assertEqual(emails, {"cached": "c@example.com", "u1": "a@example.com", "u2": None})
+        params = self.service.session.get.call_args.kwargs["params"]
+        self.assertEqual([value for key, value in params if key == "user_id"], ["u1", "u2"])
+        # Both results are now cached, including the negative one
+        self.assertEqual(self.service.get_user_email("u2"), None)
+        self.service.session.get.assert_called_once()
+
+
+@NO_THROTTLE
+@override_settings(CLERK_WEBHOOK_SECRET=WEBHOOK_SECRET)
+class ClerkWebhookTests(MongoTestCase):
+    def _post(self, event, secret=WEBHOOK_SECRET):
+        body = json.dumps(event)
+        msg_id, timestamp = "msg_1", str(int(time.time()))
+        key = base64.b64decode(secret.split("_", 1)[1])
+        signature = base64.b64encode(
+            hmac.new(key, f"{msg_id}.{timestamp}.{body}".encode(), hashlib.sha256).digest()
+        ).decode()
+        request = APIRequestFactory().post(
+            "/api/webhooks/clerk",
+            data=body,
+            content_type="application/json",
+            HTTP_SVIX_ID=msg_id,
+            HTTP_SVIX_TIMESTAMP=timestamp,
+            HTTP_SVIX_SIGNATURE=f"v1,{signature}",
+        )
+        return views.clerk_webhook(request)
+
+    def test_user_updated_refreshes_email(self):
+        UserProfile(user_id="u1").save()
+        views.clerk_user_service.email_cache.put("u1", "old@example.com")
+
+        response = self._post({"type": "user.updated", "data": _user("u1", "new@example.com")})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(views.clerk_user_service.email_cache.get("u1"), (True, "new@example.com"))
+        self.assertIsNotNone(UserProfile.objects.get(user_id="u1").email_changed_at)
+
+    def test_rejects_bad_signature(self):
+        wrong = "whsec_" + base64.b64encode(b"other").decode()
+        response = self._post({"type": "user.updated", "data": _user("u1", "x@example.com")}, secret=wrong)
+        self.assertEqual(response.status_code, 400)
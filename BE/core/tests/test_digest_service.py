@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core import views
+from core.models import Mention, UserProfile
+from core.services.digest_service import DigestScheduler, window_end
+from core.services.email_service import EmailNotificationService
+from core.services.mention_writer import MentionWriter
+from core.tests.base import MongoTestCase, NO_THROTTLE
+
+UTC = dt_timezone.utc
+SEND_DIGEST = "core.services.digest_service.email_notification_service.send_digest_notification"
+PREFETCH = "core.services.digest_service.clerk_user_service.prefetch_user_emails"
+
+
+class WindowEndTests(SimpleTestCase):
+    def test_hourly_and_daily_boundaries(self):
+        now = datetime(2026, 3, 4, 7, 42, tzinfo=UTC)
+        self.assertEqual(window_end("hourly", now), datetime(2026, 3, 4, 7, tzinfo=UTC))
+        self.assertEqual(window_end("daily", now, daily_hour=8), datetime(2026, 3, 3, 8, tzinfo=UTC))
+        self.assertEqual(window_end("daily", now, daily_hour=6), datetime(2026, 3, 4, 6, tzinfo=UTC))
+
+
+class DigestSchedulerTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = datetime(2026, 3, 4, 9, 5, tzinfo=UTC)
+        self.scheduler = DigestScheduler(max_mentions=2)
+        UserProfile(user_id="hourly-user", notification_frequency="hourly").save()
+        UserProfile(user_id="instant-user", notification_frequency="instant").save()
+        self.keyword = self.create_keyword(user_id="hourly-user")
+        self.muted = self.create_keyword(user_id="hourly-user", keyword="muted", email_notifications=False)
+        self.instant_keyword = self.create_keyword(user_id="instant-user")
+
+    def _mention(self, keyword, n, minutes_ago):
+        mention = Mention(
+            keyword_id=str(keyword.id),
+            user_id=keyword.user_id,
+            content="Kleio is neat",
+            source_url=f"https://example.com/{keyword.keyword}/{n}",
+            platform="reddit",
+            content_type="comment",
+            discovered_at=self.now - timedelta(minutes=minutes_ago),
+        )
+        mention.save()
+        return mention
+
+    def test_sends_one_digest_per_user_and_marks_window_sent(self):
+        in_window = [self._mention(self.keyword, n, 10 + n) for n in range(3)]
+        after_window = self._mention(self.keyword, 9, 1)
+        muted = self._mention(self.muted, 1, 20)
+        instant = self._mention(self.instant_keyword, 1, 20)
+
+        with patch(PREFETCH, return_value={"hourly-user": "h@example.com"}), \
+                patch(SEND_DIGEST, return_value=True) as send:
+            self.scheduler.run_due(self.now)
+            self.scheduler.run_due(self.now + timedelta(minutes=10))  # same window: no second run
+
+        send.assert_called_once()
+        args, kwargs = send.call_args
+        self.assertEqual(args[:2], ("hourly-user", "h@example.com"))
+        # Latest max_mentions listed, full count reported
+        self.assertEqual([m.id for m in args[2]], [in_window[0].id, in_window[1].id])
+        self.assertEqual(kwargs["total_count"], 3)
+        self.assertFalse(kwargs["mark_sent"])
+
+        sent = set(Mention.objects(email_sent=True).scalar("id"))
+        self.assertEqual(sent, {m.id for m in in_window})
+        self.assertNotIn(after_window.id, sent)
+        self.assertNotIn(muted.id, sent)
+        self.assertNotIn(instant.id, sent)
+
+    def test_failed_send_leaves_mentions_for_next_window(self):
+        self._mention(self.keyword, 1, 10)
+
+        with patch(PREFETCH, return_value={}), patch(SEND_DIGEST, return_value=False):
+            stats = self.scheduler.send_window("hourly", window_end("hourly", self.now))
+
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(Mention.objects(email_sent=False).count(), 1)
+
+    def test_first_window_does_not_reach_into_history(self):
+        old = self._mention(self.keyword, 1, 180)
+        recent = self._mention(self.keyword, 2, 30)
+
+        with patch(PREFETCH, return_value={}), patch(SEND_DIGEST, return_value=True) as send:
+            self.scheduler.send_window("hourly", window_end("hourly", self.now))
+
+        self.assertEqual([m.id for m in send.call_args.args[2]], [recent.id])
+        self.assertFalse(Mention.objects.get(id=old.id).email_sent)
+        self.assertEqual(
+            UserProfile.objects.get(user_id="hourly-user").last_digest_at.replace(tzinfo=UTC),
+            window_end("hourly", self.now),
+        )
+
+    def test_failed_first_window_is_retried_next_window(self):
+        missed = self._mention(self.keyword, 1, 30)
+        end = window_end("hourly", self.now)
+        with patch(PREFETCH, return_value={}), patch(SEND_DIGEST, return_value=False):
+            self.scheduler.send_window("hourly", end)
+
+        with patch(PREFETCH, return_value={}), patch(SEND_DIGEST, return_value=True) as send:
+            self.scheduler.send_window("hourly", end + timedelta(hours=1))
+
+        self.assertEqual([m.id for m in send.call_args.args[2]], [missed.id])
+
+    def test_buffered_mentions_are_flushed_into_the_window(self):
+        writer = MentionWriter(flush_interval=60)
+        mention = Mention(
+            keyword_id=str(self.keyword.id),
+            user_id="hourly-user",
+            content="Kleio is neat",
+            source_url="https://example.com/buffered",
+            platform="reddit",
+            content_type="comment",
+            discovered_at=self.now - timedelta(minutes=10),
+        )
+        with patch.object(writer, "start"):
+            writer.submit(mention)
+
+        with patch("core.services.digest_service.mention_writer", writer), \
+                patch(PREFETCH, return_value={}), patch(SEND_DIGEST, return_value=True) as send:
+            self.scheduler.send_window("hourly", window_end("hourly", self.now))
+
+        self.assertEqual(send.call_args.kwargs["total_count"], 1)
+
+    def test_instant_notification_is_deferred_for_digest_users(self):
+        mention = self._mention(self.keyword, 1, 10)
+        service = EmailNotificationService()
+        service.api_key = "re_test"
+
+        with patch("core.services.email_service.resend.Emails.send") as resend_send:
+            self.assertTrue(service.send_mention_notification(mention, user_email="h@example.com"))
+
+        resend_send.assert_not_called()
+        self.assertFalse(Mention.objects.get(id=mention.id).email_sent)
+
+
+@NO_THROTTLE
+class NotificationFrequencySettingTests(MongoTestCase):
+    def _patch(self, data):
+        request = APIRequestFactory().patch("/api/user/notification-settings", data, format="json")
+        force_authenticate(request, user=self.auth_user())
+        return views.user_notification_settings(request)
+
+    def test_updates_frequency(self):
+        response = self._patch({"notificationFrequency": "daily"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["notificationFrequency"], "daily")
+        self.assertEqual(UserProfile.objects.get(user_id="test-user-1").notification_frequency, "daily")
+
+    def test_rejects_unknown_frequency(self):
+        self.assertEqual(self._patch({"notificationFrequency": "weekly"}).status_code, 400)
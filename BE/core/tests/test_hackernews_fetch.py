@@ -0,0 +1,100 @@
+import asyncio
+import random
+
+from django.test import SimpleTestCase
+
+from core.models import MonitorCursor
+from core.tests.base import MongoTestCase
+from platforms.hackernews.services.hackernews_service import HackerNewsService
+
+
+class HackerNewsConcurrentFetchTests(SimpleTestCase):
+    def _service(self, concurrency):
+        service = HackerNewsService()
+        service.fetch_concurrency = concurrency
+        service.is_streaming = True
+        service.in_flight = 0
+        service.peak_in_flight = 0
+        service.processed = []
+
+        async def fetch_item(item_id):
+            service.in_flight += 1
+            service.peak_in_flight = max(service.peak_in_flight, service.in_flight)
+            await asyncio.sleep(random.uniform(0, 0.005))
+            service.in_flight -= 1
+            return None if item_id % 7 == 0 else {"id": item_id}
+
+        async def process_item(item, automaton):
+            service.processed.append(item["id"])
+
+        service._fetch_item = fetch_item
+        service._process_item = process_item
+        return service
+
+    def test_items_are_processed_in_id_order(self):
+        service = self._service(concurrency=5)
+
+        asyncio.run(service._fetch_and_process_range(100, 160, automaton=None))
+
+        expected = [item_id for item_id in range(100, 161) if item_id % 7]
+        self.assertEqual(service.processed, expected)
+        self.assertLessEqual(service.peak_in_flight, 5)
+        self.assertGreater(service.peak_in_flight, 1)
+
+    def test_stops_when_streaming_is_turned_off(self):
+        service = self._service(concurrency=3)
+        original = service._process_item
+
+        async def process_and_stop(item, automaton):
+            await original(item, automaton)
+            service.is_streaming = False
+
+        service._process_item = process_and_stop
+
+        asyncio.run(service._fetch_and_process_range(1, 50, automaton=None))
+
+        self.assertEqual(service.processed, [1])
+
+
+class HackerNewsCursorTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        MonitorCursor.drop_collection()
+        self.service = HackerNewsService()
+        self.service.max_backlog = 100
+
+    def test_cursor_round_trip(self):
+        self.assertIsNone(self.service._load_cursor())
+        self.service._save_cursor(41000)
+        self.service._save_cursor(41050)
+
+        self.assertEqual(self.service._load_cursor(), 41050)
+        self.assertEqual(MonitorCursor.objects(platform="hackernews").count(), 1)
+
+    def test_catch_up_range_is_capped_by_backlog(self):
+        self.assertEqual(self.service._catch_up_range(1000, 1050), (1001, 1050))
+        self.assertEqual(self.service._catch_up_range(1000, 5000), (4901, 5000))
+        self.assertIsNone(self.service._catch_up_range(None, 5000))
+        self.assertIsNone(self.service._catch_up_range(5000, 5000))
+
+    def test_catch_up_processes_backlog_and_advances_cursor(self):
+        self.service._save_cursor(200)
+        self.service.current_max_item = 210
+        self.service.is_streaming = True
+        self.service.monitoring_start_time = 10 ** 12
+        processed = []
+
+        async def fetch_item(item_id):
+            return {"id": item_id}
+
+        async def process_item(item, automaton):
+            processed.append(item["id"])
+
+        self.service._fetch_item = fetch_item
+        self.service._process_item = process_item
+
+        asyncio.run(self.service._catch_up(automaton=None))
+
+        self.assertEqual(processed, list(range(201, 211)))
+        self.assertEqual(self.service._load_cursor(), 210)
+        self.assertEqual(self.service.monitoring_start_time, 0)
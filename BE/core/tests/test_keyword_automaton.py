@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from core.services.keyword_automaton import KeywordAutomaton
+
+
+def _kw(text, **extra):
+    return SimpleNamespace(keyword=text, **extra)
+
+
+class KeywordAutomatonTests(SimpleTestCase):
+    def test_finds_every_keyword_with_first_position(self):
+        python, django, go = _kw("python"), _kw("Django"), _kw("golang")
+        automaton = KeywordAutomaton([python, django, go])
+
+        hits = automaton.scan("Django is written in Python; so is more python.")
+
+        self.assertEqual(hits, [(django, 0), (python, 21)])
+
+    def test_overlapping_and_nested_patterns(self):
+        he, she, hers = _kw("he"), _kw("she"), _kw("hers")
+        automaton = KeywordAutomaton([he, she, hers])
+
+        hits = dict((k.keyword, pos) for k, pos in automaton.scan("ushers"))
+
+        self.assertEqual(hits, {"she": 1, "he": 2, "hers": 2})
+
+    def test_duplicate_texts_return_each_keyword(self):
+        first, second = _kw("kleio", user_id="a"), _kw("KLEIO", user_id="b")
+        automaton = KeywordAutomaton([first, second])
+
+        self.assertEqual(automaton.candidates("try kleio"), [first, second])
+
+    def test_no_match_and_empty_inputs(self):
+        automaton = KeywordAutomaton([_kw("kleio"), _kw("")])
+        self.assertEqual(automaton.scan("nothing to see"), [])
+        self.assertEqual(automaton.scan(""), [])
+        self.assertEqual(KeywordAutomaton([]).scan("kleio"), [])
+
+    def test_pre_lowered_content(self):
+        kw = _kw("Kleio")
+        automaton = KeywordAutomaton([kw])
+        self.assertEqual(automaton.scan("about kleio", lowered=True), [(kw, 6)])
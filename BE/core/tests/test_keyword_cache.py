@@ -0,0 +1,89 @@
+"""Tests for the per-user keyword cache and its invalidation from the API."""
+
+from unittest import mock
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Keyword, Mention
+from core.services import billing_service
+from core.services.keyword_cache import UserKeywordCache, keyword_cache
+from core.views import list_mentions, toggle_keyword, update_keyword
+
+from .base import MongoTestCase, NO_THROTTLE
+
+
+@NO_THROTTLE
+class UserKeywordCacheTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = APIRequestFactory()
+        self.keyword = self.create_keyword()
+
+    def _authed(self, request):
+        force_authenticate(request, user=self.auth_user())
+        return request
+
+    def test_reads_are_served_from_one_load(self):
+        cache = UserKeywordCache(ttl=60)
+        self.create_keyword(keyword="other")
+
+        self.assertEqual(len(cache.keywords("test-user-1")), 2)
+        self.assertEqual(cache.labels("test-user-1")[str(self.keyword.id)], "kleio")
+        self.assertEqual(cache.info()["misses"], 1)
+        self.assertEqual(cache.info()["hits"], 1)
+
+    def test_returned_documents_do_not_share_state(self):
+        cache = UserKeywordCache(ttl=60)
+        cache.keywords("test-user-1")[0].excluded_keywords.append("spam")
+        self.assertEqual(cache.keywords("test-user-1")[0].excluded_keywords, [])
+
+    def test_load_racing_an_invalidation_is_not_stored(self):
+        cache = UserKeywordCache(ttl=60)
+        queryset = Keyword.objects
+
+        def invalidate_then_query(*args, **kwargs):
+            cache.invalidate("test-user-1")
+            return queryset(*args, **kwargs)
+
+        with mock.patch.object(Keyword, "objects", side_effect=invalidate_then_query):
+            cache.labels("test-user-1")
+        self.assertEqual(cache.info()["size"], 0)
+        cache.labels("test-user-1")
+        self.assertEqual(cache.info()["size"], 1)
+
+    def test_keyword_writes_invalidate_mention_labels(self):
+        Mention(
+            keyword_id=str(self.keyword.id),
+            user_id="test-user-1",
+            content="kleio",
+            source_url="https://example.com/1",
+            platform="reddit",
+            content_type="comment",
+        ).save()
+
+        def mention_label():
+            response = list_mentions(self._authed(self.factory.get("/api/mentions")))
+            return response.data["mentions"][0]["keyword"]
+
+        self.assertEqual(mention_label(), "kleio")
+        update_keyword(
+            self._authed(self.factory.put(f"/api/keywords/{self.keyword.id}", {"keyword": "renamed"}, format="json")),
+            str(self.keyword.id),
+        )
+        self.assertEqual(mention_label(), "renamed")
+
+        toggle_keyword(self._authed(self.factory.patch(f"/api/keywords/{self.keyword.id}/toggle")), str(self.keyword.id))
+        self.assertFalse(keyword_cache.keywords("test-user-1")[0].is_active)
+
+        update_keyword(self._authed(self.factory.delete(f"/api/keywords/{self.keyword.id}")), str(self.keyword.id))
+        self.assertEqual(mention_label(), "")
+
+    def test_billing_selection_reads_fresh_keyword_states(self):
+        keyword_cache.keywords("test-user-1")
+        # Another worker paused the keyword; this process's cache never heard
+        Keyword.objects(id=self.keyword.id).update(set__is_active=False)
+
+        payload = billing_service.keyword_selection_payload("test-user-1")
+        enabled = {k["id"]: k["enabled"] for p in payload["platforms"] for k in p["keywords"]}
+        self.assertEqual(enabled, {str(self.keyword.id): False})
+        self.assertTrue(keyword_cache.keywords("test-user-1")[0].is_active)
@@ -0,0 +1,221 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.enums import Platform
+from core.models import Keyword
+from core.services.auto_monitor_service import AutoMonitorService
+from core.services.keyword_sync import KeywordChangeFeed, KeywordDelta, KeywordSnapshot
+from core.tests.base import MongoTestCase
+from platforms.reddit.services.realtime_monitor import (
+    STREAM_MODE_MULTIREDDIT,
+    STREAM_MODE_PER_SUBREDDIT,
+    RealtimeStreamMonitor,
+    SubredditKeywordIndex,
+)
+
+UPDATED = datetime(2026, 1, 1)
+
+
+def _kw(kid, text="kleio", subreddits=None, platform=Platform.REDDIT.value, updated_at=UPDATED):
+    return SimpleNamespace(
+        id=kid,
+        keyword=text,
+        platform=platform,
+        platform_specific_filters=subreddits or [],
+        content_types=["titles", "body", "comments"],
+        case_sensitive=False,
+        match_mode="contains",
+        updated_at=updated_at,
+    )
+
+
+class KeywordSnapshotTests(SimpleTestCase):
+    def test_diff_reports_added_updated_and_removed(self):
+        snapshot = KeywordSnapshot()
+        first, second = _kw("1"), _kw("2")
+        snapshot.commit(snapshot.diff([first, second]))
+
+        edited = _kw("2", text="acme", updated_at=UPDATED + timedelta(seconds=1))
+        third = _kw("3")
+        delta = snapshot.diff([edited, third])
+
+        self.assertEqual(delta.added, [third])
+        self.assertEqual(delta.updated, [edited])
+        self.assertEqual(delta.removed_ids, ["1"])
+        snapshot.commit(delta)
+        self.assertFalse(snapshot.diff([edited, third]))
+
+    def test_apply_returns_new_map(self):
+        current = {"1": _kw("1"), "2": _kw("2")}
+        replacement = _kw("2", text="acme")
+        delta = KeywordDelta(added=[_kw("3")], updated=[replacement], removed_ids=["1"])
+
+        result = delta.apply(current)
+
+        self.assertEqual(sorted(result), ["2", "3"])
+        self.assertIs(result["2"], replacement)
+        self.assertEqual(sorted(current), ["1", "2"])
+
+
+class RedditHotReloadTests(SimpleTestCase):
+    def _monitor(self, mode):
+        monitor = RealtimeStreamMonitor()
+        monitor.stream_mode = mode
+        monitor.multireddit_size = 2
+        monitor.started = []
+        monitor._start_stream_threads = lambda name, stop_event: monitor.started.append(name)
+        with monitor._reload_lock:
+            monitor.keywords = {"1": _kw("1", subreddits=["python"]), "2": _kw("2", subreddits=["rust"])}
+            monitor._sync_streams()
+        monitor.started.clear()
+        return monitor
+
+    def test_only_affected_subreddit_streams_change(self):
+        monitor = self._monitor(STREAM_MODE_PER_SUBREDDIT)
+        rust_stop = monitor._stream_stops["rust"]
+        python_stop = monitor._stream_stops["python"]
+
+        monitor.apply_keyword_delta(
+            KeywordDelta(added=[_kw("3", subreddits=["golang"])], removed_ids=["2"])
+        )
+
+        self.assertEqual(monitor.started, ["golang"])
+        self.assertTrue(rust_stop.is_set())
+        self.assertFalse(python_stop.is_set())
+        self.assertEqual(sorted(monitor._stream_stops), ["golang", "python"])
+        self.assertEqual(monitor.index.automaton_for("golang", "golang").keywords[0].id, "3")
+
+    def test_update_swaps_index_without_restarting_streams(self):
+        monitor = self._monitor(STREAM_MODE_PER_SUBREDDIT)
+        old_index = monitor.index
+
+        monitor.apply_keyword_delta(KeywordDelta(updated=[_kw("1", text="acme", subreddits=["python"])]))
+
+        self.assertEqual(monitor.started, [])
+        self.assertIsNot(monitor.index, old_index)
+        self.assertEqual(monitor.index.automaton_for("python", "python").keywords[0].keyword, "acme")
+
+    def test_multireddit_groups_are_kept_across_reloads(self):
+        previous = SubredditKeywordIndex(
+            [_kw("1", subreddits=["a"]), _kw("2", subreddits=["b"]), _kw("3", subreddits=["c"])],
+            STREAM_MODE_MULTIREDDIT,
+            multireddit_size=2,
+        )
+        self.assertEqual(previous.streams, ["a+b", "c"])
+
+        current = SubredditKeywordIndex(
+            [_kw("1", subreddits=["a"]), _kw("2", subreddits=["b"]), _kw("3", subreddits=["c"]),
+             _kw("4", subreddits=["aa"]), _kw("5", subreddits=["z"])],
+            STREAM_MODE_MULTIREDDIT,
+            multireddit_size=2,
+            previous_streams=previous.streams,
+        )
+        self.assertEqual(current.streams, ["a+b", "c+aa", "z"])
+
+
+class AutoMonitorSyncTests(SimpleTestCase):
+    def test_running_service_gets_delta_instead_of_restart(self):
+        auto_monitor = AutoMonitorService()
+        service = mock.Mock(is_streaming=False, is_monitoring=True)
+        keywords = [_kw("1", platform=Platform.TWITTER.value)]
+        snapshot = auto_monitor.platform_snapshots[Platform.TWITTER.value]
+        snapshot.commit(snapshot.diff(keywords))
+
+        added = _kw("2", platform=Platform.TWITTER.value)
+        delta = snapshot.diff(keywords + [added])
+        auto_monitor._sync_platform(Platform.TWITTER.value, service, keywords + [added], delta)
+
+        service.apply_keyword_delta.assert_called_once_with(delta)
+        service.start_stream_monitoring.assert_not_called()
+        service.stop_stream_monitoring.assert_not_called()
+        self.assertEqual(len(snapshot), 2)
+
+    def test_service_starts_and_stops_with_its_keywords(self):
+        auto_monitor = AutoMonitorService()
+        service = mock.Mock(is_streaming=False, is_monitoring=False)
+        snapshot = auto_monitor.platform_snapshots[Platform.YOUTUBE.value]
+        keywords = [_kw("1", platform=Platform.YOUTUBE.value)]
+
+        auto_monitor._sync_platform(Platform.YOUTUBE.value, service, keywords, snapshot.diff(keywords))
+        service.start_stream_monitoring.assert_called_once_with(keywords)
+
+        service.is_monitoring = True
+        auto_monitor._sync_platform(Platform.YOUTUBE.value, service, [], snapshot.diff([]))
+        service.stop_stream_monitoring.assert_called_once_with()
+        self.assertEqual(len(snapshot), 0)
+
+
+class KeywordChangeFeedTests(MongoTestCase):
+    def _feed(self, **kwargs):
+        kwargs.setdefault("delete_scan_interval", 3600)
+        return KeywordChangeFeed(use_change_stream=True, overlap_seconds=30, **kwargs)
+
+    def _touch(self, keyword, **changes):
+        time.sleep(0.002)  # Mongo stores milliseconds
+        for name, value in changes.items():
+            setattr(keyword, name, value)
+        keyword.save()
+        return keyword
+
+    def test_reports_only_changed_keywords(self):
+        first = self.create_keyword(keyword="kleio")
+        second = self.create_keyword(keyword="acme")
+        feed = self._feed()
+
+        self.assertEqual({str(kw.id) for kw in feed.load()}, {str(first.id), str(second.id)})
+        self.assertEqual(feed.mode, "polling")  # mongomock has no change streams
+        self.assertEqual(feed.poll(), ([], []))
+
+        added = self.create_keyword(keyword="new")
+        self._touch(first, excluded_users=["spammer"])
+        changed, removed = feed.poll()
+        self.assertEqual(sorted(str(kw.id) for kw in changed), sorted([str(first.id), str(added.id)]))
+        self.assertEqual(removed, [])
+        self.assertEqual(changed[[str(kw.id) for kw in changed].index(str(first.id))].excluded_users, ["spammer"])
+
+        # The overlap window re-reads those rows but does not report them again
+        self.assertEqual(feed.poll(), ([], []))
+
+    def test_deactivated_and_deleted_keywords_are_removed(self):
+        first = self.create_keyword(keyword="kleio")
+        second = self.create_keyword(keyword="acme")
+        feed = self._feed(delete_scan_interval=0)
+        feed.load()
+
+        self._touch(first, is_active=False)
+        second.delete()
+        changed, removed = feed.poll()
+
+        self.assertEqual(changed, [])
+        self.assertEqual(sorted(removed), sorted([str(first.id), str(second.id)]))
+
+    def test_legacy_keywords_without_updated_at_seed_the_mark(self):
+        legacy = self.create_keyword(keyword="kleio")
+        Keyword.objects(id=legacy.id).update(unset__updated_at=True)
+        feed = self._feed()
+
+        self.assertEqual([str(kw.id) for kw in feed.load()], [str(legacy.id)])
+        self.assertIsNotNone(feed.high_water_mark)
+        with mock.patch.object(Keyword, "objects", wraps=Keyword.objects) as objects:
+            self.assertEqual(feed.poll(), ([], []))
+        self.assertIn("updated_at__gte", objects.call_args_list[0].kwargs)
+
+        added = self.create_keyword(keyword="acme")
+        self.assertEqual([str(kw.id) for kw in feed.poll()[0]], [str(added.id)])
+
+    def test_auto_monitor_applies_feed_changes(self):
+        first = self.create_keyword(keyword="kleio")
+        auto_monitor = AutoMonitorService()
+        auto_monitor.keyword_feed = self._feed()
+
+        self.assertTrue(auto_monitor._load_keyword_changes())
+        self.assertFalse(auto_monitor._load_keyword_changes())
+
+        added = self.create_keyword(keyword="acme")
+        self._touch(first, is_active=False)
+        self.assertTrue(auto_monitor._load_keyword_changes())
+        self.assertEqual(list(auto_monitor.active_keywords), [str(added.id)])
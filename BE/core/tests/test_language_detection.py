@@ -1,8 +1,17 @@
 from types import SimpleNamespace
+from unittest import mock
 
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, override_settings
 
-from core.services.language_detection import MIN_DETECT_LENGTH, detect_language
+from core.services.language_detection import (
+    MIN_DETECT_LENGTH,
+    LanguageDetectionCache,
+    clear_language_detection_cache,
+    detect_language,
+    get_backend_name,
+    language_detection_cache_info,
+)
+from core.services.ngram_language_model import iter_ngrams, ngram_language_model
 from core.services.matching_engine import GenericMatchingEngine, MatchContext
 
 
@@ -20,6 +29,83 @@ class LanguageDetectionTests(SimpleTestCase):
         self.assertEqual(detect_language(text), "es")
 
 
+class LanguageDetectionCacheTests(SimpleTestCase):
+    def setUp(self):
+        clear_language_detection_cache()
+
+    def tearDown(self):
+        clear_language_detection_cache()
+
+    def test_repeated_text_is_served_from_cache(self):
+        text = "This is a longer English sentence used for language detection."
+        with mock.patch(
+            "core.services.language_detection.detect", return_value="en"
+        ) as detect:
+            self.assertEqual(detect_language(text), "en")
+            # Whitespace differences normalize to the same cache entry
+            self.assertEqual(detect_language("  " + text.replace(" ", "\n  ") + " "), "en")
+
+        detect.assert_called_once()
+        info = language_detection_cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (1, 1, 1))
+
+    def test_short_text_bypasses_cache(self):
+        detect_language("too short")
+        self.assertEqual(language_detection_cache_info()["misses"], 0)
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = LanguageDetectionCache(maxsize=2)
+        a, b, c = (cache.key_for(t) for t in ("a", "b", "c"))
+        cache.put(a, "en")
+        cache.put(b, "es")
+        self.assertEqual(cache.get(a), "en")
+        cache.put(c, "de")
+
+        self.assertIsNone(cache.get(b))
+        self.assertEqual(cache.get(a), "en")
+        self.assertEqual(cache.get(c), "de")
+        self.assertEqual(cache.info()["size"], 2)
+
+
+@override_settings(LANGUAGE_DETECTION_BACKEND="ngram")
+class NgramLanguageBackendTests(SimpleTestCase):
+    def setUp(self):
+        clear_language_detection_cache()
+
+    def tearDown(self):
+        clear_language_detection_cache()
+
+    def test_detects_common_languages(self):
+        samples = {
+            "en": "This is a longer English sentence used for language detection.",
+            "es": "Este es un texto más largo en español para probar la detección automática.",
+            "de": "Ich habe mein Team letzten Monat auf dieses Werkzeug umgestellt.",
+            "ru": "Ищу рекомендации хорошего сервиса мониторинга для небольшой компании.",
+            "ja": "小さな会社向けのおすすめの監視サービスを探しています。",
+            "zh": "上个月我把团队迁移到了这个工具，通知功能非常有用。",
+        }
+        for expected, text in samples.items():
+            with self.subTest(language=expected):
+                self.assertEqual(detect_language(text), expected)
+
+    def test_keeps_min_length_rule(self):
+        self.assertEqual(detect_language("too short"), "")
+
+    def test_text_without_letters_is_undetected(self):
+        self.assertEqual(detect_language("1234 5678 !!! 9012 3456 ???"), "")
+
+    def test_ngrams_are_word_padded(self):
+        self.assertEqual(
+            sorted(iter_ngrams("Hi")),
+            sorted(["h", " h", "i", "hi", " hi", "i ", "hi "]),
+        )
+        self.assertIn("ja", ngram_language_model.languages)
+
+    @override_settings(LANGUAGE_DETECTION_BACKEND="nope")
+    def test_unknown_backend_falls_back_to_langdetect(self):
+        self.assertEqual(get_backend_name(), "langdetect")
+
+
 class MatchingEngineLanguageFilterTests(SimpleTestCase):
     def setUp(self):
         self.engine = GenericMatchingEngine()
@@ -88,3 +174,27 @@ class MatchingEngineLanguageFilterTests(SimpleTestCase):
             MatchContext(),
         )
         self.assertTrue(result)
+
+    def test_language_detection_skipped_when_keyword_absent(self):
+        keyword = self._keyword(included_languages=["en"])
+        with mock.patch("core.services.matching_engine.detect_language") as detect:
+            result = self.engine.should_create_mention(
+                keyword,
+                "A long comment that never mentions the monitored term at all.",
+                "body",
+                MatchContext(),
+            )
+        self.assertFalse(result)
+        detect.assert_not_called()
+
+    def test_language_detection_skipped_when_excluded_term_present(self):
+        keyword = self._keyword(included_languages=["en"], excluded_keywords=["snake"])
+        with mock.patch("core.services.matching_engine.detect_language") as detect:
+            result = self.engine.should_create_mention(
+                keyword,
+                "The python is a large snake found in tropical regions.",
+                "body",
+                MatchContext(),
+            )
+        self.assertFalse(result)
+        detect.assert_not_called()
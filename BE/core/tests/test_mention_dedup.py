@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.management import call_command
+
+from core.models import Mention, MentionDailyRollup
+from core.services.analytics_service import record_mentions
+from core.services.mention_writer import MentionWriter
+from core.tests.base import MongoTestCase
+from platforms.hackernews.services.hackernews_service import HackerNewsService
+from platforms.twitter.services.twitter_service_mock import MockTwitterService
+
+
+class MentionDedupTests(MongoTestCase):
+    def _mention(self, keyword, url="https://news.ycombinator.com/item?id=1"):
+        return Mention(
+            keyword_id=str(keyword.id),
+            user_id=keyword.user_id,
+            content="Kleio is neat",
+            source_url=url,
+            platform="hackernews",
+            content_type="title",
+        )
+
+    def test_same_url_is_kept_per_keyword(self):
+        first = self.create_keyword(keyword="kleio")
+        second = self.create_keyword(keyword="acme")
+
+        writer = MentionWriter()
+        writer.submit(self._mention(first))
+        writer.submit(self._mention(first))
+        writer.submit(self._mention(second))
+        writer.stop()
+        self.assertEqual(Mention.objects.count(), 2)
+
+    def test_mock_twitter_saves_through_the_writer(self):
+        keyword = self.create_keyword(platform="twitter")
+        service = MockTwitterService()
+        writer = MentionWriter()
+        module = "platforms.twitter.services.twitter_service_mock"
+        with patch(f"{module}.notification_outbox") as outbox, patch(f"{module}.mention_writer", writer):
+            for _ in range(2):
+                service._save_mention(self._mention(keyword, "https://x.com/a/status/1"), keyword)
+            writer.stop()
+
+        self.assertEqual(Mention.objects.count(), 1)
+        outbox.enqueue_mention.assert_called_once()
+
+    def test_duplicate_does_not_notify_again(self):
+        keyword = self.create_keyword(platform="hackernews")
+        service = HackerNewsService()
+        service._cycle_mentions = 0
+        match = SimpleNamespace(matched_text="kleio", position=0, confidence=1.0)
+        story = {"id": 1, "title": "Kleio is neat", "by": "pg", "time": 0}
+
+        writer = MentionWriter()
+        module = "platforms.hackernews.services.hackernews_service"
+        with patch(f"{module}.notification_outbox") as outbox, patch(f"{module}.mention_writer", writer):
+            for _ in range(2):
+                mention = service._create_mention_from_story(keyword, story, match, "title")
+                asyncio.run(service._save_mention(mention, keyword))
+            writer.stop()
+
+        self.assertEqual(Mention.objects.count(), 1)
+        # Counted when queued; the writer drops the duplicate afterwards
+        self.assertEqual(service._cycle_mentions, 2)
+        outbox.enqueue_mention.assert_called_once()
+
+
+class DedupeMentionsCommandTests(MongoTestCase):
+    def test_keeps_earliest_mention_per_keyword_and_url(self):
+        keyword = self.create_keyword()
+        collection = Mention._get_db()[Mention._get_collection_name()]
+        collection.drop_indexes()
+        MentionDailyRollup.drop_collection()
+        day = datetime(2026, 3, 20, 12, 0)
+        base = {
+            "keyword_id": str(keyword.id),
+            "user_id": keyword.user_id,
+            "platform": "reddit",
+            "source_url": "https://example.com/a",
+        }
+        docs = [
+            dict(base, discovered_at=day + timedelta(minutes=2)),
+            dict(base, discovered_at=day + timedelta(minutes=1)),
+            dict(base, source_url="https://example.com/b", discovered_at=day + timedelta(minutes=3)),
+        ]
+        collection.insert_many(docs)
+        record_mentions(Mention._from_son(doc) for doc in docs)
+
+        out = StringIO()
+        call_command("dedupe_mentions", stdout=out)
+
+        remaining = sorted(doc["discovered_at"].minute for doc in collection.find())
+        self.assertEqual(remaining, [1, 3])
+        self.assertIn("removed: 1", out.getvalue())
+        # The removed duplicate is taken back out of the analytics rollup
+        self.assertEqual(MentionDailyRollup.objects.get(day="2026-03-20").count, 2)
@@ -0,0 +1,176 @@
+"""API tests for paging through the mention list."""
+
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Mention
+from core.views import list_mentions
+
+from .base import MongoTestCase, NO_THROTTLE
+
+BASE = datetime(2026, 3, 20, 12, 0)
+
+
+@NO_THROTTLE
+class MentionListPaginationTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = APIRequestFactory()
+        self.keyword = self.create_keyword()
+        # Pairs share a timestamp so the id tie-breaker is exercised
+        for n in range(7):
+            Mention(
+                keyword_id=str(self.keyword.id),
+                user_id=self.keyword.user_id,
+                content=f"mention {n}",
+                source_url=f"https://example.com/{n}",
+                platform="reddit",
+                content_type="comment",
+                discovered_at=BASE - timedelta(minutes=n // 2),
+            ).save()
+
+    def _get(self, **params):
+        request = self.factory.get("/api/mentions", params)
+        force_authenticate(request, user=self.auth_user())
+        return list_mentions(request)
+
+    def test_cursor_pages_cover_every_mention_once_in_order(self):
+        expected = [
+            str(m.id) for m in Mention.objects(user_id="test-user-1").order_by('-discovered_at', '-id')
+        ]
+        seen = []
+        response = self._get(limit=3)
+        self.assertEqual(response.data["total"], 7)
+        pages = 1
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(m["id"] for m in response.data["mentions"])
+            if not response.data["hasMore"]:
+                self.assertIsNone(response.data["nextCursor"])
+                break
+            response = self._get(limit=3, cursor=response.data["nextCursor"])
+            # Later pages skip the count unless asked for
+            self.assertIsNone(response.data["total"])
+            pages += 1
+
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+
+    def test_total_can_be_requested_with_a_cursor(self):
+        first = self._get(limit=2)
+        response = self._get(limit=2, cursor=first.data["nextCursor"], includeTotal="true")
+        self.assertEqual(response.data["total"], 7)
+
+    def test_offset_paging_still_works(self):
+        response = self._get(limit=5, offset=5)
+        self.assertEqual(len(response.data["mentions"]), 2)
+        self.assertFalse(response.data["hasMore"])
+        self.assertEqual(response.data["total"], 7)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self._get(cursor="not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@NO_THROTTLE
+class MentionSearchTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = APIRequestFactory()
+        self.keyword = self.create_keyword()
+        self.texts = [
+            ("Launch day", "Kleio monitors Reddit for your brand"),
+            ("", "Has anyone tried kleio? Monitoring looks good"),
+            ("Unrelated", "Nothing to see here"),
+            ("Reddit tips", "Monitoring subreddits by hand is slow"),
+            ("", "kleio kleio KLEIO"),
+        ]
+        for n, (title, content) in enumerate(self.texts):
+            Mention(
+                keyword_id=str(self.keyword.id),
+                user_id=self.keyword.user_id,
+                title=title,
+                content=content,
+                source_url=f"https://example.com/{n}",
+                platform="reddit",
+                content_type="comment",
+                discovered_at=BASE - timedelta(minutes=n),
+            ).save()
+
+    def _search(self, q, **params):
+        request = self.factory.get("/api/mentions", {"q": q, **params})
+        force_authenticate(request, user=self.auth_user())
+        response = list_mentions(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def _contents(self, response):
+        return [m["content"] for m in response.data["mentions"]]
+
+    def test_tokens_are_maintained_on_save(self):
+        mention = Mention.objects(source_url="https://example.com/0").first()
+        self.assertEqual(mention.search_tokens, ["launch", "day", "kleio", "monitors", "reddit", "for", "your", "brand"])
+
+    def test_search_matches_every_query_word(self):
+        response = self._search("Kleio monitoring")
+        # Both words required; "monitors" is a different token
+        self.assertEqual(self._contents(response), ["Has anyone tried kleio? Monitoring looks good"])
+        self.assertEqual(response.data["total"], 1)
+
+    def test_search_cursor_pages_newest_first(self):
+        first = self._search("kleio", limit=2)
+        self.assertTrue(first.data["hasMore"])
+        second = self._search("kleio", limit=2, cursor=first.data["nextCursor"])
+        self.assertFalse(second.data["hasMore"])
+        self.assertEqual(self._contents(first) + self._contents(second), [
+            "Kleio monitors Reddit for your brand",
+            "Has anyone tried kleio? Monitoring looks good",
+            "kleio kleio KLEIO",
+        ])
+
+    def test_search_projects_candidates_before_sorting(self):
+        queryset = type(Mention.objects)
+        with mock.patch.object(queryset, "aggregate", autospec=True, side_effect=queryset.aggregate) as aggregate:
+            self._search("kleio", limit=1)
+        pipeline = aggregate.call_args.args[1]
+        stages = [next(iter(stage)) for stage in pipeline]
+        self.assertLess(stages.index("$project"), stages.index("$sort"))
+        self.assertEqual(pipeline[stages.index("$project")]["$project"], {"discovered_at": 1})
+
+    def test_short_and_symbol_terms_are_kept(self):
+        for n, content in enumerate([
+            "Hiring a C# developer",
+            "Hiring a Java developer",
+            "R language tips",
+            "Any language works",
+            "C++ or C? Both",
+        ]):
+            Mention(
+                keyword_id=str(self.keyword.id),
+                user_id=self.keyword.user_id,
+                content=content,
+                source_url=f"https://example.com/short/{n}",
+                platform="reddit",
+                content_type="comment",
+                discovered_at=BASE - timedelta(hours=1, minutes=n),
+            ).save()
+
+        self.assertEqual(self._contents(self._search("C# developer")), ["Hiring a C# developer"])
+        self.assertEqual(self._contents(self._search("R language")), ["R language tips"])
+        self.assertEqual(self._contents(self._search("c++")), ["C++ or C? Both"])
+
+    def test_punctuation_query_falls_back_to_substring_match(self):
+        response = self._search("?")
+        self.assertEqual(self._contents(response), ["Has anyone tried kleio? Monitoring looks good"])
+
+    def test_backfill_fills_missing_tokens(self):
+        Mention.objects.update(unset__search_tokens=True)
+        self.assertEqual(self._search("unrelated").data["mentions"], [])
+
+        call_command("backfill_mention_search_tokens", stdout=mock.MagicMock())
+
+        self.assertEqual(self._contents(self._search("unrelated")), ["Nothing to see here"])
@@ -0,0 +1,152 @@
+import threading
+import time
+from unittest import mock
+
+from core.models import Mention
+from core.services.email_service import EmailNotificationService
+from core.services.mention_writer import (
+    WRITE_DUPLICATE,
+    WRITE_FAILED,
+    WRITE_INSERTED,
+    MentionWriter,
+)
+from core.tests.base import MongoTestCase
+from platforms.twitter.services.twitter_service import TwitterService
+from platforms.youtube.services.youtube_service import YouTubeService
+
+
+class MentionWriterTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.keyword = self.create_keyword()
+        self.results = []
+        self.done = threading.Event()
+
+    def _mention(self, url, **kwargs):
+        defaults = {
+            "keyword_id": str(self.keyword.id),
+            "user_id": self.keyword.user_id,
+            "content": "Kleio is neat",
+            "source_url": url,
+            "platform": "reddit",
+            "content_type": "comment",
+        }
+        defaults.update(kwargs)
+        return Mention(**defaults)
+
+    def _record(self, mention, status):
+        self.results.append((mention.source_url, status, mention.id))
+        self.done.set()
+
+    def test_batch_reports_inserted_duplicate_and_failed_items(self):
+        self._mention("https://example.com/existing").save()
+        writer = MentionWriter(flush_interval=60)
+        writer.submit(self._mention("https://example.com/a"), self._record)
+        writer.submit(self._mention("https://example.com/existing"), self._record)
+        writer.submit(self._mention("not a url"), self._record)
+        writer.submit(self._mention("https://example.com/b"), self._record)
+        writer.stop()
+
+        statuses = {url: status for url, status, _ in self.results}
+        self.assertEqual(statuses, {
+            "https://example.com/a": WRITE_INSERTED,
+            "https://example.com/existing": WRITE_DUPLICATE,
+            "not a url": WRITE_FAILED,
+            "https://example.com/b": WRITE_INSERTED,
+        })
+        # Inserted mentions come back with their ids for the notification stage
+        inserted_ids = {mention_id for _, status, mention_id in self.results if status == WRITE_INSERTED}
+        self.assertEqual(inserted_ids, {m.id for m in Mention.objects(source_url__in=["https://example.com/a", "https://example.com/b"])})
+        self.assertEqual(Mention.objects.count(), 3)
+        self.assertEqual(writer.metrics()["batches"], 1)
+
+    def test_full_batch_is_flushed_without_waiting_for_interval(self):
+        writer = MentionWriter(batch_size=2, flush_interval=60)
+        writer.submit(self._mention("https://example.com/a"))
+        writer.submit(self._mention("https://example.com/b"), self._record)
+
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(Mention.objects.count(), 2)
+        writer.stop()
+
+    def test_non_blocking_submit_drops_at_once_when_full(self):
+        writer = MentionWriter(batch_size=1, max_buffer=1, put_timeout=5)
+        with mock.patch.object(writer, "start"):  # nothing drains the buffer
+            self.assertTrue(writer.submit(self._mention("https://example.com/a")))
+            started = time.monotonic()
+            self.assertFalse(writer.submit(self._mention("https://example.com/b"), block=False))
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(writer.dropped, 1)
+
+    def test_mark_email_sent_updates_in_place(self):
+        mentions = [self._mention(f"https://example.com/{n}") for n in range(3)]
+        for mention in mentions:
+            mention.save()
+
+        EmailNotificationService.mark_email_sent(mentions[:2])
+
+        self.assertEqual(Mention.objects(email_sent=True).count(), 2)
+        self.assertTrue(all(mention.email_sent for mention in mentions[:2]))
+
+
+class PollMentionCountTests(MongoTestCase):
+    """Polls count mentions when queued; late writer callbacks must not touch the next poll."""
+
+    def setUp(self):
+        super().setUp()
+        self.callbacks = []
+
+    def _submit(self, mention, callback=None, block=True):
+        self.callbacks.append((callback, mention))
+        return True
+
+    def _assert_late_callback_is_not_counted(self, service, module, save):
+        with mock.patch(f"{module}.mention_writer") as writer, mock.patch(f"{module}.notification_outbox"):
+            writer.submit.side_effect = self._submit
+            service._cycle_mentions = 0
+            save()
+            self.assertEqual(service._cycle_mentions, 1)
+
+            service._cycle_mentions = 0  # next poll starts before the write lands
+            callback, mention = self.callbacks[0]
+            callback(mention, WRITE_INSERTED)
+        self.assertEqual(service._cycle_mentions, 0)
+
+    def _mention(self, keyword, platform):
+        return Mention(
+            keyword_id=str(keyword.id),
+            user_id=keyword.user_id,
+            content="Kleio is neat",
+            source_url="https://example.com/1",
+            platform=platform,
+            content_type="comment",
+        )
+
+    def test_twitter(self):
+        keyword = self.create_keyword(platform="twitter")
+        service = TwitterService()
+        self._assert_late_callback_is_not_counted(
+            service,
+            "platforms.twitter.services.twitter_service",
+            lambda: service._save_mention(self._mention(keyword, "twitter"), keyword),
+        )
+
+    def test_youtube(self):
+        keyword = self.create_keyword(platform="youtube")
+        service = YouTubeService()
+        match = mock.Mock(matched_text="kleio", position=0, confidence=1.0, detected_language="")
+        self._assert_late_callback_is_not_counted(
+            service,
+            "platforms.youtube.services.youtube_service",
+            lambda: service._save_youtube_mention(
+                keyword=keyword,
+                video_id="v1",
+                title="Kleio",
+                content="Kleio is neat",
+                author="someone",
+                source_url="https://youtube.com/watch?v=v1",
+                mention_content_type="comment",
+                match_result=match,
+                mention_date=None,
+            ),
+        )
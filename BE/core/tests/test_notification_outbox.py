@@ -0,0 +1,114 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from core.enums import OutboxStatus
+from core.models import Mention, NotificationOutbox, UserProfile
+from core.services.notification_outbox import NotificationOutboxService
+from core.tests.base import MongoTestCase
+
+SEND = "core.services.notification_outbox.email_notification_service.send_mention_notification"
+
+
+class NotificationOutboxTests(MongoTestCase):
+    def setUp(self):
+        super().setUp()
+        NotificationOutbox.drop_collection()
+        keyword = self.create_keyword()
+        self.mention = Mention(
+            keyword_id=str(keyword.id),
+            user_id=keyword.user_id,
+            content="Kleio is neat",
+            source_url="https://example.com/a",
+            platform="reddit",
+            content_type="comment",
+        )
+        self.mention.save()
+        self.outbox = NotificationOutboxService(max_attempts=3, backoff_seconds=10, backoff_max_seconds=25)
+
+    def _item(self):
+        return NotificationOutbox.objects.get(idempotency_key=f"mention:{self.mention.id}")
+
+    def _make_due(self):
+        NotificationOutbox.objects.update(set__next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    def test_enqueue_is_idempotent_per_mention(self):
+        self.assertTrue(self.outbox.enqueue_mention(self.mention))
+        self.assertFalse(self.outbox.enqueue_mention(self.mention))
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+
+    def test_delivers_with_idempotency_key(self):
+        self.outbox.enqueue_mention(self.mention)
+
+        with patch(SEND, return_value=True) as send:
+            self.assertTrue(self.outbox.process_next())
+            self.assertFalse(self.outbox.process_next())
+
+        send.assert_called_once()
+        self.assertEqual(send.call_args.kwargs["idempotency_key"], f"mention:{self.mention.id}")
+        item = self._item()
+        self.assertEqual(item.status, OutboxStatus.SENT.value)
+        self.assertEqual(item.attempts, 1)
+        self.assertIsNotNone(item.sent_at)
+        self.assertIsNotNone(item.completed_at)
+
+    def test_failures_back_off_then_give_up(self):
+        self.outbox.enqueue_mention(self.mention)
+
+        with patch(SEND, side_effect=RuntimeError("resend down")) as send:
+            self.outbox.process_next()
+            item = self._item()
+            self.assertEqual(item.status, OutboxStatus.PENDING.value)
+            self.assertEqual(item.last_error, "resend down")
+            self.assertIsNone(item.completed_at)
+            # Not due again until the backoff has passed
+            self.assertFalse(self.outbox.process_next())
+
+            self._make_due()
+            self.outbox.process_next()
+            self._make_due()
+            self.outbox.process_next()
+
+        self.assertEqual(send.call_count, 3)
+        item = self._item()
+        self.assertEqual(item.status, OutboxStatus.FAILED.value)
+        self.assertEqual(item.attempts, 3)
+        self.assertIsNotNone(item.completed_at)
+
+    def test_expired_lease_is_reclaimed(self):
+        self.outbox.enqueue_mention(self.mention)
+        NotificationOutbox.objects.update(
+            set__status=OutboxStatus.SENDING.value,
+            set__attempts=1,
+            set__lease_until=timezone.now() - timedelta(seconds=1),
+        )
+
+        with patch(SEND, return_value=True):
+            self.assertTrue(self.outbox.process_next())
+
+        item = self._item()
+        self.assertEqual(item.status, OutboxStatus.SENT.value)
+        self.assertEqual(item.attempts, 2)
+
+    def test_digest_users_are_deferred_not_sent(self):
+        UserProfile(user_id=self.mention.user_id, notification_frequency="daily").save()
+        self.outbox.enqueue_mention(self.mention)
+
+        with patch(SEND) as send:
+            self.assertTrue(self.outbox.process_next())
+
+        send.assert_not_called()
+        item = self._item()
+        self.assertEqual(item.status, OutboxStatus.DEFERRED.value)
+        self.assertIsNone(item.sent_at)
+        self.assertIsNotNone(item.completed_at)
+
+    def test_finished_items_expire_through_a_ttl_index(self):
+        ttl = [index for index in NotificationOutbox._meta["indexes"] if "expireAfterSeconds" in index]
+        self.assertEqual([index["fields"] for index in ttl], [("completed_at",)])
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        with patch("core.services.notification_outbox.random.uniform", return_value=1.0):
+            delays = [self.outbox.backoff_for(attempts) for attempts in range(1, 5)]
+        self.assertEqual(delays, [10, 20, 25, 25])
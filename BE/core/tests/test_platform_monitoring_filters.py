@@ -6,11 +6,13 @@ These tests mirror that wiring so filter behavior can be verified without live A
 """
 
 from types import SimpleNamespace
+from unittest import mock
 
 from django.test import SimpleTestCase
 
 from core.enums import ContentType, MatchMode, Platform
-from core.services.matching_engine import GenericMatchingEngine, MatchContext
+from core.services.keyword_automaton import KeywordAutomaton
+from core.services.matching_engine import CompiledKeyword, GenericMatchingEngine, MatchContext
 
 
 def keyword(**overrides):
@@ -446,3 +448,91 @@ class PlatformMonitoringScenarioTableTests(MonitoringTestMixin, SimpleTestCase):
                     self.assert_matches(kw, content, content_type, ctx, description)
                 else:
                     self.assert_no_match(kw, content, content_type, ctx, description)
+
+
+class CompiledKeywordTests(MonitoringTestMixin, SimpleTestCase):
+    """Precompiled keywords must behave exactly like the raw documents."""
+
+    def test_scenarios_match_with_compiled_keywords(self):
+        for platform, description, kw_overrides, content, content_type, ctx_kwargs, expect in (
+            PlatformMonitoringScenarioTableTests.SCENARIOS
+        ):
+            with self.subTest(platform=platform, scenario=description):
+                compiled = self.engine.compile_keyword(keyword(**kw_overrides))
+                result = self.engine.should_create_mention(
+                    compiled, content, content_type, MatchContext(**ctx_kwargs)
+                )
+                self.assertEqual(bool(result), expect, description)
+
+    def test_compile_is_idempotent_and_delegates_attributes(self):
+        raw = keyword(keyword="Kleio", user_id="u1", platform=Platform.REDDIT.value)
+        compiled = self.engine.compile_keyword(raw)
+        self.assertIsInstance(compiled, CompiledKeyword)
+        self.assertIs(self.engine.compile_keyword(compiled), compiled)
+        self.assertEqual(compiled.user_id, "u1")
+        self.assertEqual(compiled.platform, Platform.REDDIT.value)
+        self.assertEqual(compiled.lowered, "kleio")
+
+    def test_word_boundary_pattern_is_precompiled(self):
+        compiled = self.engine.compile_keyword(
+            keyword(keyword="Kleio", match_mode=MatchMode.WORD_BOUNDARY.value)
+        )
+        self.assertIsNotNone(compiled.pattern)
+        self.assert_matches(compiled, "We use KLEIO daily", ContentType.BODY.value, MatchContext())
+        self.assert_no_match(compiled, "kleiomatic", ContentType.BODY.value, MatchContext())
+
+    def test_filter_sets_are_normalized(self):
+        compiled = self.engine.compile_keyword(
+            keyword(excluded_users=["@Spammer"], excluded_subreddits=["r/Spam"], included_languages=["EN-us"])
+        )
+        self.assertEqual(compiled.excluded_user_set, frozenset({"spammer"}))
+        self.assertEqual(compiled.excluded_subreddit_set, frozenset({"spam"}))
+        self.assertEqual(compiled.included_language_set, frozenset({"en"}))
+        self.assertTrue(compiled.has_language_filters)
+
+
+class MatchBatchTests(MonitoringTestMixin, SimpleTestCase):
+    """match_batch must agree with should_create_mention keyword by keyword."""
+
+    def test_scenarios_agree_with_single_keyword_matching(self):
+        for platform, description, kw_overrides, content, content_type, ctx_kwargs, expect in (
+            PlatformMonitoringScenarioTableTests.SCENARIOS
+        ):
+            with self.subTest(platform=platform, scenario=description):
+                kw = keyword(**kw_overrides)
+                matches = self.engine.match_batch(content, content_type, MatchContext(**ctx_kwargs), [kw])
+                self.assertEqual([k for k, _ in matches], [kw] if expect else [], description)
+
+    def test_returns_only_matching_keywords(self):
+        kleio = keyword()
+        other = keyword(keyword="acme")
+        excluded = keyword(keyword="release", excluded_keywords=["kleio"])
+        titles_only = keyword(keyword="notes", content_types=[ContentType.TITLES.value])
+        automaton = KeywordAutomaton([kleio, other, excluded, titles_only])
+
+        matches = self.engine.match_batch(
+            "Kleio release notes", ContentType.BODY.value, MatchContext(), automaton
+        )
+
+        self.assertEqual([k for k, _ in matches], [kleio])
+        self.assertEqual(matches[0][1].matched_text, "Kleio")
+
+    def test_detects_language_once_for_all_keywords(self):
+        keywords = [
+            keyword(included_languages=["en"]),
+            keyword(keyword="monitoring", excluded_languages=["de"]),
+            keyword(keyword="tools"),
+        ]
+        with mock.patch(
+            "core.services.matching_engine.detect_language", return_value="en"
+        ) as detect:
+            matches = self.engine.match_batch(
+                "Discussion about kleio monitoring tools for teams",
+                ContentType.BODY.value,
+                MatchContext(),
+                keywords,
+            )
+
+        detect.assert_called_once()
+        self.assertEqual(len(matches), 3)
+        self.assertTrue(all(result.detected_language == "en" for _, result in matches))
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.enums import Platform
+from platforms.reddit.services.realtime_monitor import (
+    STREAM_MODE_ALL,
+    STREAM_MODE_MULTIREDDIT,
+    STREAM_MODE_PER_SUBREDDIT,
+    RealtimeStreamMonitor,
+    SubredditKeywordIndex,
+    normalize_subreddit_name,
+)
+
+
+def _kw(text, subreddits=None, platform=Platform.REDDIT.value):
+    return SimpleNamespace(keyword=text, platform=platform, platform_specific_filters=subreddits or [])
+
+
+class SubredditKeywordIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.py = _kw("kleio", ["r/Python", "django"])
+        self.rust = _kw("cargo", ["/r/rust/"])
+        self.anywhere = _kw("acme")
+        self.other_platform = _kw("tweet", platform=Platform.TWITTER.value)
+        self.keywords = [self.py, self.rust, self.anywhere, self.other_platform]
+
+    def test_normalizes_subreddit_names(self):
+        self.assertEqual(normalize_subreddit_name(" r/Python "), "python")
+        self.assertEqual(normalize_subreddit_name("/r/rust/"), "rust")
+        self.assertEqual(normalize_subreddit_name("rust"), "rust")
+
+    def test_per_subreddit_plan_keeps_one_stream_per_subreddit(self):
+        index = SubredditKeywordIndex(self.keywords, STREAM_MODE_PER_SUBREDDIT)
+        self.assertEqual(index.streams, ["all", "django", "python", "rust"])
+
+    def test_multireddit_plan_chunks_subreddits(self):
+        index = SubredditKeywordIndex(self.keywords, STREAM_MODE_MULTIREDDIT, multireddit_size=2)
+        self.assertEqual(index.streams, ["all", "django+python", "rust"])
+
+        filtered_only = SubredditKeywordIndex([self.py, self.rust], STREAM_MODE_MULTIREDDIT)
+        self.assertEqual(filtered_only.streams, ["django+python+rust"])
+
+    def test_all_plan_uses_single_stream(self):
+        index = SubredditKeywordIndex(self.keywords, STREAM_MODE_ALL)
+        self.assertEqual(index.streams, ["all"])
+        self.assertEqual(SubredditKeywordIndex([], STREAM_MODE_ALL).streams, [])
+
+    def test_routes_multireddit_items_by_subreddit(self):
+        index = SubredditKeywordIndex(self.keywords, STREAM_MODE_MULTIREDDIT)
+        stream = index.streams[1]
+
+        self.assertEqual(index.automaton_for(stream, "Python").keywords, [self.py])
+        self.assertEqual(index.automaton_for(stream, "rust").keywords, [self.rust])
+        self.assertFalse(index.automaton_for(stream, "golang"))
+        # The r/all stream only serves keywords without subreddit filters
+        self.assertEqual(index.automaton_for("all", "python").keywords, [self.anywhere])
+
+    def test_all_mode_routes_filtered_and_wildcard_keywords(self):
+        index = SubredditKeywordIndex(self.keywords, STREAM_MODE_ALL)
+
+        self.assertEqual(index.automaton_for("all", "python").keywords, [self.py, self.anywhere])
+        self.assertEqual(index.automaton_for("all", "golang").keywords, [self.anywhere])
+
+
+class QuietStreamPollingTests(SimpleTestCase):
+    def test_quiet_polls_back_off_and_reset_on_items(self):
+        stop_event = mock.Mock()
+        stop_event.is_set.return_value = False
+        submission = SimpleNamespace(subreddit=SimpleNamespace(display_name="python"))
+
+        def submissions(**kwargs):
+            yield from [None, None, None, submission, None]
+            stop_event.is_set.return_value = True
+
+        monitor = RealtimeStreamMonitor.__new__(RealtimeStreamMonitor)
+        monitor.stop_monitoring = False
+        monitor.index = None
+        monitor.reddit = mock.Mock()
+        monitor.reddit.subreddit.return_value.stream.submissions = submissions
+
+        monitor._monitor_submissions_stream("python", stop_event)
+
+        waits = [c.args[0] for c in stop_event.wait.call_args_list]
+        self.assertEqual(waits, [1, 2, 4, 1])
@@ -0,0 +1,58 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from core.services.work_queue import BoundedWorkQueue
+
+
+class BoundedWorkQueueTests(SimpleTestCase):
+    def test_workers_process_every_accepted_item(self):
+        seen = []
+        done = threading.Event()
+
+        def handler(item):
+            seen.append(item)
+            if len(seen) == 5:
+                done.set()
+
+        work_queue = BoundedWorkQueue("test", handler, maxsize=10, workers=2, stats_interval=0)
+        work_queue.start()
+        try:
+            for number in range(5):
+                self.assertTrue(work_queue.submit(number))
+            self.assertTrue(done.wait(timeout=5))
+        finally:
+            work_queue.stop()
+
+        self.assertEqual(sorted(seen), [0, 1, 2, 3, 4])
+        metrics = work_queue.metrics()
+        self.assertEqual((metrics["enqueued"], metrics["processed"], metrics["dropped"]), (5, 5, 0))
+
+    def test_full_queue_drops_after_timeout(self):
+        # Not started: nothing drains the queue
+        work_queue = BoundedWorkQueue("test", lambda item: None, maxsize=2, workers=1, put_timeout=0.01)
+
+        results = [work_queue.submit(number) for number in range(4)]
+
+        self.assertEqual(results, [True, True, False, False])
+        metrics = work_queue.metrics()
+        self.assertEqual((metrics["depth"], metrics["max_depth"], metrics["dropped"]), (2, 2, 2))
+
+    def test_handler_errors_are_counted_and_do_not_stop_workers(self):
+        done = threading.Event()
+
+        def handler(item):
+            if item == "boom":
+                raise ValueError(item)
+            done.set()
+
+        work_queue = BoundedWorkQueue("test", handler, workers=1, stats_interval=0)
+        work_queue.start()
+        try:
+            work_queue.submit("boom")
+            work_queue.submit("ok")
+            self.assertTrue(done.wait(timeout=5))
+        finally:
+            work_queue.stop()
+
+        self.assertEqual(work_queue.metrics()["failed"], 1)
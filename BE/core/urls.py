@@ -22,6 +22,7 @@ urlpatterns = [
     path('billing/checkout', views.billing_checkout, name='billing_checkout'),
     path('billing/portal', views.billing_portal, name='billing_portal'),
     path('webhooks/dodo', views.dodo_webhook, name='dodo_webhook'),
+    path('webhooks/clerk', views.clerk_webhook, name='clerk_webhook'),
     path('keywords/<str:keyword_id>', views.update_keyword, name='update_keyword'),
     path('keywords/<str:keyword_id>/toggle', views.toggle_keyword, name='toggle_keyword'),
 
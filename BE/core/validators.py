@@ -1,8 +1,14 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 from rest_framework.response import Response
 from rest_framework import status
 
-from .enums import Platform, MatchMode, ContentType
+from .enums import Platform, MatchMode, ContentType, NotificationFrequency
 
 MAX_KEYWORD_LENGTH = 255
 MAX_FILTER_COUNT = 50
@@ -166,3 +172,31 @@ def parse_enabled(raw, *, default: bool = True) -> tuple[bool | None, Response |
     if not isinstance(raw, bool):
         return None, _bad_request('enabled must be a boolean')
     return raw, None
+
+
+def parse_notification_frequency(raw) -> tuple[str | None, Response | None]:
+    valid = [f.value for f in NotificationFrequency]
+    if not isinstance(raw, str) or raw not in valid:
+        return None, _bad_request(f'notificationFrequency must be one of: {", ".join(valid)}')
+    return raw, None
+
+
+def encode_mention_cursor(discovered_at: datetime, mention_id) -> str:
+    """Opaque keyset cursor for the mention list, positioned after this mention."""
+    payload = {'d': discovered_at.isoformat(), 'id': str(mention_id)}
+    encoded = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(encoded).decode('ascii').rstrip('=')
+
+
+def parse_mention_cursor(raw) -> tuple[tuple[datetime, ObjectId] | None, Response | None]:
+    """Decode a cursor into (discovered_at, id)."""
+    if raw is None or raw == '':
+        return None, None
+    try:
+        padded = raw + '=' * (-len(raw) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        discovered_at = datetime.fromisoformat(payload['d'])
+        mention_id = ObjectId(payload['id'])
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError, InvalidId):
+        return None, _bad_request('Invalid cursor')
+    return (discovered_at, mention_id), None
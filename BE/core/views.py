@@ -3,8 +3,6 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework import status
 from django.utils import timezone
-from datetime import timedelta
-from collections import defaultdict
 import logging
 from mongoengine.queryset.visitor import Q
 from .models import Keyword, Mention, UserProfile
@@ -18,11 +16,18 @@ from .validators import (
     parse_case_sensitive,
     parse_match_mode,
     parse_content_types,
+    parse_notification_frequency,
+    parse_mention_cursor,
+    encode_mention_cursor,
     validate_keyword_id,
 )
+from .search import query_tokens
+from .services import analytics_service
 from .services import billing_service
 from .services import dodo_service
-from .services.clerk_service import clerk_user_service
+from .services.keyword_cache import keyword_cache
+from .services import mention_search
+from .services.clerk_service import clerk_user_service, extract_user_email
 from django.conf import settings as django_settings
 
 logger = logging.getLogger(__name__)
@@ -41,14 +46,6 @@ def _as_aware(dt):
     return dt
 
 
-def _calendar_date_range(start_date, num_days: int) -> list[str]:
-    """Inclusive range of ISO date strings: start_date, start_date+1, ..."""
-    return [
-        (start_date + timedelta(days=i)).isoformat()
-        for i in range(num_days)
-    ]
-
-
 def _trend(current: int, prior: int) -> str:
     if current > prior:
         return 'up'
@@ -280,6 +277,7 @@ def get_keywords(request, platform=None):
                     updated_at=timezone.now(),
                 )
                 keyword_doc.save()
+                keyword_cache.invalidate(user_id)
                 created.append(keyword_doc)
 
             if len(created) == 1:
@@ -334,6 +332,8 @@ def update_keyword(request, keyword_id, platform=None):
 
         if request.method == 'DELETE':
             keyword.delete()
+            keyword_cache.invalidate(user_id)
+            analytics_service.forget_keyword(user_id, str(keyword.id))
             return Response(status=status.HTTP_204_NO_CONTENT)
 
         data = request.data
@@ -393,6 +393,7 @@ def update_keyword(request, keyword_id, platform=None):
 
         keyword.updated_at = timezone.now()
         keyword.save()
+        keyword_cache.invalidate(user_id)
         return Response(_keyword_response(keyword))
     except Exception:
         logger.exception("Failed to update/delete keyword %s for user %s", keyword_id, user_id)
@@ -437,6 +438,7 @@ def toggle_keyword(request, keyword_id, platform=None):
         keyword.is_active = turning_on
         keyword.updated_at = timezone.now()
         keyword.save()
+        keyword_cache.invalidate(user_id)
         return Response(_keyword_response(keyword))
     except Exception:
         logger.exception("Failed to toggle keyword %s for user %s", keyword_id, user_id)
@@ -464,59 +466,23 @@ def keyword_analytics(request):
             return error
 
     try:
-        keyword_query = Keyword.objects(user_id=user_id)
+        keywords = keyword_cache.keywords(user_id)
         if platform_filter:
-            keyword_query = keyword_query.filter(platform=platform_filter)
-        keywords = list(keyword_query.order_by('-created_at'))
+            keywords = [k for k in keywords if k.platform == platform_filter]
         keyword_ids = {str(k.id) for k in keywords}
 
-        now = timezone.now()
-        # Rolling 7-day windows (timestamp-based, week-over-week).
-        last_7_since = now - timedelta(days=7)
-        prev_7_since = now - timedelta(days=14)
-
-        # Calendar-day windows for sparkline + 14d summary (matches chart buckets).
-        first_sparkline_date = (now - timedelta(days=sparkline_days - 1)).date()
-        sparkline_dates = _calendar_date_range(first_sparkline_date, sparkline_days)
-        sparkline_date_set = set(sparkline_dates)
-        prior_sparkline_dates = _calendar_date_range(
-            first_sparkline_date - timedelta(days=sparkline_days),
-            sparkline_days,
-        )
-        prior_sparkline_date_set = set(prior_sparkline_dates)
-
-        totals = defaultdict(int)
-        last_7 = defaultdict(int)
-        prev_7 = defaultdict(int)
-        window_counts = defaultdict(lambda: defaultdict(int))
-        last_mention_at = {}
-        mentions_in_window = 0
-        mentions_prior_window = 0
-
-        for mention in Mention.objects(user_id=user_id):
-            kid = mention.keyword_id
-            if kid not in keyword_ids:
-                continue
-            discovered = _as_aware(mention.discovered_at)
-            if discovered is None:
-                continue
-
-            totals[kid] += 1
-            day_key = discovered.date().isoformat()
-
-            if day_key in sparkline_date_set:
-                window_counts[kid][day_key] += 1
-                mentions_in_window += 1
-            elif day_key in prior_sparkline_date_set:
-                mentions_prior_window += 1
-
-            if discovered >= last_7_since:
-                last_7[kid] += 1
-            elif discovered >= prev_7_since:
-                prev_7[kid] += 1
-
-            if kid not in last_mention_at or discovered > last_mention_at[kid]:
-                last_mention_at[kid] = discovered
+        windows = analytics_service.AnalyticsWindows(now=timezone.now(), sparkline_days=sparkline_days)
+        last_7_since = windows.last_7_since
+        prev_7_since = windows.prev_7_since
+        sparkline_dates = windows.sparkline_dates
+        counts = analytics_service.count_mentions(user_id, keyword_ids, windows)
+        totals = counts.totals
+        last_7 = counts.last_7
+        prev_7 = counts.prev_7
+        window_counts = counts.window_counts
+        last_mention_at = counts.last_mention_at
+        mentions_in_window = counts.mentions_in_window
+        mentions_prior_window = counts.mentions_prior_window
 
         keyword_rows = []
         total_mentions = 0
@@ -632,6 +598,7 @@ def list_mentions(request, platform=None):
         return Response({'error': 'Invalid status filter'}, status=status.HTTP_400_BAD_REQUEST)
 
     search_query = (request.GET.get('q') or '').strip()
+    search_terms = query_tokens(search_query)
 
     try:
         limit = int(request.GET.get('limit', 50))
@@ -645,6 +612,19 @@ def list_mentions(request, platform=None):
         offset = 0
     offset = max(offset, 0)
 
+    # Keyset pagination: the cursor holds the (discovered_at, id) of the last
+    # mention returned, so each page is a range seek instead of a skip.
+    cursor, error = parse_mention_cursor(request.GET.get('cursor'))
+    if error:
+        return error
+
+    # Counting walks every match; by default only the first page pays for it
+    include_total_raw = request.GET.get('includeTotal')
+    if include_total_raw is None:
+        include_total = cursor is None
+    else:
+        include_total = include_total_raw.lower() in {'1', 'true', 'yes'}
+
     try:
         query = {'user_id': user_id}
         if list_platform:
@@ -658,28 +638,53 @@ def list_mentions(request, platform=None):
             if status_filter == 'unread':
                 query['is_read'] = False
 
-        mentions_qs = Mention.objects(**query)
-        if search_query:
-            mentions_qs = mentions_qs.filter(
-                Q(title__icontains=search_query) | Q(content__icontains=search_query)
-            )
-        mentions_qs = mentions_qs.order_by('-discovered_at')
-        total = mentions_qs.count()
-        mentions = list(mentions_qs.skip(offset).limit(limit))
-
-        keyword_ids = {m.keyword_id for m in mentions}
-        keyword_labels = {}
-        if keyword_ids:
-            keyword_labels = {
-                str(k.id): k.keyword
-                for k in Keyword.objects(id__in=list(keyword_ids), user_id=user_id)
-            }
+        next_cursor = None
+        if search_terms:
+            # Token index search: mentions with every query word, newest first
+            total = mention_search.count_matches(query, search_terms) if include_total else None
+            if cursor is not None:
+                offset = 0
+            mentions = mention_search.search_mentions(query, search_terms, limit + 1, after=cursor, offset=offset)
+            has_more = len(mentions) > limit
+            mentions = mentions[:limit]
+            if has_more:
+                last = mentions[-1]
+                next_cursor = encode_mention_cursor(last.discovered_at, last.id)
+        else:
+            mentions_qs = Mention.objects(**query)
+            if search_query:
+                # Queries without indexable terms (e.g. only punctuation)
+                mentions_qs = mentions_qs.filter(
+                    Q(title__icontains=search_query) | Q(content__icontains=search_query)
+                )
+            mentions_qs = mentions_qs.order_by('-discovered_at', '-id')
+            total = mentions_qs.count() if include_total else None
+            if cursor is not None:
+                after_discovered, after_id = cursor
+                page_qs = mentions_qs.filter(
+                    Q(discovered_at__lt=after_discovered)
+                    | Q(discovered_at=after_discovered, id__lt=after_id)
+                )
+                offset = 0
+            else:
+                page_qs = mentions_qs.skip(offset)
+            # One extra row tells us whether another page exists without counting
+            mentions = list(page_qs.limit(limit + 1))
+            has_more = len(mentions) > limit
+            mentions = mentions[:limit]
+            if has_more:
+                last = mentions[-1]
+                next_cursor = encode_mention_cursor(last.discovered_at, last.id)
+
+        keyword_labels = keyword_cache.labels(user_id) if mentions else {}
 
         return Response({
             'mentions': [_mention_response(m, keyword_labels) for m in mentions],
             'total': total,
             'limit': limit,
             'offset': offset,
+            'nextCursor': next_cursor,
+            'hasMore': has_more,
         })
     except Exception:
         logger.exception("Failed to list mentions for user %s", user_id)
@@ -719,9 +724,7 @@ def update_mention(request, mention_id):
                 mention.is_read = True
 
         mention.save()
-        keyword = Keyword.objects(id=mention.keyword_id, user_id=user_id).first()
-        labels = {mention.keyword_id: keyword.keyword} if keyword else {}
-        return Response(_mention_response(mention, labels))
+        return Response(_mention_response(mention, keyword_cache.labels(user_id)))
     except Exception:
         logger.exception("Failed to update mention %s for user %s", mention_id, user_id)
         return Response(
@@ -752,6 +755,11 @@ def user_notification_settings(request):
             if error:
                 return error
             profile.email_notifications = email_notifications
+        if 'notificationFrequency' in data:
+            frequency, error = parse_notification_frequency(data.get('notificationFrequency'))
+            if error:
+                return error
+            profile.notification_frequency = frequency
 
         profile.save()
         return Response({
@@ -987,3 +995,35 @@ def dodo_webhook(request):
         return Response({'error': 'Processing failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     return Response({'received': True})
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def clerk_webhook(request):
+    """Verify Clerk user webhooks and refresh cached notification emails."""
+    try:
+        event = clerk_user_service.verify_webhook(request.body, request.headers)
+    except Exception:
+        logger.exception("Clerk webhook verification failed")
+        return Response({'error': 'Invalid signature'}, status=status.HTTP_400_BAD_REQUEST)
+
+    event_type = event.get('type')
+    data = event.get('data') or {}
+    user_id = data.get('id')
+    if event_type not in {'user.updated', 'user.deleted'} or not user_id:
+        logger.info("Ignoring Clerk webhook event type=%s", event_type)
+        return Response({'received': True})
+
+    try:
+        # Stamp the change for other processes (the monitor worker) whose
+        # caches this request cannot reach, then refresh our own.
+        UserProfile.objects(user_id=user_id).update(set__email_changed_at=timezone.now())
+        clerk_user_service.invalidate_user_email(user_id)
+        if event_type == 'user.updated':
+            clerk_user_service.email_cache.put(user_id, extract_user_email(data))
+    except Exception:
+        logger.exception("Failed processing Clerk webhook type=%s", event_type)
+        return Response({'error': 'Processing failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    return Response({'received': True})
@@ -3,13 +3,19 @@ import time
 import asyncio
 import aiohttp
 import threading
+from collections import deque
+from functools import partial
 from datetime import datetime, timedelta, timezone as dt_timezone
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+from django.conf import settings
 from django.utils import timezone
-from core.models import Keyword, Mention
+from core.models import Keyword, Mention, MonitorCursor
 from core.enums import Platform, ContentType, MentionContentType
 from core.services.matching_engine import GenericMatchingEngine, MatchResult, MatchContext
-from core.services.email_service import email_notification_service
+from core.services.keyword_automaton import KeywordAutomaton
+from core.services.keyword_sync import KeywordDelta, keyword_id
+from core.services.mention_writer import WRITE_DUPLICATE, WRITE_INSERTED, mention_writer
+from core.services.notification_outbox import notification_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +29,9 @@ class HNConstants:
     POLL_INTERVAL = 60  # seconds between maxitem checks
     MAX_RETRIES = 3
     TIMEOUT = 30  # seconds
+    # The max-item cursor is global, not per user, so it is stored under a sentinel user
+    CURSOR_USER_ID = "__system__"
+    CURSOR_SCOPE = "maxitem"
 
 class HackerNewsService:
     """Service for real-time monitoring HackerNews for keyword mentions using Firebase API"""
@@ -36,6 +45,13 @@ class HackerNewsService:
         self.stream_loop = None
         self.session = None
         self._cycle_mentions = 0
+        # Keyword set and automaton; replaced together on hot reload, read once per poll
+        self.keywords: Dict[str, Any] = {}
+        self.automaton = KeywordAutomaton([])
+        # Item fetches in flight at once; results are still processed in ID order
+        self.fetch_concurrency = max(1, getattr(settings, 'HN_FETCH_CONCURRENCY', 20))
+        # Most items to replay from the saved cursor after a restart
+        self.max_backlog = max(0, getattr(settings, 'HN_MAX_BACKLOG', 5000))
         
     def start_monitoring(self):
         """Start real-time monitoring by setting the start time"""
@@ -49,16 +65,34 @@ class HackerNewsService:
             return
         
         self.is_streaming = True
+        keywords = self.matching_engine.compile_keywords(keywords)
+        self._set_keywords({keyword_id(keyword): keyword for keyword in keywords})
         logger.info("platform=hackernews monitoring started keywords=%s", len(keywords))
         
         # Start streaming in a separate thread
         self.stream_thread = threading.Thread(
             target=self._run_streaming_loop,
-            args=(keywords,),
             daemon=True
         )
         self.stream_thread.start()
     
+    def apply_keyword_delta(self, delta: KeywordDelta):
+        """Swap in a new keyword set; the running loop uses it from its next poll."""
+        if not delta:
+            return
+        compiled = KeywordDelta(
+            added=self.matching_engine.compile_keywords(delta.added),
+            updated=self.matching_engine.compile_keywords(delta.updated),
+            removed_ids=delta.removed_ids,
+        )
+        self._set_keywords(compiled.apply(self.keywords))
+        logger.info("platform=hackernews keywords reloaded %s keywords=%s", delta.summary(), len(self.keywords))
+    
+    def _set_keywords(self, keywords: Dict[str, Any]):
+        automaton = KeywordAutomaton(list(keywords.values()))
+        self.keywords = keywords
+        self.automaton = automaton
+    
     def stop_real_time_streaming(self):
         """Stop real-time streaming.
 
@@ -79,14 +113,14 @@ class HackerNewsService:
         self.stream_loop = None
         self.session = None
 
-    def _run_streaming_loop(self, keywords: List[Keyword]):
+    def _run_streaming_loop(self):
         """Run the async streaming loop in a separate thread"""
         loop = None
         try:
             loop = asyncio.new_event_loop()
             self.stream_loop = loop
             asyncio.set_event_loop(loop)
-            loop.run_until_complete(self._stream_hackernews_items(keywords))
+            loop.run_until_complete(self._stream_hackernews_items())
         except Exception as e:
             logger.error("platform=hackernews streaming loop failed: %s", e)
         finally:
@@ -102,14 +136,18 @@ class HackerNewsService:
                 self.stream_loop = None
             self.is_streaming = False
 
-    async def _stream_hackernews_items(self, keywords: List[Keyword]):
+    async def _stream_hackernews_items(self):
         """Stream all new HackerNews items and filter for keywords"""
         try:
-            from aiohttp import ClientTimeout
-            self.session = aiohttp.ClientSession(timeout=ClientTimeout(total=HNConstants.TIMEOUT))
+            from aiohttp import ClientTimeout, TCPConnector
+            self.session = aiohttp.ClientSession(
+                timeout=ClientTimeout(total=HNConstants.TIMEOUT),
+                connector=TCPConnector(limit=self.fetch_concurrency),
+            )
             
-            # Get current max item ID
+            # Get current max item ID, then replay whatever arrived since the last run
             self.current_max_item = await self._fetch_max_item()
+            await self._catch_up(self.automaton)
             logger.debug("platform=hackernews streaming from item_id=%s", self.current_max_item)
             
             while self.is_streaming:
@@ -125,17 +163,12 @@ class HackerNewsService:
                         self._cycle_mentions = 0
                         
                         # Process all new items
-                        for item_id in range(self.current_max_item + 1, new_max_item + 1):
-                            if not self.is_streaming:
-                                break
-                            
-                            item = await self._fetch_item(item_id)
-                            if item:
-                                await self._process_item(item, keywords)
-                        
-                        self.current_max_item = new_max_item
+                        self.current_max_item = await self._fetch_and_process_range(
+                            self.current_max_item + 1, new_max_item, self.automaton
+                        )
+                        self._save_cursor(self.current_max_item)
                         logger.info(
-                            "platform=hackernews poll completed items=%s mentions=%s duration_ms=%.0f",
+                            "platform=hackernews poll completed items=%s mentions_queued=%s duration_ms=%.0f",
                             new_items_count, self._cycle_mentions, (time.time() - started) * 1000,
                         )
                     else:
@@ -151,6 +184,111 @@ class HackerNewsService:
         except Exception as e:
             logger.error("platform=hackernews streaming setup failed: %s", e)
         # Session closed by _run_streaming_loop finally (owns the loop lifecycle).
+
+    async def _fetch_and_process_range(self, first_id: int, last_id: int, automaton: KeywordAutomaton) -> int:
+        """
+        Fetch items first_id..last_id concurrently and process them in ID order.
+        Returns the last ID processed, which is lower than last_id if streaming stopped.
+
+        A semaphore caps requests in flight at fetch_concurrency, and at most
+        twice that many fetches are scheduled ahead of the item being
+        processed, so a large burst does not create thousands of tasks.
+        """
+        semaphore = asyncio.Semaphore(self.fetch_concurrency)
+        window = self.fetch_concurrency * 2
+        pending = deque()
+
+        async def fetch(item_id: int):
+            async with semaphore:
+                return await self._fetch_item(item_id)
+
+        next_id = first_id
+        processed_id = first_id - 1
+        try:
+            while self.is_streaming and (pending or next_id <= last_id):
+                while next_id <= last_id and len(pending) < window:
+                    pending.append(asyncio.ensure_future(fetch(next_id)))
+                    next_id += 1
+                item = await pending.popleft()
+                if item:
+                    await self._process_item(item, automaton)
+                processed_id += 1
+        finally:
+            for task in pending:
+                task.cancel()
+        return processed_id
+
+    def _catch_up_range(self, cursor: Optional[int], max_item: int) -> Optional[Tuple[int, int]]:
+        """Item IDs to replay after a restart, capped at max_backlog; None when nothing to do."""
+        if cursor is None or not max_item or cursor >= max_item or not self.max_backlog:
+            return None
+        first_id = max(cursor + 1, max_item - self.max_backlog + 1)
+        return first_id, max_item
+
+    async def _catch_up(self, automaton: KeywordAutomaton):
+        """Process items posted between the saved cursor and the current max item."""
+        cursor = self._load_cursor()
+        if cursor is not None and not self.current_max_item:
+            # maxitem is unavailable right now; resume from the cursor on the next poll
+            self.current_max_item = cursor
+            self.monitoring_start_time = 0
+            return
+        catch_up = self._catch_up_range(cursor, self.current_max_item)
+        if catch_up is None:
+            if self.current_max_item:
+                self._save_cursor(self.current_max_item)
+            return
+
+        first_id, last_id = catch_up
+        skipped = first_id - cursor - 1
+        if skipped:
+            logger.warning(
+                "platform=hackernews backlog exceeds max=%s, skipping items=%s", self.max_backlog, skipped,
+            )
+        # Items after the cursor are newer than the last run, so the start-time filter must not drop them
+        self.monitoring_start_time = 0
+        started = time.time()
+        self._cycle_mentions = 0
+        self.current_max_item = await self._fetch_and_process_range(first_id, last_id, automaton)
+        self._save_cursor(self.current_max_item)
+        logger.info(
+            "platform=hackernews catch-up completed from=%s to=%s items=%s mentions_queued=%s duration_ms=%.0f",
+            first_id, self.current_max_item, self.current_max_item - first_id + 1,
+            self._cycle_mentions, (time.time() - started) * 1000,
+        )
+
+    def _load_cursor(self) -> Optional[int]:
+        try:
+            item = MonitorCursor.objects(
+                user_id=HNConstants.CURSOR_USER_ID,
+                platform=Platform.HACKERNEWS.value,
+                scope=HNConstants.CURSOR_SCOPE,
+            ).first()
+            return int(item.cursor) if item else None
+        except Exception as e:
+            logger.warning("platform=hackernews cursor load failed: %s", e)
+            return None
+
+    def _save_cursor(self, item_id: int) -> None:
+        try:
+            item = MonitorCursor.objects(
+                user_id=HNConstants.CURSOR_USER_ID,
+                platform=Platform.HACKERNEWS.value,
+                scope=HNConstants.CURSOR_SCOPE,
+            ).first()
+            if not item:
+                item = MonitorCursor(
+                    user_id=HNConstants.CURSOR_USER_ID,
+                    platform=Platform.HACKERNEWS.value,
+                    scope=HNConstants.CURSOR_SCOPE,
+                    cursor=str(item_id),
+                )
+            else:
+                item.cursor = str(item_id)
+            item.save()
+        except Exception as e:
+            logger.warning("platform=hackernews cursor save failed: %s", e)
+
     async def _fetch_max_item(self) -> int:
         """Fetch the current maximum item ID"""
         try:
@@ -195,7 +333,7 @@ class HackerNewsService:
             logger.error("platform=hackernews item id=%s request failed: %s", item_id, e)
             return None
     
-    async def _process_item(self, item: Dict[str, Any], keywords: List[Keyword]):
+    async def _process_item(self, item: Dict[str, Any], automaton: KeywordAutomaton):
         """Process a single HackerNews item and check for keyword matches"""
         try:
             item_type = item.get("type")
@@ -210,16 +348,16 @@ class HackerNewsService:
             logger.debug("platform=hackernews processing id=%s type=%s", item_id, item_type)
             
             if item_type == "story":
-                await self._process_story(item, keywords)
+                await self._process_story(item, automaton)
             elif item_type == "comment":
-                await self._process_comment(item, keywords)
+                await self._process_comment(item, automaton)
             else:
                 logger.debug("platform=hackernews unknown item type=%s id=%s", item_type, item_id)
                 
         except Exception as e:
             logger.error("platform=hackernews processing id=%s failed: %s", item.get('id'), e)
     
-    async def _process_story(self, story: Dict[str, Any], keywords: List[Keyword]):
+    async def _process_story(self, story: Dict[str, Any], automaton: KeywordAutomaton):
         """Process a story and check for keyword matches"""
         story_id = story.get("id")
         story_title = story.get("title", "")
@@ -228,34 +366,30 @@ class HackerNewsService:
         
         logger.debug("platform=hackernews story id=%s author=%s", story_id, story_author)
         
-        for keyword in keywords:
+        # Check title
+        context = MatchContext(author=story_author)
+        for keyword, match_result in self.matching_engine.match_batch(
+            story_title, ContentType.TITLES.value, context, automaton
+        ):
             if not self._should_process_keyword(keyword, ContentType.TITLES.value):
                 continue
-            
-            # Check title
+            mention = self._create_mention_from_story(keyword, story, match_result, MentionContentType.TITLE.value)
+            if mention:
+                await self._save_mention(mention, keyword)
+        
+        # Check URL/body for keywords that monitor body content
+        if story_url:
             context = MatchContext(author=story_author)
-            match_result = self.matching_engine.should_create_mention(
-                keyword, story_title, ContentType.TITLES.value, context
-            )
-            
-            if match_result:
-                mention = self._create_mention_from_story(keyword, story, match_result, MentionContentType.TITLE.value)
+            for keyword, match_result in self.matching_engine.match_batch(
+                story_url, ContentType.BODY.value, context, automaton
+            ):
+                if not self._should_process_keyword(keyword, ContentType.BODY.value):
+                    continue
+                mention = self._create_mention_from_story(keyword, story, match_result, MentionContentType.BODY.value)
                 if mention:
                     await self._save_mention(mention, keyword)
-            
-            # Check URL/body if keyword monitors body content
-            if self._should_process_keyword(keyword, ContentType.BODY.value):
-                if story_url:
-                    context = MatchContext(author=story_author)
-                    match_result = self.matching_engine.should_create_mention(
-                        keyword, story_url, ContentType.BODY.value, context
-                    )
-                    if match_result:
-                        mention = self._create_mention_from_story(keyword, story, match_result, MentionContentType.BODY.value)
-                        if mention:
-                            await self._save_mention(mention, keyword)
     
-    async def _process_comment(self, comment: Dict[str, Any], keywords: List[Keyword]):
+    async def _process_comment(self, comment: Dict[str, Any], automaton: KeywordAutomaton):
         """Process a comment and check for keyword matches"""
         comment_id = comment.get("id")
         comment_text = comment.get("text", "")
@@ -264,18 +398,15 @@ class HackerNewsService:
         
         logger.debug("platform=hackernews comment id=%s author=%s parent=%s", comment_id, comment_author, comment_parent)
         
-        for keyword in keywords:
+        context = MatchContext(author=comment_author)
+        for keyword, match_result in self.matching_engine.match_batch(
+            comment_text, ContentType.COMMENTS.value, context, automaton
+        ):
             if not self._should_process_keyword(keyword, ContentType.COMMENTS.value):
                 continue
-            context = MatchContext(author=comment_author)
-            match_result = self.matching_engine.should_create_mention(
-                keyword, comment_text, ContentType.COMMENTS.value, context
-            )
-            
-            if match_result:
-                mention = self._create_mention_from_comment(keyword, comment, match_result)
-                if mention:
-                    await self._save_mention(mention, keyword)
+            mention = self._create_mention_from_comment(keyword, comment, match_result)
+            if mention:
+                await self._save_mention(mention, keyword)
     
     def _should_process_keyword(self, keyword: Keyword, content_type: str) -> bool:
         """Check if keyword should process this content type"""
@@ -283,35 +414,33 @@ class HackerNewsService:
                 self.matching_engine.should_monitor_content(keyword, content_type))
     
     async def _save_mention(self, mention: Mention, keyword: Keyword, content_type: str = ""):
-        """Save mention and send notification"""
-        try:
-            mention.save()
-            self._cycle_mentions += 1
-            logger.info(
-                "platform=hackernews mention created keyword='%s' type=%s id=%s",
-                keyword.keyword, content_type or mention.content_type, mention.id,
-            )
-            
-            # Send email notification
-            success = email_notification_service.send_mention_notification(mention)
-            if not success:
-                logger.error("platform=hackernews email failed mention=%s", mention.id)
-                
-        except Exception as e:
-            logger.error("platform=hackernews mention save failed: %s", e)
+        """Queue mention for the batched writer; the notification follows the insert"""
+        # Never wait for buffer space here: that would stall every fetch on the event loop
+        if not mention_writer.submit(mention, partial(self._on_mention_written, keyword, content_type), block=False):
+            logger.error("platform=hackernews mention dropped, writer buffer full url=%s", mention.source_url)
+            return
+        # Counted here, on the poll's own thread: write callbacks land after the poll is logged
+        self._cycle_mentions += 1
+
+    def _on_mention_written(self, keyword: Keyword, content_type: str, mention: Mention, status: str):
+        """Writer callback: log and notify for newly inserted mentions"""
+        if status == WRITE_DUPLICATE:
+            logger.debug("platform=hackernews duplicate mention skipped url=%s", mention.source_url)
+            return
+        if status != WRITE_INSERTED:
+            logger.error("platform=hackernews mention save failed url=%s", mention.source_url)
+            return
+        logger.info(
+            "platform=hackernews mention created keyword='%s' type=%s id=%s",
+            keyword.keyword, content_type or mention.content_type, mention.id,
+        )
+
+        # Delivered by the outbox workers, off the monitoring threads
+        notification_outbox.enqueue_mention(mention)
     
     def _create_mention_from_story(self, keyword: Keyword, story: Dict[str, Any], match_result: MatchResult, content_type: str) -> Optional[Mention]:
         """Create a Mention object from a HackerNews story"""
         try:
-            # Check for duplicates
-            existing_mention = Mention.objects.filter(
-                source_url=f"{HNConstants.HN_BASE_URL}/item?id={story['id']}",
-                keyword_id=str(keyword.id)
-            ).first()
-            
-            if existing_mention:
-                return None
-            
             # Create new mention
             mention = Mention(
                 keyword_id=str(keyword.id),
@@ -344,15 +473,6 @@ class HackerNewsService:
     def _create_mention_from_comment(self, keyword: Keyword, comment: Dict[str, Any], match_result: MatchResult) -> Optional[Mention]:
         """Create a Mention object from a HackerNews comment"""
         try:
-            # Check for duplicates
-            existing_mention = Mention.objects.filter(
-                source_url=f"{HNConstants.HN_BASE_URL}/item?id={comment['id']}",
-                keyword_id=str(keyword.id)
-            ).first()
-            
-            if existing_mention:
-                return None
-            
             # Create new mention
             mention = Mention(
                 keyword_id=str(keyword.id),
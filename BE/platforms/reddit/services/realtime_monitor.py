@@ -2,19 +2,144 @@ import os
 import logging
 import threading
 import time
+from functools import partial
 from datetime import datetime, timezone as dt_timezone
 from typing import List, Dict, Optional
 import praw
 from praw.models import Subreddit
+from django.conf import settings
 from django.utils import timezone
 from .reddit_service import RedditService
 from core.services.matching_engine import GenericMatchingEngine, MatchResult, MatchContext
-from core.services.email_service import email_notification_service
+from core.services.keyword_automaton import KeywordAutomaton
+from core.services.keyword_sync import KeywordDelta, keyword_id
+from core.services.mention_writer import WRITE_DUPLICATE, WRITE_INSERTED, mention_writer
+from core.services.notification_outbox import notification_outbox
+from core.services.work_queue import BoundedWorkQueue
 from core.models import Keyword, Mention
 from core.enums import Platform, ContentType, MentionContentType
 
 logger = logging.getLogger(__name__)
 
+ALL_SUBREDDITS = 'all'
+
+# How subreddit filters become PRAW streams:
+#   per_subreddit - one stream pair per subreddit (original behaviour)
+#   multireddit   - subreddits combined into "a+b+c" streams of REDDIT_MULTIREDDIT_SIZE
+#   all           - a single r/all stream, routed locally by subreddit name
+STREAM_MODE_PER_SUBREDDIT = 'per_subreddit'
+STREAM_MODE_MULTIREDDIT = 'multireddit'
+STREAM_MODE_ALL = 'all'
+STREAM_MODES = (STREAM_MODE_PER_SUBREDDIT, STREAM_MODE_MULTIREDDIT, STREAM_MODE_ALL)
+
+ITEM_SUBMISSION = 'submission'
+ITEM_COMMENT = 'comment'
+
+# Wait between quiet stream polls, doubling while nothing new arrives
+# (PRAW's own stream backoff is bypassed by pause_after)
+IDLE_POLL_MIN_SECONDS = 1
+IDLE_POLL_MAX_SECONDS = 16
+
+
+def normalize_subreddit_name(name: str) -> str:
+    """'r/Python', '/r/python' and 'Python' all map to 'python'."""
+    return (name or '').strip().lower().removeprefix('/').removeprefix('r/').strip('/')
+
+
+class SubredditKeywordIndex:
+    """
+    Plans the PRAW streams for a keyword set and routes stream items back to
+    keywords by subreddit name.
+
+    Keywords without subreddit filters (or filtered on r/all) are wildcards and
+    are served by an r/all stream. In 'all' mode that one stream also carries
+    the filtered keywords, routed locally; otherwise filtered subreddits get
+    their own (or combined multireddit) streams, as before.
+    Automata are built once per subreddit group.
+
+    previous_streams (the plan being replaced on a hot reload) keeps existing
+    multireddit groupings where possible, so a keyword change only alters the
+    streams whose subreddits actually changed.
+    """
+
+    def __init__(
+        self,
+        keywords,
+        mode: str = STREAM_MODE_MULTIREDDIT,
+        multireddit_size: int = 100,
+        previous_streams: Optional[List[str]] = None,
+    ):
+        self.mode = mode
+        self.subreddit_keywords: Dict[str, List] = {}
+        self.wildcard_keywords: List = []
+
+        for keyword in keywords:
+            if keyword.platform not in [Platform.REDDIT.value, Platform.ALL.value]:
+                continue
+            names = {normalize_subreddit_name(name) for name in (keyword.platform_specific_filters or [])}
+            names.discard('')
+            if not names or ALL_SUBREDDITS in names:
+                self.wildcard_keywords.append(keyword)
+                continue
+            for name in sorted(names):
+                self.subreddit_keywords.setdefault(name, []).append(keyword)
+
+        self._empty_automaton = KeywordAutomaton([])
+        self._wildcard_automaton = KeywordAutomaton(self.wildcard_keywords)
+        if mode == STREAM_MODE_ALL:
+            # r/all delivers filtered subreddits too, so their automata include wildcards
+            self._automata: Dict[str, KeywordAutomaton] = {
+                name: KeywordAutomaton(group + self.wildcard_keywords)
+                for name, group in self.subreddit_keywords.items()
+            }
+        else:
+            self._automata = {
+                name: KeywordAutomaton(group) for name, group in self.subreddit_keywords.items()
+            }
+        self.streams = self._plan_streams(max(1, multireddit_size), previous_streams or [])
+
+    @property
+    def subreddits(self) -> List[str]:
+        return sorted(self.subreddit_keywords)
+
+    def _plan_streams(self, multireddit_size: int, previous_streams: List[str]) -> List[str]:
+        names = self.subreddits
+        if self.mode == STREAM_MODE_ALL:
+            return [ALL_SUBREDDITS] if names or self.wildcard_keywords else []
+
+        streams = [ALL_SUBREDDITS] if self.wildcard_keywords else []
+        if self.mode == STREAM_MODE_PER_SUBREDDIT:
+            return streams + names
+
+        # Keep previous groupings (minus removed subreddits), then top up the
+        # last partial group and open new groups for the rest.
+        remaining = set(names)
+        groups: List[List[str]] = []
+        for stream in previous_streams:
+            if stream == ALL_SUBREDDITS:
+                continue
+            members = [name for name in stream.split('+') if name in remaining]
+            if members:
+                groups.append(members)
+                remaining.difference_update(members)
+        added = sorted(remaining)
+        if groups and added and len(groups[-1]) < multireddit_size:
+            room = multireddit_size - len(groups[-1])
+            groups[-1].extend(added[:room])
+            added = added[room:]
+        groups.extend(added[i:i + multireddit_size] for i in range(0, len(added), multireddit_size))
+        return streams + ['+'.join(group) for group in groups]
+
+    def automaton_for(self, stream_name: str, subreddit_name: str) -> KeywordAutomaton:
+        """Automaton over the keywords an item from subreddit_name on stream_name is checked against."""
+        name = normalize_subreddit_name(subreddit_name)
+        if stream_name == ALL_SUBREDDITS:
+            if self.mode == STREAM_MODE_ALL:
+                return self._automata.get(name, self._wildcard_automaton)
+            return self._wildcard_automaton
+        return self._automata.get(name, self._empty_automaton)
+
+
 class RealtimeStreamMonitor:
     """Manages real-time monitoring of Reddit streams for keyword mentions"""
     
@@ -24,6 +149,18 @@ class RealtimeStreamMonitor:
         self.monitoring_threads = []
         self.matching_engine = GenericMatchingEngine()
         self.monitoring_start_time = None
+        self.stream_mode = getattr(settings, 'REDDIT_STREAM_MODE', STREAM_MODE_MULTIREDDIT)
+        if self.stream_mode not in STREAM_MODES:
+            logger.warning("platform=reddit unknown stream mode %r, using %s", self.stream_mode, STREAM_MODE_MULTIREDDIT)
+            self.stream_mode = STREAM_MODE_MULTIREDDIT
+        self.multireddit_size = getattr(settings, 'REDDIT_MULTIREDDIT_SIZE', 100)
+        # Stream threads only enqueue; matching, saving and email run on the queue workers
+        self.work_queue: Optional[BoundedWorkQueue] = None
+        # Current keyword set and its index; swapped as a whole on hot reload
+        self.keywords: Dict[str, object] = {}
+        self.index: Optional[SubredditKeywordIndex] = None
+        self._stream_stops: Dict[str, threading.Event] = {}
+        self._reload_lock = threading.Lock()
     
     def start_stream_monitoring(self, keywords=None):
         """Start monitoring Reddit streams for keyword mentions"""
@@ -48,26 +185,20 @@ class RealtimeStreamMonitor:
                 logger.debug("platform=reddit no active keywords to monitor")
                 return
             
-            # Group keywords by subreddit
-            subreddit_keywords = self._group_keywords_by_subreddit(keywords)
+            # Compile once; every stream thread reuses these for each item
+            keywords = self.matching_engine.compile_keywords(keywords)
             
-            # Start monitoring each subreddit
-            for subreddit_name, keywords_list in subreddit_keywords.items():
-                if self.stop_monitoring:
-                    break
-                
-                thread = threading.Thread(
-                    target=self._monitor_subreddit_stream,
-                    args=(subreddit_name, keywords_list),
-                    daemon=True
-                )
-                thread.start()
-                self.monitoring_threads.append(thread)
-                logger.debug("platform=reddit monitoring r/%s keywords=%s", subreddit_name, len(keywords_list))
+            self._start_work_queue()
+            
+            # Route items to keywords by subreddit and open as few streams as the mode allows
+            with self._reload_lock:
+                self.keywords = {keyword_id(keyword): keyword for keyword in keywords}
+                self._sync_streams()
             
             logger.info(
-                "platform=reddit monitoring started subreddits=%s keywords=%s",
-                len(subreddit_keywords), len(keywords),
+                "platform=reddit monitoring started mode=%s streams=%s subreddits=%s wildcard_keywords=%s keywords=%s",
+                self.stream_mode, len(self.index.streams), len(self.index.subreddits),
+                len(self.index.wildcard_keywords), len(keywords),
             )
             
         except Exception as e:
@@ -76,44 +207,113 @@ class RealtimeStreamMonitor:
     def stop_stream_monitoring(self):
         """Stop all monitoring threads"""
         self.stop_monitoring = True
+        with self._reload_lock:
+            for stop_event in self._stream_stops.values():
+                stop_event.set()
+            self._stream_stops.clear()
+            self.keywords = {}
+            self.index = None
         
         # Wait for threads to finish
         for thread in self.monitoring_threads:
             thread.join(timeout=5)
         
         self.monitoring_threads.clear()
+        if self.work_queue:
+            self.work_queue.stop()
+            self.work_queue = None
         logger.info("platform=reddit monitoring stopped")
     
-    def _group_keywords_by_subreddit(self, keywords):
-        """Group keywords by subreddit for efficient monitoring"""
-        subreddit_keywords = {}
-        
-        for keyword in keywords:
-            if keyword.platform in [Platform.REDDIT.value, Platform.ALL.value]:
-                # Get subreddit filters for this keyword
-                subreddits = keyword.platform_specific_filters if keyword.platform_specific_filters else ['all']
-                
-                for subreddit in subreddits:
-                    if subreddit not in subreddit_keywords:
-                        subreddit_keywords[subreddit] = []
-                    subreddit_keywords[subreddit].append(keyword)
-        
-        return subreddit_keywords
+    @property
+    def is_monitoring(self) -> bool:
+        return bool(self._stream_stops) and not self.stop_monitoring
+    
+    def apply_keyword_delta(self, delta: KeywordDelta):
+        """
+        Swap in a new keyword set while streams keep running.
+
+        Only streams whose subreddits changed are started or stopped; the rest
+        pick up the new index on their next item.
+        """
+        if not delta:
+            return
+        compiled = KeywordDelta(
+            added=self.matching_engine.compile_keywords(delta.added),
+            updated=self.matching_engine.compile_keywords(delta.updated),
+            removed_ids=delta.removed_ids,
+        )
+        with self._reload_lock:
+            self.keywords = compiled.apply(self.keywords)
+            started, stopped = self._sync_streams()
+        logger.info(
+            "platform=reddit keywords reloaded %s keywords=%s streams_started=%s streams_stopped=%s",
+            delta.summary(), len(self.keywords), len(started), len(stopped),
+        )
+    
+    def _sync_streams(self):
+        """Rebuild the index from self.keywords and start/stop streams to match it. Caller holds _reload_lock."""
+        previous = self.index.streams if self.index else []
+        index = SubredditKeywordIndex(
+            list(self.keywords.values()), self.stream_mode, self.multireddit_size, previous_streams=previous,
+        )
+        # Publish the index before starting streams so new threads route with it
+        self.index = index
+        wanted = set(index.streams)
+        stopped = [name for name in self._stream_stops if name not in wanted]
+        for name in stopped:
+            self._stream_stops.pop(name).set()
+            logger.debug("platform=reddit stream stopped r/%s", name)
+        started = [name for name in index.streams if name not in self._stream_stops]
+        for name in started:
+            if self.stop_monitoring:
+                break
+            stop_event = threading.Event()
+            self._stream_stops[name] = stop_event
+            self._start_stream_threads(name, stop_event)
+            logger.debug("platform=reddit monitoring r/%s", name)
+        self.monitoring_threads = [thread for thread in self.monitoring_threads if thread.is_alive()]
+        return started, stopped
     
-    def _monitor_subreddit_stream(self, subreddit_name, keywords):
-        """Monitor a specific subreddit for mentions"""
+    def _start_work_queue(self):
+        if self.work_queue:
+            return
+        self.work_queue = BoundedWorkQueue(
+            name="reddit",
+            handler=self._process_stream_item,
+            maxsize=getattr(settings, 'REDDIT_QUEUE_SIZE', 1000),
+            workers=getattr(settings, 'REDDIT_MATCH_WORKERS', 4),
+            put_timeout=getattr(settings, 'REDDIT_QUEUE_PUT_TIMEOUT', 5.0),
+        )
+        self.work_queue.start()
+    
+    def queue_metrics(self) -> Dict[str, int]:
+        """Depth and throughput counters of the stream work queue."""
+        return self.work_queue.metrics() if self.work_queue else {}
+    
+    def _enqueue(self, kind: str, item, automaton: KeywordAutomaton):
+        if self.work_queue:
+            self.work_queue.submit((kind, item, automaton))
+        else:
+            self._process_stream_item((kind, item, automaton))
+    
+    def _process_stream_item(self, work_item):
+        kind, item, automaton = work_item
+        if kind == ITEM_SUBMISSION:
+            self._check_submission_for_keywords(item, automaton)
+        else:
+            self._check_comment_for_keywords(item, automaton)
+    
+    def _start_stream_threads(self, stream_name: str, stop_event: threading.Event):
+        """Start the submissions and comments threads for one (multi)subreddit stream"""
         try:
-            subreddit = self.reddit.subreddit(subreddit_name)
-            
-            # Start both submissions and comments monitoring in separate threads
             submissions_thread = threading.Thread(
                 target=self._monitor_submissions_stream,
-                args=(subreddit, keywords),
+                args=(stream_name, stop_event),
                 daemon=True
             )
             comments_thread = threading.Thread(
                 target=self._monitor_comments_stream,
-                args=(subreddit, keywords),
+                args=(stream_name, stop_event),
                 daemon=True
             )
             
@@ -121,79 +321,97 @@ class RealtimeStreamMonitor:
             comments_thread.start()
 
             self.monitoring_threads.extend([submissions_thread, comments_thread])
-
-            logger.debug("platform=reddit streams started r/%s keywords=%s", subreddit_name, len(keywords))
         except Exception as e:
-            logger.error("platform=reddit monitor r/%s failed: %s", subreddit_name, e)
+            logger.error("platform=reddit monitor r/%s failed: %s", stream_name, e)
     
-    def _monitor_submissions_stream(self, subreddit, keywords):
+    def _monitor_submissions_stream(self, stream_name: str, stop_event: threading.Event):
         """Monitor submissions stream for mentions (reconnects after errors / rate limits)."""
         backoff_secs = 30
         max_backoff_secs = 600
-        while not self.stop_monitoring:
+        while not self.stop_monitoring and not stop_event.is_set():
             try:
                 # Refresh client in case a prior 429 left it in a bad state
                 if not self.reddit:
                     self._rotate_reddit_client()
-                live_subreddit = self.reddit.subreddit(subreddit.display_name)
-                logger.debug(
-                    "platform=reddit submissions stream r/%s skip_existing=True",
-                    live_subreddit.display_name,
-                )
+                live_subreddit = self.reddit.subreddit(stream_name)
+                logger.debug("platform=reddit submissions stream r/%s skip_existing=True", stream_name)
 
-                for submission in live_subreddit.stream.submissions(skip_existing=True):
-                    if self.stop_monitoring:
+                # pause_after=0 yields None on quiet polls so a stopped stream exits promptly
+                idle_secs = IDLE_POLL_MIN_SECONDS
+                for submission in live_subreddit.stream.submissions(skip_existing=True, pause_after=0):
+                    if self.stop_monitoring or stop_event.is_set():
                         break
-                    self._check_submission_for_keywords(submission, keywords)
+                    if submission is None:
+                        stop_event.wait(idle_secs)
+                        idle_secs = min(idle_secs * 2, IDLE_POLL_MAX_SECONDS)
+                        continue
+                    idle_secs = IDLE_POLL_MIN_SECONDS
+                    index = self.index
+                    if index is None:
+                        continue
+                    automaton = index.automaton_for(stream_name, submission.subreddit.display_name)
+                    if automaton:
+                        self._enqueue(ITEM_SUBMISSION, submission, automaton)
                     backoff_secs = 30
 
             except Exception as e:
-                logger.error("platform=reddit submissions stream r/%s failed: %s", subreddit.display_name, e)
+                logger.error("platform=reddit submissions stream r/%s failed: %s", stream_name, e)
                 self._rotate_reddit_client()
-                if self.stop_monitoring:
+                if self.stop_monitoring or stop_event.is_set():
                     break
                 logger.warning(
-                    "platform=reddit submissions stream r/%s reconnect in %ss", subreddit.display_name, backoff_secs
+                    "platform=reddit submissions stream r/%s reconnect in %ss", stream_name, backoff_secs
                 )
-                time.sleep(backoff_secs)
+                stop_event.wait(backoff_secs)
                 backoff_secs = min(backoff_secs * 2, max_backoff_secs)
 
-    def _monitor_comments_stream(self, subreddit, keywords):
+    def _monitor_comments_stream(self, stream_name: str, stop_event: threading.Event):
         """Monitor comments stream for mentions (reconnects after errors / rate limits)."""
         backoff_secs = 30
         max_backoff_secs = 600
-        while not self.stop_monitoring:
+        while not self.stop_monitoring and not stop_event.is_set():
             try:
                 if not self.reddit:
                     self._rotate_reddit_client()
-                live_subreddit = self.reddit.subreddit(subreddit.display_name)
-                logger.debug(
-                    "platform=reddit comments stream r/%s skip_existing=True",
-                    live_subreddit.display_name,
-                )
+                live_subreddit = self.reddit.subreddit(stream_name)
+                logger.debug("platform=reddit comments stream r/%s skip_existing=True", stream_name)
 
-                for comment in live_subreddit.stream.comments(skip_existing=True):
-                    if self.stop_monitoring:
+                # pause_after=0 yields None on quiet polls so a stopped stream exits promptly
+                idle_secs = IDLE_POLL_MIN_SECONDS
+                for comment in live_subreddit.stream.comments(skip_existing=True, pause_after=0):
+                    if self.stop_monitoring or stop_event.is_set():
                         break
-                    self._check_comment_for_keywords(comment, keywords)
+                    if comment is None:
+                        stop_event.wait(idle_secs)
+                        idle_secs = min(idle_secs * 2, IDLE_POLL_MAX_SECONDS)
+                        continue
+                    idle_secs = IDLE_POLL_MIN_SECONDS
+                    index = self.index
+                    if index is None:
+                        continue
+                    automaton = index.automaton_for(stream_name, comment.subreddit.display_name)
+                    if automaton:
+                        self._enqueue(ITEM_COMMENT, comment, automaton)
                     backoff_secs = 30
 
             except Exception as e:
-                logger.error("platform=reddit comments stream r/%s failed: %s", subreddit.display_name, e)
+                logger.error("platform=reddit comments stream r/%s failed: %s", stream_name, e)
                 self._rotate_reddit_client()
-                if self.stop_monitoring:
+                if self.stop_monitoring or stop_event.is_set():
                     break
                 logger.warning(
-                    "platform=reddit comments stream r/%s reconnect in %ss", subreddit.display_name, backoff_secs
+                    "platform=reddit comments stream r/%s reconnect in %ss", stream_name, backoff_secs
                 )
-                time.sleep(backoff_secs)
+                stop_event.wait(backoff_secs)
                 backoff_secs = min(backoff_secs * 2, max_backoff_secs)
  
-    def _check_submission_for_keywords(self, submission, keywords):
+    def _check_submission_for_keywords(self, submission, automaton: KeywordAutomaton):
         """Check if a submission matches any keywords"""
         try:
             # Check each content type that keywords might be monitoring
             content_types_to_check = [ContentType.TITLES.value, ContentType.BODY.value]
+            author = str(submission.author) if submission.author else ''
+            subreddit_name = submission.subreddit.display_name
             
             for content_type in content_types_to_check:
                 # Extract content based on type
@@ -202,99 +420,72 @@ class RealtimeStreamMonitor:
                 elif content_type == ContentType.BODY.value:
                     content = submission.selftext or ""
                 
-                # Check each keyword against this content
-                for keyword in keywords:
-                    context = MatchContext(
-                        author=str(submission.author) if submission.author else '',
-                        subreddit=submission.subreddit.display_name,
-                    )
-                    match_result = self.matching_engine.should_create_mention(
-                        keyword, content, content_type, context
-                    )
+                context = MatchContext(author=author, subreddit=subreddit_name)
+                matches = self.matching_engine.match_batch(content, content_type, context, automaton)
+                
+                for keyword, match_result in matches:
+                    # Determine mention content type
+                    mention_content_type = self._map_content_type_to_mention_type(content_type)
                     
-                    if match_result:
-                        # Determine mention content type
-                        mention_content_type = self._map_content_type_to_mention_type(content_type)
-                        
-                        mention = self._create_mention_from_submission(
-                            keyword, submission, match_result, mention_content_type
-                        )
-                        if mention:
-                            try:
-                                mention.save()
-                                logger.info(
-                                    "platform=reddit mention created keyword='%s' type=%s subreddit=r/%s",
-                                    keyword.keyword, mention_content_type, submission.subreddit.display_name,
-                                )
-                                
-                                # Send email notification
-                                self._send_email_notification(mention, keyword)
-                                
-                            except Exception as e:
-                                logger.error("platform=reddit mention save failed: %s", e)
+                    mention = self._create_mention_from_submission(
+                        keyword, submission, match_result, mention_content_type
+                    )
+                    if mention:
+                        self._save_mention(mention, keyword)
         
         except Exception as e:
             logger.error("platform=reddit submission check failed: %s", e)
     
-    def _check_comment_for_keywords(self, comment, keywords):
+    def _check_comment_for_keywords(self, comment, automaton: KeywordAutomaton):
         """Check if a comment matches any keywords"""
         try:
             # Check comments content type
             content = comment.body
+            context = MatchContext(
+                author=str(comment.author) if comment.author else '',
+                subreddit=comment.subreddit.display_name,
+            )
+            matches = self.matching_engine.match_batch(
+                content, ContentType.COMMENTS.value, context, automaton
+            )
             
-            for keyword in keywords:
-                context = MatchContext(
-                    author=str(comment.author) if comment.author else '',
-                    subreddit=comment.subreddit.display_name,
-                )
-                match_result = self.matching_engine.should_create_mention(
-                    keyword, content, ContentType.COMMENTS.value, context
-                )
-                
-                if match_result:
-                    mention = self._create_mention_from_comment(keyword, comment, match_result)
-                    if mention:
-                        try:
-                            mention.save()
-                            logger.info(
-                                "platform=reddit mention created keyword='%s' type=comment subreddit=r/%s",
-                                keyword.keyword, comment.subreddit.display_name,
-                            )
-                            
-                            # Send email notification
-                            self._send_email_notification(mention, keyword)
-                            
-                        except Exception as e:
-                            logger.error("platform=reddit mention save failed: %s", e)
+            for keyword, match_result in matches:
+                mention = self._create_mention_from_comment(keyword, comment, match_result)
+                if mention:
+                    self._save_mention(mention, keyword)
         
         except Exception as e:
             logger.error("platform=reddit comment check failed: %s", e)
     
+    def _save_mention(self, mention, keyword):
+        """Queue mention for the batched writer; the notification follows the insert"""
+        if not mention_writer.submit(mention, partial(self._on_mention_written, keyword)):
+            logger.error("platform=reddit mention dropped, writer buffer full url=%s", mention.source_url)
+
+    def _on_mention_written(self, keyword, mention, status):
+        """Writer callback: log and notify for newly inserted mentions"""
+        if status == WRITE_DUPLICATE:
+            logger.debug("platform=reddit duplicate mention skipped url=%s", mention.source_url)
+            return
+        if status != WRITE_INSERTED:
+            logger.error("platform=reddit mention save failed url=%s", mention.source_url)
+            return
+        logger.info(
+            "platform=reddit mention created keyword='%s' type=%s subreddit=r/%s",
+            keyword.keyword, mention.content_type, mention.subreddit,
+        )
+        self._send_email_notification(mention, keyword)
+
     def _send_email_notification(self, mention, keyword):
-        """Send email notification for a new mention"""
+        """Queue the email for the outbox workers; never blocks on the provider"""
         try:
-            # Send email notification using the service
-            success = email_notification_service.send_mention_notification(mention)
-            if not success:
-                logger.error("platform=reddit email failed mention=%s", mention.id)
-                
+            notification_outbox.enqueue_mention(mention)
         except Exception as e:
-            logger.error("platform=reddit email notification failed: %s", e)
-    
+            logger.error("platform=reddit email notification enqueue failed: %s", e)
 
-    
     def _create_mention_from_submission(self, keyword, submission, match_result: MatchResult, content_type: str):
         """Create a Mention object from a Reddit submission"""
         try:
-            # Check if mention already exists
-            existing_mention = Mention.objects.filter(
-                source_url=f"https://reddit.com{submission.permalink}",
-                keyword_id=str(keyword.id)
-            ).first()
-            
-            if existing_mention:
-                return None
-            
             # Create new mention
             mention = Mention(
                 keyword_id=str(keyword.id),
@@ -324,15 +515,6 @@ class RealtimeStreamMonitor:
     def _create_mention_from_comment(self, keyword, comment, match_result: MatchResult):
         """Create a Mention object from a Reddit comment"""
         try:
-            # Check if mention already exists
-            existing_mention = Mention.objects.filter(
-                source_url=f"https://reddit.com{comment.permalink}",
-                keyword_id=str(keyword.id)
-            ).first()
-            
-            if existing_mention:
-                return None
-            
             # Create new mention
             mention = Mention(
                 keyword_id=str(keyword.id),
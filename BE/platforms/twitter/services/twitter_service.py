@@ -6,6 +6,7 @@ import os
 import sys
 import time
 import threading
+from functools import partial
 # snscrape intentionally not used
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta, timezone as datetime_timezone
@@ -20,7 +21,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 from core.models import Keyword, Mention
 from core.enums import Platform, ContentType, MentionContentType
 from core.services.matching_engine import GenericMatchingEngine, MatchContext
-from core.services.email_service import email_notification_service
+from core.services.keyword_sync import KeywordDelta, keyword_id
+from core.services.mention_writer import WRITE_DUPLICATE, WRITE_INSERTED, mention_writer
+from core.services.notification_outbox import notification_outbox
 from core.services.chrome_driver import create_driver as create_chrome_driver
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, WebDriverException
@@ -158,6 +161,8 @@ class TwitterService:
         self.tweet_cache = {}  # Cache to avoid duplicates
         self.matching_engine = GenericMatchingEngine()
         self._cycle_mentions = 0
+        # Keywords searched each pass; replaced as a whole on hot reload
+        self.keywords: Dict[str, Keyword] = {}
         # Extra idle after a full keyword pass, on top of the per-keyword gap.
         self.check_interval = KEYWORD_INTERVAL_SECS
         # Nitter configuration
@@ -182,14 +187,29 @@ class TwitterService:
             return
             
         self.is_monitoring = True
+        keywords = self.matching_engine.compile_keywords(keywords)
+        self.keywords = {keyword_id(keyword): keyword for keyword in keywords}
         self.monitoring_thread = threading.Thread(
             target=self._run_monitoring_loop,
-            args=(keywords,),
             daemon=True
         )
         self.monitoring_thread.start()
         logger.info("platform=twitter monitoring started keywords=%s", len(keywords))
     
+    def apply_keyword_delta(self, delta: KeywordDelta):
+        """Swap in a new keyword set; the running loop searches it from its next keyword."""
+        if not delta:
+            return
+        compiled = KeywordDelta(
+            added=self.matching_engine.compile_keywords(delta.added),
+            updated=self.matching_engine.compile_keywords(delta.updated),
+            removed_ids=delta.removed_ids,
+        )
+        self.keywords = compiled.apply(self.keywords)
+        for removed in delta.removed_ids:
+            self._keyword_watermarks.pop(removed, None)
+        logger.info("platform=twitter keywords reloaded %s keywords=%s", delta.summary(), len(self.keywords))
+    
     def stop_stream_monitoring(self):
         """Stop Twitter monitoring"""
         self.is_monitoring = False
@@ -203,11 +223,11 @@ class TwitterService:
             pass
         logger.info("platform=twitter monitoring stopped")
     
-    def _run_monitoring_loop(self, keywords: List[Keyword]):
+    def _run_monitoring_loop(self):
         """Main monitoring loop"""
         while self.is_monitoring:
             try:
-                self._check_for_new_tweets(keywords)
+                self._check_for_new_tweets(list(self.keywords.values()))
                 time.sleep(self.check_interval)
             except Exception as e:
                 logger.error("platform=twitter monitoring loop failed: %s", e)
@@ -224,6 +244,8 @@ class TwitterService:
             for keyword in keywords:
                 if not self.is_monitoring:
                     break
+                if keyword_id(keyword) not in self.keywords:
+                    continue  # removed by a hot reload during this pass
                 if not self._should_monitor_keyword(keyword):
                     continue
 
@@ -246,7 +268,7 @@ class TwitterService:
                         self._process_tweet_for_keyword(tweet, keyword)
             
             logger.info(
-                "platform=twitter poll completed tweets=%s mentions=%s duration_ms=%.0f",
+                "platform=twitter poll completed tweets=%s mentions_queued=%s duration_ms=%.0f",
                 tweets_seen, self._cycle_mentions, (time.time() - started) * 1000,
             )
                         
@@ -615,15 +637,6 @@ class TwitterService:
     def _create_mention_from_tweet(self, tweet: Dict, keyword: Keyword, match_result, content_type: str) -> Optional[Mention]:
         """Create a Mention object from a Twitter tweet"""
         try:
-            # Check for duplicates
-            existing_mention = Mention.objects.filter(
-                source_url=tweet['url'],
-                keyword_id=str(keyword.id)
-            ).first()
-            
-            if existing_mention:
-                return None
-            
             # Create new mention
             mention = Mention(
                 keyword_id=str(keyword.id),
@@ -655,22 +668,28 @@ class TwitterService:
             return None
     
     def _save_mention(self, mention: Mention, keyword: Keyword, content_type: str = ""):
-        """Save mention and send notification"""
-        try:
-            mention.save()
-            self._cycle_mentions += 1
-            logger.info(
-                "platform=twitter mention created keyword='%s' type=%s id=%s",
-                keyword.keyword, content_type or mention.content_type, mention.id,
-            )
-            
-            # Send email notification
-            success = email_notification_service.send_mention_notification(mention)
-            if not success:
-                logger.error("platform=twitter email failed mention=%s", mention.id)
-                
-        except Exception as e:
-            logger.error("platform=twitter mention save failed: %s", e)
+        """Queue mention for the batched writer; the notification follows the insert"""
+        if not mention_writer.submit(mention, partial(self._on_mention_written, keyword, content_type)):
+            logger.error("platform=twitter mention dropped, writer buffer full url=%s", mention.source_url)
+            return
+        # Counted here, on the poll's own thread: write callbacks land after the poll is logged
+        self._cycle_mentions += 1
+
+    def _on_mention_written(self, keyword: Keyword, content_type: str, mention: Mention, status: str):
+        """Writer callback: log and notify for newly inserted mentions"""
+        if status == WRITE_DUPLICATE:
+            logger.debug("platform=twitter duplicate mention skipped url=%s", mention.source_url)
+            return
+        if status != WRITE_INSERTED:
+            logger.error("platform=twitter mention save failed url=%s", mention.source_url)
+            return
+        logger.info(
+            "platform=twitter mention created keyword='%s' type=%s id=%s",
+            keyword.keyword, content_type or mention.content_type, mention.id,
+        )
+
+        # Delivered by the outbox workers, off the monitoring threads
+        notification_outbox.enqueue_mention(mention)
     
     def reset_monitoring(self):
         """Reset monitoring state (useful for testing)"""
@@ -6,6 +6,7 @@ import os
 import sys
 import time
 import threading
+from functools import partial
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from django.utils import timezone
@@ -17,7 +18,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 from core.models import Keyword, Mention
 from core.enums import Platform, ContentType, MentionContentType
 from core.services.matching_engine import GenericMatchingEngine
-from core.services.email_service import email_notification_service
+from core.services.mention_writer import WRITE_DUPLICATE, WRITE_INSERTED, mention_writer
+from core.services.notification_outbox import notification_outbox
 
 logger = logging.getLogger(__name__)
 
@@ -216,15 +218,6 @@ class MockTwitterService:
     def _create_mention_from_tweet(self, tweet: Dict, keyword: Keyword, match_result, content_type: str) -> Optional[Mention]:
         """Create a Mention object from a Twitter tweet"""
         try:
-            # Check for duplicates
-            existing_mention = Mention.objects.filter(
-                source_url=tweet['url'],
-                keyword_id=str(keyword.id)
-            ).first()
-            
-            if existing_mention:
-                return None
-            
             # Create new mention
             mention = Mention(
                 keyword_id=str(keyword.id),
@@ -255,20 +248,19 @@ class MockTwitterService:
             return None
     
     def _save_mention(self, mention: Mention, keyword: Keyword):
-        """Save mention and send notification"""
-        try:
-            mention.save()
-            logger.info(f"💾 Saved Mock Twitter mention: {mention.keyword_id} - {mention.title[:50]}...")
-            
-            # Send email notification
-            success = email_notification_service.send_mention_notification(mention)
-            if success:
-                logger.info(f"📧 Email notification sent for mention {mention.id}")
-            else:
-                logger.error(f"Failed to send email notification for mention {mention.id}")
-                
-        except Exception as e:
-            logger.error(f"Error saving mention: {e}")
+        """Queue mention for the batched writer, like the real service"""
+        if not mention_writer.submit(mention, partial(self._on_mention_written, keyword)):
+            logger.error("platform=twitter_mock mention dropped, writer buffer full url=%s", mention.source_url)
+
+    def _on_mention_written(self, keyword: Keyword, mention: Mention, status: str):
+        """Writer callback: log and notify for newly inserted mentions"""
+        if status == WRITE_DUPLICATE:
+            return
+        if status != WRITE_INSERTED:
+            logger.error("platform=twitter_mock mention save failed url=%s", mention.source_url)
+            return
+        logger.info(f"💾 Saved Mock Twitter mention: {mention.keyword_id} - {(mention.title or '')[:50]}...")
+        notification_outbox.enqueue_mention(mention)
     
     def reset_monitoring(self):
         """Reset monitoring state (useful for testing)"""
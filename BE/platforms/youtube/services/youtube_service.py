@@ -1,6 +1,7 @@
 import time
 import logging
 import threading
+from functools import partial
 from typing import List, Dict, Optional, Tuple, Iterable
 from urllib.parse import quote_plus
 from datetime import datetime
@@ -16,7 +17,9 @@ from django.utils import timezone
 from core.models import Keyword, Mention, MonitorCursor
 from core.enums import Platform, ContentType, MentionContentType
 from core.services.matching_engine import GenericMatchingEngine, MatchContext
-from core.services.email_service import email_notification_service
+from core.services.keyword_sync import KeywordDelta, keyword_id
+from core.services.mention_writer import WRITE_DUPLICATE, WRITE_INSERTED, mention_writer
+from core.services.notification_outbox import notification_outbox
 from core.services.chrome_driver import create_driver as create_chrome_driver
 
 logger = logging.getLogger(__name__)
@@ -44,6 +47,8 @@ class YouTubeService:
         self.monitor_thread = None
         self.matching_engine = GenericMatchingEngine()
         self._cycle_mentions = 0
+        # Keywords searched each poll; replaced as a whole on hot reload
+        self.keywords: Dict[str, Keyword] = {}
         self.check_interval = 300
         self.instances = list(DEFAULT_INVIDIOUS_INSTANCES)
         self.instance_cooldowns: Dict[str, float] = {}
@@ -97,18 +102,33 @@ class YouTubeService:
             logger.debug("platform=youtube monitoring already running")
             return
         self.is_monitoring = True
+        keywords = self.matching_engine.compile_keywords(keywords)
+        self.keywords = {keyword_id(keyword): keyword for keyword in keywords}
         # Reset start marker and per-keyword heads
         self.started_at_ts = time.time()
         self.last_seen_top_id.clear()
         self._ensure_driver()
         self.monitor_thread = threading.Thread(
             target=self._run_monitoring_loop,
-            args=(keywords,),
             daemon=True,
         )
         self.monitor_thread.start()
         logger.info("platform=youtube monitoring started keywords=%s", len(keywords))
 
+    def apply_keyword_delta(self, delta: KeywordDelta):
+        """Swap in a new keyword set; the running loop searches it from its next poll."""
+        if not delta:
+            return
+        compiled = KeywordDelta(
+            added=self.matching_engine.compile_keywords(delta.added),
+            updated=self.matching_engine.compile_keywords(delta.updated),
+            removed_ids=delta.removed_ids,
+        )
+        self.keywords = compiled.apply(self.keywords)
+        for removed in delta.removed_ids:
+            self.last_seen_top_id.pop(removed, None)
+        logger.info("platform=youtube keywords reloaded %s keywords=%s", delta.summary(), len(self.keywords))
+
     def stop_stream_monitoring(self):
         self.is_monitoring = False
         if self.monitor_thread:
@@ -121,10 +141,10 @@ class YouTubeService:
             pass
         logger.info("platform=youtube monitoring stopped")
 
-    def _run_monitoring_loop(self, keywords: List[Keyword]):
+    def _run_monitoring_loop(self):
         while self.is_monitoring:
             try:
-                self._check_for_new_videos(keywords)
+                self._check_for_new_videos(list(self.keywords.values()))
                 time.sleep(self.check_interval)
             except Exception as e:
                 logger.error("platform=youtube monitoring loop failed: %s", e)
@@ -166,7 +186,8 @@ class YouTubeService:
                     cache_key = f"{keyword.id}_{vid}"
                     if cache_key in self.seen_cache and time.time() - self.seen_cache[cache_key] < 3600:
                         continue
-                    # Avoid DB duplicates across restarts
+                    # Skip the detail fetch for videos already stored across restarts;
+                    # the unique mention index is what actually prevents duplicates.
                     canonical_url = f"https://www.youtube.com/watch?v={vid}"
                     try:
                         existing = Mention.objects.filter(source_url=canonical_url, keyword_id=str(keyword.id)).first()
@@ -188,7 +209,7 @@ class YouTubeService:
                 logger.error("platform=youtube search failed keyword='%s': %s", keyword.keyword, e)
 
         logger.info(
-            "platform=youtube poll completed videos=%s mentions=%s duration_ms=%.0f",
+            "platform=youtube poll completed videos=%s mentions_queued=%s duration_ms=%.0f",
             videos_seen, self._cycle_mentions, (time.time() - started) * 1000,
         )
 
@@ -268,16 +289,6 @@ class YouTubeService:
                 continue
 
             source_url = f"https://www.youtube.com/watch?v={video_id}&lc={comment_id}"
-            try:
-                existing = Mention.objects.filter(
-                    source_url=source_url,
-                    keyword_id=str(keyword.id),
-                ).first()
-                if existing:
-                    continue
-            except Exception:
-                pass
-
             published_raw = comment.get("published")
             try:
                 comment_published = (
@@ -313,16 +324,6 @@ class YouTubeService:
         match_result,
         mention_date: datetime,
     ) -> None:
-        try:
-            existing = Mention.objects.filter(
-                source_url=source_url,
-                keyword_id=str(keyword.id),
-            ).first()
-            if existing:
-                return
-        except Exception:
-            pass
-
         mention = Mention(
             keyword_id=str(keyword.id),
             user_id=keyword.user_id,
@@ -340,16 +341,25 @@ class YouTubeService:
             discovered_at=timezone.now(),
         )
         mention.platform_item_id = video_id
-        try:
-            mention.save()
-            self._cycle_mentions += 1
-            email_notification_service.send_mention_notification(mention)
-            logger.info(
-                "platform=youtube mention created keyword='%s' type=%s id=%s",
-                keyword.keyword, mention_content_type, mention.id,
-            )
-        except Exception as e:
-            logger.error("platform=youtube mention save failed: %s", e)
+        if not mention_writer.submit(mention, partial(self._on_mention_written, keyword)):
+            logger.error("platform=youtube mention dropped, writer buffer full url=%s", source_url)
+            return
+        # Counted here, on the poll's own thread: write callbacks land after the poll is logged
+        self._cycle_mentions += 1
+
+    def _on_mention_written(self, keyword: Keyword, mention: Mention, status: str) -> None:
+        """Writer callback: log and notify for newly inserted mentions."""
+        if status == WRITE_DUPLICATE:
+            logger.debug("platform=youtube duplicate mention skipped url=%s", mention.source_url)
+            return
+        if status != WRITE_INSERTED:
+            logger.error("platform=youtube mention save failed url=%s", mention.source_url)
+            return
+        notification_outbox.enqueue_mention(mention)
+        logger.info(
+            "platform=youtube mention created keyword='%s' type=%s id=%s",
+            keyword.keyword, mention.content_type, mention.id,
+        )
 
     def _fetch_video_comments(self, video_id: str) -> List[Dict]:
         now = time.time()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Compare language detection backends on scripts/data/language_samples.tsv.
+
+Reports accuracy (ISO 639-1, as detect_language returns it) and uncached
+throughput for every backend in core.services.language_detection.BACKENDS.
+Run from BE/:
+
+    python scripts/benchmark_language_detection.py [--rounds 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django  # noqa: E402
+
+django.setup()
+
+from core.services.language_detection import (  # noqa: E402
+    BACKENDS,
+    _WHITESPACE,
+    _detect_uncached,
+)
+
+SAMPLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "language_samples.tsv")
+
+
+def load_samples(path: str) -> list[tuple[str, str]]:
+    samples = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip() or line.startswith("#"):
+                continue
+            language, text = line.rstrip("\n").split("\t", 1)
+            samples.append((language, _WHITESPACE.sub(" ", text.strip())))
+    return samples
+
+
+def run(backend: str, samples: list[tuple[str, str]], rounds: int) -> None:
+    # Warm up once so lazy model loading is not counted as throughput.
+    _detect_uncached(samples[0][1], backend)
+
+    misses: Counter = Counter()
+    correct = 0
+    for language, text in samples:
+        detected = _detect_uncached(text, backend)
+        if detected == language:
+            correct += 1
+        else:
+            misses[f"{language}->{detected or '?'}"] += 1
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for _, text in samples:
+            _detect_uncached(text, backend)
+    elapsed = time.perf_counter() - started
+    calls = rounds * len(samples)
+
+    print(
+        f"{backend:<11} accuracy={correct / len(samples):6.1%} ({correct}/{len(samples)}) "
+        f"throughput={calls / elapsed:8.0f} texts/s  mean={elapsed / calls * 1e6:7.0f} us"
+    )
+    if misses:
+        print("            misses: " + ", ".join(f"{key} x{count}" for key, count in misses.most_common()))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20, help="timed passes over the sample")
+    parser.add_argument("--samples", default=SAMPLES_PATH)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), action="append")
+    args = parser.parse_args()
+
+    samples = load_samples(args.samples)
+    languages = sorted({language for language, _ in samples})
+    print(f"samples={len(samples)} languages={len(languages)} ({', '.join(languages)}) rounds={args.rounds}")
+    for backend in args.backend or sorted(BACKENDS):
+        run(backend, samples, max(1, args.rounds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
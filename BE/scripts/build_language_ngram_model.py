@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Build core/services/data/language_ngrams.json.gz from the langdetect profiles.
+
+Each profile is folded through the n-gram model's normalizer, trimmed to its
+most frequent grams per length, and stored as integer log-probability boosts
+over a per-language floor for unseen grams. Run from BE/:
+
+    python scripts/build_language_ngram_model.py [--top 600]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+import os
+import sys
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.services.ngram_language_model import (  # noqa: E402
+    MODEL_PATH,
+    NGRAM_MAX,
+    SCORE_SCALE,
+    normalize_char,
+)
+
+
+def load_profiles() -> dict:
+    import langdetect
+
+    directory = os.path.join(os.path.dirname(langdetect.__file__), "profiles")
+    profiles = {}
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), encoding="utf-8") as fh:
+            profiles[name] = json.load(fh)
+    return profiles
+
+
+def fold_profile(profile: dict) -> list[dict]:
+    """Per n, map folded gram -> probability."""
+    folded = [defaultdict(int) for _ in range(NGRAM_MAX)]
+    for gram, count in profile["freq"].items():
+        if not 1 <= len(gram) <= NGRAM_MAX:
+            continue
+        normalized = "".join(normalize_char(ch) if ch != " " else " " for ch in gram)
+        if normalized.strip() == "" or "  " in normalized or " " in normalized[1:-1]:
+            continue
+        folded[len(gram) - 1][normalized] += count
+    totals = profile["n_words"]
+    return [
+        {gram: count / max(1, totals[n]) for gram, count in grams.items()}
+        for n, grams in enumerate(folded)
+    ]
+
+
+def build(top: int) -> dict:
+    languages: list[str] = []
+    floors: list[list[int]] = []
+    grams: dict[str, list[list[int]]] = defaultdict(list)
+
+    for name, profile in load_profiles().items():
+        index = len(languages)
+        languages.append(name)
+        language_floors = []
+        for probabilities in fold_profile(profile):
+            kept = sorted(probabilities.items(), key=lambda item: -item[1])[:top]
+            if not kept:
+                language_floors.append(round(math.log(1e-9) * SCORE_SCALE))
+                continue
+            floor = round(math.log(kept[-1][1] / 2) * SCORE_SCALE)
+            language_floors.append(floor)
+            for gram, probability in kept:
+                boost = round(math.log(probability) * SCORE_SCALE) - floor
+                if boost > 0:
+                    grams[gram].append([index, boost])
+        floors.append(language_floors)
+
+    return {
+        "version": 1,
+        "ngram_max": NGRAM_MAX,
+        "score_scale": SCORE_SCALE,
+        "languages": languages,
+        "floors": floors,
+        "grams": dict(sorted(grams.items())),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=600, help="grams kept per language and length")
+    parser.add_argument("--output", default=str(MODEL_PATH))
+    args = parser.parse_args()
+
+    model = build(args.top)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    payload = json.dumps(model, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with open(args.output, "wb") as raw:
+        # mtime=0 keeps rebuilds byte-identical
+        with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0, filename="") as fh:
+            fh.write(payload)
+    print(
+        f"wrote {args.output}: languages={len(model['languages'])} "
+        f"grams={len(model['grams'])} bytes={os.path.getsize(args.output)}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,20 @@ def _env_list(name: str, default: str) -> list[str]:
     return [item.strip() for item in os.getenv(name, default).split(',') if item.strip()]
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
@@ -79,6 +93,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.request_cache.RequestCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'urls'
@@ -233,6 +248,18 @@ CLERK_AUTHORIZED_PARTIES = _env_list(
     'CLERK_AUTHORIZED_PARTIES',
     'http://localhost:3000',
 )
+# Signing secret (whsec_...) for the user.updated / user.deleted webhook at /api/webhooks/clerk
+CLERK_WEBHOOK_SECRET = os.getenv('CLERK_WEBHOOK_SECRET')
+# User id -> email cache for notifications; misses (404s) are cached for less time
+CLERK_EMAIL_CACHE_SECONDS = _env_int('CLERK_EMAIL_CACHE_SECONDS', 600)
+CLERK_EMAIL_NEGATIVE_CACHE_SECONDS = _env_int('CLERK_EMAIL_NEGATIVE_CACHE_SECONDS', 300)
+CLERK_EMAIL_CACHE_SIZE = _env_int('CLERK_EMAIL_CACHE_SIZE', 10000)
+# Session tokens are verified locally: JWKS kept for CLERK_JWKS_CACHE_SECONDS
+# (refetched early on an unknown key id), verified claims reused for up to
+# CLERK_TOKEN_CACHE_SECONDS but never past the token's exp
+CLERK_JWKS_CACHE_SECONDS = _env_int('CLERK_JWKS_CACHE_SECONDS', 3600)
+CLERK_TOKEN_CACHE_SECONDS = _env_int('CLERK_TOKEN_CACHE_SECONDS', 60)
+CLERK_TOKEN_CACHE_SIZE = _env_int('CLERK_TOKEN_CACHE_SIZE', 10000)
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
@@ -258,11 +285,70 @@ REST_FRAMEWORK = {
 REDDIT_CLIENT_ID = os.getenv('REDDIT_CLIENT_ID')
 REDDIT_CLIENT_SECRET = os.getenv('REDDIT_CLIENT_SECRET')
 REDDIT_USER_AGENT = os.getenv('REDDIT_USER_AGENT', 'KleioMentionTracker/1.0')
+# per_subreddit, multireddit (subreddits combined into a+b+c streams) or all (one r/all stream)
+REDDIT_STREAM_MODE = os.getenv('REDDIT_STREAM_MODE', 'multireddit')
+REDDIT_MULTIREDDIT_SIZE = _env_int('REDDIT_MULTIREDDIT_SIZE', 100)
+# Stream readers hand items to a bounded queue; when it stays full for
+# REDDIT_QUEUE_PUT_TIMEOUT seconds the item is dropped and counted.
+REDDIT_QUEUE_SIZE = _env_int('REDDIT_QUEUE_SIZE', 1000)
+REDDIT_MATCH_WORKERS = _env_int('REDDIT_MATCH_WORKERS', 4)
+REDDIT_QUEUE_PUT_TIMEOUT = _env_float('REDDIT_QUEUE_PUT_TIMEOUT', 5.0)
+
+# Hacker News: item fetches in flight at once, and the most items replayed
+# from the saved max-item cursor after a restart
+HN_FETCH_CONCURRENCY = _env_int('HN_FETCH_CONCURRENCY', 20)
+HN_MAX_BACKLOG = _env_int('HN_MAX_BACKLOG', 5000)
+
+# Mention writes are buffered and inserted in batches of up to
+# MENTION_WRITE_BATCH_SIZE, at least every MENTION_WRITE_FLUSH_SECONDS
+MENTION_WRITE_BATCH_SIZE = _env_int('MENTION_WRITE_BATCH_SIZE', 100)
+MENTION_WRITE_FLUSH_SECONDS = _env_float('MENTION_WRITE_FLUSH_SECONDS', 1.0)
+MENTION_WRITE_MAX_BUFFER = _env_int('MENTION_WRITE_MAX_BUFFER', 5000)
+MENTION_CALLBACK_WORKERS = _env_int('MENTION_CALLBACK_WORKERS', 4)
+
+# Notification outbox: delivery workers retry failed sends with exponential
+# backoff (NOTIFICATION_BACKOFF_SECONDS doubling up to the max) and give up
+# after NOTIFICATION_MAX_ATTEMPTS
+NOTIFICATION_WORKERS = _env_int('NOTIFICATION_WORKERS', 2)
+NOTIFICATION_POLL_SECONDS = _env_float('NOTIFICATION_POLL_SECONDS', 2.0)
+NOTIFICATION_MAX_ATTEMPTS = _env_int('NOTIFICATION_MAX_ATTEMPTS', 6)
+NOTIFICATION_BACKOFF_SECONDS = _env_int('NOTIFICATION_BACKOFF_SECONDS', 30)
+NOTIFICATION_BACKOFF_MAX_SECONDS = _env_int('NOTIFICATION_BACKOFF_MAX_SECONDS', 3600)
+NOTIFICATION_LEASE_SECONDS = _env_int('NOTIFICATION_LEASE_SECONDS', 300)
+
+# Digests for hourly/daily users: sent at the top of each hour, and daily at
+# DIGEST_DAILY_HOUR (UTC), listing at most DIGEST_MAX_MENTIONS per email
+DIGEST_CHECK_SECONDS = _env_int('DIGEST_CHECK_SECONDS', 60)
+DIGEST_DAILY_HOUR = _env_int('DIGEST_DAILY_HOUR', 8)
+DIGEST_MAX_MENTIONS = _env_int('DIGEST_MAX_MENTIONS', 50)
+
+# Per-user keyword cache for API reads (mention labels, analytics);
+# writes in this process invalidate it, other processes see changes within
+# KEYWORD_CACHE_SECONDS
+KEYWORD_CACHE_SECONDS = _env_int('KEYWORD_CACHE_SECONDS', 30)
+KEYWORD_CACHE_SIZE = _env_int('KEYWORD_CACHE_SIZE', 2000)
+
+# Keyword analytics source: 'aggregate' computes the counts in a MongoDB
+# pipeline; 'rollups' reads the daily counters the mention writer maintains
+# (switch once backfill_mention_rollups has run, or existing history reads as
+# zero); 'mentions' scans the mention documents in Python as a fallback
+ANALYTICS_SOURCE = os.getenv('ANALYTICS_SOURCE', 'aggregate')
 
 # Email Configuration
 RESEND_API_KEY = os.getenv('RESEND_API_KEY')
 RESEND_FROM_EMAIL = os.getenv('RESEND_FROM_EMAIL')
 
+# Keyword change feed (worker): MongoDB change streams when available,
+# otherwise updated_at polling with an overlap window and a periodic delete scan
+KEYWORD_CHANGE_STREAMS = os.getenv('KEYWORD_CHANGE_STREAMS', 'True').lower() in ('true', '1', 'yes')
+KEYWORD_SYNC_OVERLAP_SECONDS = _env_int('KEYWORD_SYNC_OVERLAP_SECONDS', 30)
+KEYWORD_SYNC_DELETE_SCAN_SECONDS = _env_int('KEYWORD_SYNC_DELETE_SCAN_SECONDS', 60)
+
+# Keyword matching
+# langdetect (default) or ngram (bundled compact model, see core/services/ngram_language_model.py)
+LANGUAGE_DETECTION_BACKEND = os.getenv('LANGUAGE_DETECTION_BACKEND', 'langdetect')
+LANGUAGE_DETECTION_CACHE_SIZE = _env_int('LANGUAGE_DETECTION_CACHE_SIZE', 4096)
+
 # Frontend (checkout return URLs)
 FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
 
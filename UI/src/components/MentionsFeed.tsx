@@ -229,6 +229,7 @@ export default function MentionsFeed({
   const api = useApi();
   const [mentions, setMentions] = useState<Mention[]>([]);
   const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -244,7 +245,8 @@ export default function MentionsFeed({
   }, [search]);
 
   const load = useCallback(
-    async (offset = 0, append = false) => {
+    async (cursor?: string) => {
+      const append = Boolean(cursor);
       if (loadInFlight.current) return;
       loadInFlight.current = true;
       try {
@@ -256,13 +258,14 @@ export default function MentionsFeed({
           platform,
           keywordId,
           limit,
-          offset,
+          cursor,
           q: debouncedSearch || undefined,
           status: showFilters ? status : "active",
         });
 
         setMentions((prev) => (append ? [...prev, ...data.mentions] : data.mentions));
-        setTotal(data.total);
+        if (data.total !== null) setTotal(data.total);
+        setNextCursor(data.nextCursor);
         setError(null);
       } catch (err) {
         if (err instanceof ApiUnauthorizedError) return;
@@ -277,7 +280,7 @@ export default function MentionsFeed({
   );
 
   useEffect(() => {
-    load(0, false);
+    load();
   }, [load]);
 
   const handleUpdate = async (id: string, patch: Partial<Mention>) => {
@@ -309,7 +312,7 @@ export default function MentionsFeed({
     }
   };
 
-  const hasMore = mentions.length < total;
+  const hasMore = nextCursor !== null;
 
   if (loading) {
     return (
@@ -422,7 +425,7 @@ export default function MentionsFeed({
               )}
               {!compact && hasMore && (
                 <button
-                  onClick={() => load(mentions.length, true)}
+                  onClick={() => nextCursor && load(nextCursor)}
                   disabled={loadingMore}
                   className="text-sm font-medium text-indigo-600 hover:text-indigo-800 disabled:opacity-50"
                 >
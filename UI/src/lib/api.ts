@@ -134,9 +134,12 @@ export interface Mention {
 
 export interface MentionsListResponse {
   mentions: Mention[];
-  total: number;
+  /** Only counted on the first page unless includeTotal is requested. */
+  total: number | null;
   limit: number;
   offset: number;
+  nextCursor: string | null;
+  hasMore: boolean;
 }
 
 export interface UserNotificationSettings {
@@ -360,6 +363,7 @@ class ApiService {
       keywordId?: string;
       limit?: number;
       offset?: number;
+      cursor?: string;
       q?: string;
       status?: "active" | "unread" | "archived" | "all";
     }
@@ -367,6 +371,7 @@ class ApiService {
     const params = new URLSearchParams();
     if (options?.limit) params.set("limit", String(options.limit));
     if (options?.offset) params.set("offset", String(options.offset));
+    if (options?.cursor) params.set("cursor", options.cursor);
     if (options?.keywordId) params.set("keywordId", options.keywordId);
     if (options?.q) params.set("q", options.q);
     if (options?.status) params.set("status", options.status);